@@ -4,6 +4,16 @@ Starts an `http.server` in the current directory and opens up the webpage.
 We need the web server because the script is loaded through an Ajax request,
 which does not support loading from the local filesystem.
 
+With `--api`, the server also answers AI moves as JSON (see `python/move_api.py`),
+by running the engine under CPython instead of in the browser:
+
+    python3 main.py --api --time-budget-ms 1000
+
+The server handles every request in its own thread, so the static files are still
+served while a move is searched. The AI players of the games that send a "session" id
+are kept between their moves, up to `--sessions` games and `--session-cache-mb`
+megabytes, for `--session-idle-s` seconds after their most recent move.
+
 --------------------------------------------------------------------------------
 MIT License
 
@@ -27,15 +37,48 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+import argparse
 import http.server
-import socketserver
+import os
+import sys
 import webbrowser
 
 PORT = 8000
 Handler = http.server.SimpleHTTPRequestHandler
 
 if __name__ == '__main__':
-    with socketserver.TCPServer(("", PORT), Handler) as httpd:
-        print("serving at port", PORT)
-        webbrowser.open_new_tab(f"http://127.0.0.1:{PORT}")
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument("--port", type=int, default=PORT, help="the port to serve at")
+    parser.add_argument("--api", action="store_true",
+                        help="also answer AI moves as JSON at /api/move")
+    parser.add_argument("--time-budget-ms", type=int, default=None,
+                        help="the search time budget of the 'hard' and 'mcts' AI moves "
+                             "of --api (default: a fixed depth or number of playouts)")
+    parser.add_argument("--sessions", type=int, default=100,
+                        help="the most games whose AI players --api keeps between moves "
+                             "(0: keep none)")
+    parser.add_argument("--session-cache-mb", type=int, default=256,
+                        help="the most memory in megabytes kept by those AI players")
+    parser.add_argument("--session-idle-s", type=float, default=600,
+                        help="the seconds that an AI player is kept after its last move")
+    parser.add_argument("--no-browser", action="store_true",
+                        help="do not open the webpage, e.g. on a headless server")
+    args = parser.parse_args()
+
+    if args.api:
+        # the engine lives next to the browser scripts, which import it as flat modules
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                        "python"))
+        import move_api
+        Handler = move_api.MoveRequestHandler
+        Handler.time_budget_ms = args.time_budget_ms
+        if args.sessions > 0:
+            Handler.cache = move_api.EngineCache(
+                args.sessions, args.session_cache_mb * 1024 * 1024, args.session_idle_s
+            )
+
+    with http.server.ThreadingHTTPServer(("", args.port), Handler) as httpd:
+        print("serving at port", args.port)
+        if not args.no_browser:
+            webbrowser.open_new_tab(f"http://127.0.0.1:{args.port}")
         httpd.serve_forever()
@@ -0,0 +1,159 @@
+"""
+Runs the AI players' searches inside a Web Worker, off the browser's main thread, so that
+the game board keeps responding to the mouse while an AI player "thinks".
+
+This module cannot be run with a regular CPython interpreter, because it uses the
+`browser` module provided by the Brython distribution. It is declared as the
+"webworker" script `ai_worker` in `index.html`, and started by `interaction.py`.
+
+The two threads exchange JSON strings:
+    - {"type": "init", ...} from `interaction.py` starts a new game, with the settings
+      of `tictactoe.init_game`, and the role of each player
+    - {"type": "move", "id": ..., "moves": [...]} asks the AI player whose turn it is for
+      its move after the given moves of the game
+    - {"id": ..., "piece": ..., "spot": ...} is the reply to the "move" message with the
+      same id
+    - {"id": ..., "error": ...} reports an exception raised while answering the "move"
+      message with the same id, or another message if the id is `None`; the page then
+      stops the worker and makes its moves on the main thread
+
+Between its reply and the next "move" message, the worker ponders if the "init" message
+asked for it: the AI player searches the opponent's likely replies in short slices of
+`PONDER_SLICE_MS` (see `tictactoe.Player.ponder`), so that the worker still reads the
+next message soon after it is sent, and answers a reply that was searched right away.
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from browser import bind, self, timer
+from javascript import JSON
+import tictactoe as ttt
+
+# the longest time in milliseconds that one slice of pondering keeps the worker from
+# reading its messages
+PONDER_SLICE_MS = 50
+
+
+class WorkerGame:
+    """
+    the game played by the worker
+
+    Class Attributes:
+        - SETTINGS: the "init" message of the current game
+        - PLAYERS: the player objects of the current game, by player {'p1', 'p2'}; the
+          AI players are kept across moves, so that they reuse their game trees
+        - PONDER_TIMER: the id of the timer of the next slice of pondering, or `None`
+    """
+    SETTINGS: dict = {}
+    PLAYERS: dict = {}
+    PONDER_TIMER: object = None
+
+
+def replay_game(moves: list) -> ttt.GameState:
+    """
+    return the game state of the current game after the given moves, starting from an
+    empty board
+    """
+    settings = WorkerGame.SETTINGS
+    game = ttt.GameState(ttt.empty_board(settings["side"]), win_len=settings["win_len"])
+    game.next_player = settings["start_first"]
+    pieces = {'p1': settings["p1_piece"], 'p2': ttt.piece_not(settings["p1_piece"])}
+    for spot in moves:
+        game.place_piece(pieces[game.next_player], spot)
+    return game
+
+
+def ponder_slice(player: ttt.Player, game: ttt.GameState) -> None:
+    """
+    let the AI player that has just moved search for `PONDER_SLICE_MS` milliseconds of
+    the opponent's time, and schedule the next slice if there is more to search
+    """
+    WorkerGame.PONDER_TIMER = None
+    try:
+        is_pondering = player.ponder(game, PONDER_SLICE_MS)
+    except Exception as error:
+        send_error(error, None)
+        return
+    if is_pondering:
+        WorkerGame.PONDER_TIMER = timer.set_timeout(ponder_slice, 0, player, game)
+
+
+def stop_pondering() -> None:
+    """
+    cancel the next slice of pondering, if any
+    """
+    if WorkerGame.PONDER_TIMER is not None:
+        timer.clear_timeout(WorkerGame.PONDER_TIMER)
+        WorkerGame.PONDER_TIMER = None
+
+
+def send_error(error: Exception, move_id: object) -> None:
+    """
+    report the given exception to `interaction.py`, which would otherwise wait forever
+    for the reply to its "move" message with the id `move_id`
+    """
+    description = f"{type(error).__name__}: {error}"
+    print(f"[!] The AI worker failed: {description}")
+    self.send(JSON.stringify({"id": move_id, "error": description}))
+
+
+@bind(self, "message")
+def ev_message(event) -> None:
+    """
+    answer a message from `interaction.py`
+    """
+    message = JSON.parse(event.data)
+    stop_pondering()
+    try:
+        answer_message(message)
+    except Exception as error:
+        send_error(error, message.get("id"))
+
+
+def answer_message(message: dict) -> None:
+    """
+    answer the given message from `interaction.py`
+    """
+    if message["type"] == "init":
+        WorkerGame.SETTINGS = message
+        p1_piece = message["p1_piece"]
+        WorkerGame.PLAYERS = {
+            'p1': ttt.role_to_player(message["p1_role"], p1_piece,
+                                     message["time_budget_ms"]),
+            'p2': ttt.role_to_player(message["p2_role"], ttt.piece_not(p1_piece),
+                                     message["time_budget_ms"])
+        }
+
+    elif message["type"] == "move":
+        moves = message["moves"]
+        game = replay_game(moves)
+        player = WorkerGame.PLAYERS[game.next_player]
+        prev_move = moves[-1] if moves else None
+        piece, spot = player.return_move(game, prev_move)
+        self.send(JSON.stringify({"id": message["id"], "piece": piece, "spot": spot}))
+
+        # think on the human player's time
+        game.place_piece(piece, spot)
+        is_human_next = WorkerGame.PLAYERS[game.next_player] == "human"
+        if WorkerGame.SETTINGS.get("ponder") and is_human_next:
+            WorkerGame.PONDER_TIMER = timer.set_timeout(ponder_slice, 0, player, game)
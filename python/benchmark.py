@@ -0,0 +1,570 @@
+"""
+Benchmarks of the Minimax search of `tictactoe.AIMinimaxPlayer`, run from the command
+line on a fixed set of seeded game positions:
+
+    python3 benchmark.py ordering
+    python3 benchmark.py evaluation
+    python3 benchmark.py tree-memory
+    python3 benchmark.py parallel
+    python3 benchmark.py ponder
+    python3 benchmark.py suite [--json]
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
+import argparse
+import json
+import os
+import random
+import time
+import tracemalloc
+import tictactoe as ttt
+import bitboard as bb
+import game_tree as gt
+import move_order as mo
+import parallel
+
+# the board sides benchmarked, and the search depth used on each of them
+BENCH_DEPTHS = {3: 9, 4: 6, 5: 4}
+
+# the number of seeded positions benchmarked on every board
+NUM_POSITIONS = 12
+
+# the boards of the evaluation matches, and the search depths of the player that scores
+# depth-limited positions heuristically and of the one that scores them as ties
+EVAL_MATCH_DEPTHS = {4: (2, 4), 5: (2, 3)}
+
+# the game trees built by the tree memory benchmark, as (board side, tree depth) pairs;
+# the 3x3 tree is the full tree of every possible game
+TREE_MEMORY_CASES = ((3, 9), (4, 4))
+
+# the numbers of worker processes of the parallel search benchmark, which searches the
+# seeded positions of each board side to the fixed depth of "hard" mode
+PARALLEL_WORKERS = (1, 2, 4)
+PARALLEL_SIDES = (4, 5)
+
+# the boards of the pondering benchmark, the number of games played on each, the search
+# time budget of the AI player, and the time its random opponent thinks before each move
+PONDER_SIDES = (4, 5)
+PONDER_GAMES = 3
+PONDER_BUDGET_MS = 100
+PONDER_THINK_MS = 500
+
+# the board sides and AI roles of the benchmark suite, whose players are made by
+# `tictactoe.role_to_player` as the page makes them, with the time budget of the page's
+# `interaction.Config.AI_TIME_BUDGET_MS`
+SUITE_SIDES = (3, 4, 5)
+SUITE_ROLES = ("ai_easy", "ai_hard")
+SUITE_TIME_BUDGET_MS = 1500
+
+# the search is run long enough to finish every depth, so that only the depth limits it
+NO_TIME_LIMIT_MS = 10 ** 9
+
+
+def seeded_positions(side: int, count: int = NUM_POSITIONS) -> list[ttt.GameState]:
+    """
+    return `count` game positions on a board with sidelength `side`, each made by
+    playing 0 to 3 random moves from the empty board with a fixed seed; positions
+    that are already won are skipped
+
+    >>> [len(game.move_history) for game in seeded_positions(3, 4)]
+    [0, 1, 2, 3]
+    """
+    positions = []
+    seed = 0
+    while len(positions) < count:
+        rng = random.Random(seed)
+        game = ttt.GameState(ttt.empty_board(side))
+        for i in range(seed % 4):
+            game.place_piece('x' if i % 2 == 0 else 'o', rng.choice(game.empty_spots))
+        if game.get_winning_piece() is None:
+            positions.append(game)
+        seed += 1
+    return positions
+
+
+def new_player(piece: str, depth: int, **kwargs) -> ttt.AIMinimaxPlayer:
+    """
+    return a "hard" `AIMinimaxPlayer` that deepens its search to exactly `depth` steps;
+    any other keyword arguments are passed on to `AIMinimaxPlayer`
+    """
+    return ttt.AIMinimaxPlayer(
+        piece, "hard", time_budget_ms=NO_TIME_LIMIT_MS, max_depth=depth, **kwargs
+    )
+
+
+def count_nodes(game: ttt.GameState, depth: int, ordering: str) -> int:
+    """
+    return the number of nodes a fresh `AIMinimaxPlayer` visits to choose its move in
+    the given game, by iterative deepening up to `depth` steps with the given move
+    ordering
+    """
+    piece = 'x' if len(game.move_history) % 2 == 0 else 'o'
+    player = new_player(piece, depth, move_ordering=ordering)
+    player.return_move(game, None)
+    return player.get_nodes_searched()
+
+
+def report_ordering() -> None:
+    """
+    print the total number of nodes searched by each move ordering of
+    `move_order.ORDERING_NAMES` on the seeded positions of every benchmarked board, and
+    the share of nodes saved against the unordered search
+    """
+    print(f"{'board':<7}{'depth':>6}{'ordering':>10}{'nodes':>10}{'saved':>8}")
+    for side, depth in BENCH_DEPTHS.items():
+        positions = seeded_positions(side)
+        baseline = None
+        for name in mo.ORDERING_NAMES:
+            nodes = sum(count_nodes(game, depth, name) for game in positions)
+            if baseline is None:
+                baseline = nodes
+            saved = 1 - nodes / baseline
+            print(f"{f'{side}x{side}':<7}{depth:>6}{name:>10}{nodes:>10}{saved:>8.1%}")
+
+
+def play_match(game: ttt.GameState, players: dict) -> tuple[Optional[str], dict]:
+    """
+    play the given game to its end between the given players, a dictionary mapping each
+    piece to its `AIMinimaxPlayer`, starting with the piece whose turn it is; return the
+    winning piece ("tie" for a tie), and a dictionary mapping each piece to the number
+    of nodes its player searched
+    """
+    nodes = {'x': 0, 'o': 0}
+    piece = 'x' if len(game.move_history) % 2 == 0 else 'o'
+    prev_move = game.move_history[-1] if game.move_history else None
+    while game.get_winning_piece() is None:
+        _, prev_move = players[piece].return_move(game, prev_move)
+        nodes[piece] += players[piece].get_nodes_searched()
+        game.place_piece(piece, prev_move)
+        piece = ttt.piece_not(piece)
+    return game.get_winning_piece(), nodes
+
+
+def report_evaluation() -> None:
+    """
+    print the results of matches on the seeded positions of the boards in
+    `EVAL_MATCH_DEPTHS`, between a player that scores the positions at its depth limit
+    heuristically and a deeper searching player that scores them as ties; each
+    position is played twice, with the pieces swapped
+    """
+    print(f"{'board':<7}{'depths':>8}{'wins':>6}{'ties':>6}{'losses':>8}"
+          f"{'nodes':>10}{'deeper nodes':>14}")
+    for side, (depth, deep_depth) in EVAL_MATCH_DEPTHS.items():
+        results = {'win': 0, 'tie': 0, 'loss': 0}
+        nodes = 0
+        deep_nodes = 0
+        for heuristic_piece in ('x', 'o'):
+            deep_piece = ttt.piece_not(heuristic_piece)
+            for game in seeded_positions(side):
+                players = {
+                    heuristic_piece: new_player(heuristic_piece, depth, heuristic=True),
+                    deep_piece: new_player(deep_piece, deep_depth)
+                }
+                winner, match_nodes = play_match(game, players)
+                if winner == heuristic_piece:
+                    results['win'] += 1
+                elif winner == deep_piece:
+                    results['loss'] += 1
+                else:
+                    results['tie'] += 1
+                nodes += match_nodes[heuristic_piece]
+                deep_nodes += match_nodes[deep_piece]
+        print(f"{f'{side}x{side}':<7}{f'{depth} vs {deep_depth}':>8}{results['win']:>6}"
+              f"{results['tie']:>6}{results['loss']:>8}{nodes:>10}{deep_nodes:>14}")
+
+
+def _build_object_tree(tree: Any, game: bb.BitboardState, depth: int) -> int:
+    """
+    add a subtree of the same class as `tree` for every move in the given game, and
+    recursively for every move after those, until the game is over or `depth` moves
+    are made; return the number of nodes in the tree
+
+    the game is left unchanged once this function returns
+    """
+    if depth == 0 or game.get_winning_piece() is not None:
+        return 1
+    num_nodes = 1
+    piece = 'o' if tree.is_x_move else 'x'
+    for spot in game.empty_spots:
+        subtree = type(tree)(spot, not tree.is_x_move, 0)
+        tree.add_subtree(subtree)
+        game.place_piece(piece, spot)
+        num_nodes += _build_object_tree(subtree, game, depth - 1)
+        game.undo_piece()
+    return num_nodes
+
+
+def _build_array_tree(
+        tree: gt.ArrayGameTree, node: int, game: bb.BitboardState, depth: int
+) -> None:
+    """
+    like `_build_object_tree`, but for the given node of an `ArrayGameTree`
+    """
+    if depth == 0 or game.get_winning_piece() is not None:
+        return
+    piece = 'o' if tree.is_x_moves[node] else 'x'
+    spots = game.empty_spots
+    first = tree.add_subtrees(node, spots)
+    for offset, spot in enumerate(spots):
+        game.place_piece(piece, spot)
+        _build_array_tree(tree, first + offset, game, depth - 1)
+        game.undo_piece()
+
+
+def measure_tree(kind: str, side: int, depth: int) -> tuple[int, int, float]:
+    """
+    build the game tree of the empty board with sidelength `side` to the given depth,
+    with the node representation `kind` in {"GameTree", "CompactGameTree",
+    "ArrayGameTree"}, and return the number of nodes, the bytes allocated for the tree,
+    and the seconds taken to build it
+    """
+    game = bb.BitboardState(side)
+    # make sure the tables of the game state are allocated before measuring
+    game.place_piece('x', 0)
+    game.undo_piece()
+
+    tracemalloc.start()
+    start = time.time()
+    if kind == "GameTree":
+        tree = gt.GameTree(None, False, 0)
+        num_nodes = _build_object_tree(tree, game, depth)
+    elif kind == "CompactGameTree":
+        tree = gt.CompactGameTree(None, False, 0)
+        num_nodes = _build_object_tree(tree, game, depth)
+    else:
+        tree = gt.ArrayGameTree(is_x_move=False)
+        _build_array_tree(tree, 0, game, depth)
+        num_nodes = len(tree)
+    seconds = time.time() - start
+    num_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return num_nodes, num_bytes, seconds
+
+
+def report_tree_memory() -> None:
+    """
+    print the memory taken by each node representation of `game_tree` for the trees of
+    `TREE_MEMORY_CASES`
+    """
+    print(f"{'tree':<11}{'class':>16}{'nodes':>9}{'MiB':>9}{'bytes/node':>12}"
+          f"{'build s':>9}")
+    for side, depth in TREE_MEMORY_CASES:
+        for kind in ("GameTree", "CompactGameTree", "ArrayGameTree"):
+            num_nodes, num_bytes, seconds = measure_tree(kind, side, depth)
+            print(f"{f'{side}x{side} d{depth}':<11}{kind:>16}{num_nodes:>9}"
+                  f"{num_bytes / 2 ** 20:>9.1f}{num_bytes / num_nodes:>12.0f}"
+                  f"{seconds:>9.2f}")
+
+
+def time_moves(players: list, positions: list) -> tuple[list, float, int]:
+    """
+    return the move each of the given players chooses in the game position at the same
+    index, the total seconds taken, and the total number of nodes searched
+    """
+    moves = []
+    nodes = 0
+    start = time.time()
+    for player, game in zip(players, positions):
+        prev_move = game.move_history[-1] if game.move_history else None
+        moves.append(player.return_move(game, prev_move)[1])
+        nodes += player.get_nodes_searched()
+    return moves, time.time() - start, nodes
+
+
+def report_parallel() -> None:
+    """
+    print the time a "hard" `parallel.ParallelMinimaxPlayer` takes to choose its moves on
+    the seeded positions of the boards in `PARALLEL_SIDES` with each number of workers
+    in `PARALLEL_WORKERS`, its speedup over the serial `AIMinimaxPlayer`, and the number
+    of moves that differ from the serial search's
+    """
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'board':<7}{'workers':>8}{'seconds':>9}{'speedup':>9}{'nodes':>10}"
+          f"{'differ':>8}")
+    for side in PARALLEL_SIDES:
+        positions = seeded_positions(side)
+        pieces = ['x' if len(game.move_history) % 2 == 0 else 'o' for game in positions]
+        players = [ttt.AIMinimaxPlayer(piece, "hard", heuristic=True) for piece in pieces]
+        serial_moves, serial_seconds, nodes = time_moves(players, positions)
+        print(f"{f'{side}x{side}':<7}{'serial':>8}{serial_seconds:>9.2f}{1:>9.2f}"
+              f"{nodes:>10}{0:>8}")
+        for workers in PARALLEL_WORKERS:
+            with ProcessPoolExecutor(workers) as executor:
+                # start the worker processes before the clock does
+                list(executor.map(abs, range(workers)))
+                players = [parallel.ParallelMinimaxPlayer(
+                    piece, "hard", workers=workers, executor=executor, heuristic=True
+                ) for piece in pieces]
+                moves, seconds, nodes = time_moves(players, positions)
+            differ = sum(move != serial_move
+                         for move, serial_move in zip(moves, serial_moves))
+            print(f"{f'{side}x{side}':<7}{workers:>8}{seconds:>9.2f}"
+                  f"{serial_seconds / seconds:>9.2f}{nodes:>10}{differ:>8}")
+
+
+def play_pondering_game(side: int, seed: int, ponder: bool) -> list[tuple[float, bool]]:
+    """
+    play a game between a random player 'x', which thinks for `PONDER_THINK_MS` before
+    each move, and a timed "hard" `AIMinimaxPlayer` 'o', which ponders on the random
+    player's time if `ponder` is set; return the seconds each of the AI player's moves
+    took, each with whether the move was answered from a pondered search
+    """
+    rng = random.Random(seed)
+    game = ttt.GameState(ttt.empty_board(side))
+    player = ttt.AIMinimaxPlayer('o', "hard", time_budget_ms=PONDER_BUDGET_MS,
+                                 heuristic=True)
+    moves = []
+    while True:
+        think_end = time.time() + PONDER_THINK_MS / 1000
+        while ponder and time.time() < think_end and player.ponder(game, 20):
+            pass
+        spot = rng.choice(game.empty_spots)
+        game.place_piece('x', spot)
+        if game.get_winning_piece() is not None:
+            return moves
+
+        start = time.perf_counter()
+        piece, move = player.return_move(game, spot)
+        # a pondered reply is answered without visiting any node
+        moves.append((time.perf_counter() - start, player.get_nodes_searched() == 0))
+        game.place_piece(piece, move)
+        if game.get_winning_piece() is not None:
+            return moves
+
+
+def report_ponder() -> None:
+    """
+    print the time a timed "hard" `AIMinimaxPlayer` takes to answer a random player on
+    the boards in `PONDER_SIDES`, with and without pondering, and the share of its moves
+    answered from a pondered search
+    """
+    print(f"{'board':<7}{'ponder':>7}{'moves':>7}{'pondered':>10}{'ms/move':>9}"
+          f"{'max ms':>9}")
+    for side in PONDER_SIDES:
+        for ponder in (False, True):
+            moves = []
+            for seed in range(PONDER_GAMES):
+                moves.extend(play_pondering_game(side, seed, ponder))
+            seconds = [move_seconds for move_seconds, _ in moves]
+            pondered = sum(is_pondered for _, is_pondered in moves)
+            print(f"{f'{side}x{side}':<7}{'on' if ponder else 'off':>7}{len(moves):>7}"
+                  f"{pondered / len(moves):>10.0%}"
+                  f"{sum(seconds) / len(moves) * 1000:>9.1f}{max(seconds) * 1000:>9.1f}")
+
+
+def count_full_tree(game: bb.BitboardState, depth: int,
+                    counts: Optional[dict] = None) -> int:
+    """
+    return the number of nodes the Minimax search visits in the given game to the given
+    depth without any pruning: the root, and every position reached by `depth` moves or
+    fewer, not counting the moves made after a game is over
+
+    the subtree of each position is counted once and kept in `counts` by the position's
+    bitboards and depth, and a subtree in which the game cannot end in time is counted
+    without visiting it, so that the trees of the timed searches can be counted;
+    the game is left unchanged once this function returns
+
+    >>> count_full_tree(bb.BitboardState(3), 2)
+    82
+    >>> count_full_tree(bb.BitboardState(3), 9)  # every possible game
+    526906
+    """
+    if depth == 0 or game.get_winning_piece() is not None:
+        return 1
+    x_bits, o_bits = game.get_bitboards()
+    num_empty = game.get_num_empty()
+    if not _can_end_game(game, depth):
+        # every sequence of at most `depth` moves is a node
+        num_nodes = num_sequences = 1
+        for i in range(min(depth, num_empty)):
+            num_sequences *= num_empty - i
+            num_nodes += num_sequences
+        return num_nodes
+
+    if counts is None:
+        counts = {}
+    key = (x_bits, o_bits, depth)
+    if key not in counts:
+        piece = 'x' if len(game.move_history) % 2 == 0 else 'o'
+        num_nodes = 1
+        for spot in game.empty_spots:
+            game.place_piece(piece, spot)
+            num_nodes += count_full_tree(game, depth - 1, counts)
+            game.undo_piece()
+        counts[key] = num_nodes
+    return counts[key]
+
+
+def _can_end_game(game: bb.BitboardState, depth: int) -> bool:
+    """
+    return whether the given game could end within the next `depth` moves, either by a
+    player completing a line of its pieces, or by every line holding both pieces, which
+    `bb.BitboardState.get_winning_piece` calls a tie
+
+    >>> _can_end_game(bb.BitboardState(3), 3)
+    False
+    >>> _can_end_game(bb.BitboardState(3), 5)
+    True
+    """
+    x_bits, o_bits = game.get_bitboards()
+    side, win_len = game.get_side_length(), game.get_win_length()
+    is_x_next = len(game.move_history) % 2 == 0
+    x_moves = (depth + 1) // 2 if is_x_next else depth // 2
+    o_moves = depth - x_moves
+    lines_without_x = lines_without_o = 0
+    for mask in bb.get_line_masks(side, win_len):
+        if mask & o_bits == 0:
+            if win_len - bin(mask & x_bits).count('1') <= x_moves:
+                return True
+            lines_without_o += 1
+        if mask & x_bits == 0:
+            if win_len - bin(mask & o_bits).count('1') <= o_moves:
+                return True
+            lines_without_x += 1
+
+    # each move adds its piece to at most the lines through its spot
+    max_spot_lines = max(len(lines) for lines in bb.get_spot_line_masks(side, win_len))
+    return x_moves * max_spot_lines >= lines_without_x \
+        and o_moves * max_spot_lines >= lines_without_o
+
+
+def measure_suite_case(side: int, role: str, first: str) -> dict:
+    """
+    return the measurements of a fresh AI player of the given role choosing its moves on
+    the seeded positions of the board with sidelength `side`, where `first` is "ai" if
+    the AI player made the first move of the game, or "opponent" otherwise
+
+    each move is timed by itself, then chosen again by another fresh player to measure
+    its peak memory, since tracing the memory slows the search down; a timed search
+    reaches a shallower depth while traced, so its peak memory is a lower bound
+
+    the moves that "ai_hard" looks up in its table on the 3x3 board are timed, but do not
+    count towards the depth, nodes or pruning, which are `None` if no move was searched
+    """
+    parity = 0 if first == "ai" else 1
+    positions = [game for game in seeded_positions(side, 2 * NUM_POSITIONS)
+                 if len(game.move_history) % 2 == parity][:NUM_POSITIONS]
+    piece = 'x' if parity == 0 else 'o'
+
+    nodes = 0
+    full_nodes = 0
+    move_seconds = []
+    peak_bytes = 0
+    depth = None
+    for game in positions:
+        prev_move = game.move_history[-1] if game.move_history else None
+
+        player = ttt.role_to_player(role, piece, SUITE_TIME_BUDGET_MS)
+        start = time.perf_counter()
+        player.return_move(game, prev_move)
+        move_seconds.append(time.perf_counter() - start)
+        # the timed search deepens as far as its time allows on each position
+        if player.get_search_depth() > 0:
+            nodes += player.get_nodes_searched()
+            depth = max(depth or 0, player.get_search_depth())
+            full_nodes += count_full_tree(game.to_bitboard(), player.get_search_depth())
+
+        player = ttt.role_to_player(role, piece, SUITE_TIME_BUDGET_MS)
+        tracemalloc.start()
+        player.return_move(game, prev_move)
+        peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    seconds = sum(move_seconds)
+    return {
+        "side": side,
+        "role": role,
+        "first": first,
+        "depth": depth,
+        "positions": len(positions),
+        "nodes": nodes if depth is not None else None,
+        "nodes_per_sec": round(nodes / seconds) if depth is not None else None,
+        "ms_per_move": round(seconds / len(positions) * 1000, 3),
+        "max_ms_per_move": round(max(move_seconds) * 1000, 3),
+        "peak_kib": round(peak_bytes / 1024, 1),
+        "pruned": round(1 - nodes / full_nodes, 6) if depth is not None else None
+    }
+
+
+def report_suite(as_json: bool = False) -> None:
+    """
+    print the measurements of `measure_suite_case` for every board side of `SUITE_SIDES`,
+    role of `SUITE_ROLES`, and first player; as one line of JSON per case if `as_json`
+    is set, so that the results of two commits can be compared
+    """
+    if not as_json:
+        print(f"AI players of `tictactoe.role_to_player`, with a time budget of "
+              f"{SUITE_TIME_BUDGET_MS} ms per move")
+        print(f"{'board':<7}{'role':>8}{'first':>10}{'depth':>6}{'nodes':>9}"
+              f"{'nodes/s':>9}{'ms/move':>9}{'max ms':>9}{'peak KiB':>10}{'pruned':>8}")
+    for side in SUITE_SIDES:
+        for role in SUITE_ROLES:
+            for first in ("ai", "opponent"):
+                case = measure_suite_case(side, role, first)
+                if as_json:
+                    print(json.dumps(case), flush=True)
+                elif case["depth"] is None:
+                    # every move came from the table
+                    print(f"{f'{side}x{side}':<7}{role:>8}{first:>10}{'-':>6}{'-':>9}"
+                          f"{'-':>9}{case['ms_per_move']:>9.1f}"
+                          f"{case['max_ms_per_move']:>9.1f}{case['peak_kib']:>10.1f}"
+                          f"{'-':>8}")
+                else:
+                    print(f"{f'{side}x{side}':<7}{role:>8}{first:>10}"
+                          f"{case['depth']:>6}{case['nodes']:>9}"
+                          f"{case['nodes_per_sec']:>9}{case['ms_per_move']:>9.1f}"
+                          f"{case['max_ms_per_move']:>9.1f}{case['peak_kib']:>10.1f}"
+                          f"{case['pruned']:>8.2%}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        "report",
+        choices=["ordering", "evaluation", "tree-memory", "parallel", "ponder", "suite"],
+        help="ordering: the nodes saved by each move ordering heuristic; evaluation: "
+             "matches of shallow heuristic searches against deeper plain searches; "
+             "tree-memory: the memory taken by each game tree node class; parallel: "
+             "the speedup of the parallel root search by number of workers; ponder: "
+             "the time taken to answer a player with and without pondering; suite: "
+             "the speed, memory and pruning of each board, AI role and first player"
+    )
+    parser.add_argument("--json", action="store_true",
+                        help="print the suite as one line of JSON per case")
+    args = parser.parse_args()
+    if args.report == "ordering":
+        report_ordering()
+    elif args.report == "evaluation":
+        report_evaluation()
+    elif args.report == "tree-memory":
+        report_tree_memory()
+    elif args.report == "parallel":
+        report_parallel()
+    elif args.report == "ponder":
+        report_ponder()
+    elif args.report == "suite":
+        report_suite(args.json)
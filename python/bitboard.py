@@ -0,0 +1,661 @@
+"""
+A compact, integer bitmask based Tic Tac Toe game state for the AI players.
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+from type_hints import Optional, Any
+import random
+
+
+################################################################################
+# Winning line tables
+################################################################################
+
+# cache of the winning line tables for every (side length, winning length) pair that
+# has been requested so far; see `_get_line_table`
+_LINE_TABLES = {}
+
+
+def _get_line_table(side: int, win_len: int) -> tuple[list, list, list, list, list]:
+    """
+    return a tuple of five tables for a board with sidelength `side` where `win_len`
+    adjacent pieces win the game; spot (row, col) has the index `row * side + col`
+
+        - a list of winning lines, each a tuple of the spot indices on the line
+        - a list of the bitmasks of the winning lines, in the same order
+        - a list indexed by spot, of the winning lines through the spot
+        - a list indexed by spot, of the bitmasks of the winning lines through the spot
+        - a list indexed by spot, of the indices of the winning lines through the spot
+
+    the tables are only computed once for each board configuration
+    """
+    if (side, win_len) not in _LINE_TABLES:
+        lines = []
+        # rows, columns, top-left to bottom-right and top-right to bottom-left
+        for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for row in range(side):
+                for col in range(side):
+                    end_row = row + d_row * (win_len - 1)
+                    end_col = col + d_col * (win_len - 1)
+                    if 0 <= end_row < side and 0 <= end_col < side:
+                        lines.append(tuple(
+                            (row + d_row * i) * side + col + d_col * i
+                            for i in range(win_len)
+                        ))
+
+        masks = [sum(1 << idx for idx in line) for line in lines]
+
+        spot_lines = [[] for _ in range(side * side)]
+        spot_masks = [[] for _ in range(side * side)]
+        spot_line_idxs = [[] for _ in range(side * side)]
+        for line_idx, line in enumerate(lines):
+            for idx in line:
+                spot_lines[idx].append(line)
+                spot_masks[idx].append(masks[line_idx])
+                spot_line_idxs[idx].append(line_idx)
+
+        _LINE_TABLES[(side, win_len)] = (
+            lines, masks, spot_lines, spot_masks, spot_line_idxs
+        )
+    return _LINE_TABLES[(side, win_len)]
+
+
+def get_lines(side: int, win_len: Optional[int] = None) -> list[tuple]:
+    """
+    return every winning line on a board with sidelength `side` as a tuple of spot
+    indices, where `win_len` adjacent pieces win the game (the full side by default)
+
+    >>> get_lines(3)[:4]
+    [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6)]
+    >>> len(get_lines(4, 3))
+    24
+    """
+    return _get_line_table(side, win_len or side)[0]
+
+
+def get_line_masks(side: int, win_len: Optional[int] = None) -> list[int]:
+    """
+    return a list of bitmasks, one for each winning line of `get_lines`
+
+    >>> get_line_masks(2)
+    [3, 12, 5, 10, 9, 6]
+    """
+    return _get_line_table(side, win_len or side)[1]
+
+
+def get_spot_lines(side: int, win_len: Optional[int] = None) -> list[list[tuple]]:
+    """
+    return a list indexed by spot index, of the winning lines that pass through each spot
+
+    >>> get_spot_lines(3)[1]
+    [(0, 1, 2), (1, 4, 7)]
+    """
+    return _get_line_table(side, win_len or side)[2]
+
+
+def get_spot_line_masks(side: int, win_len: Optional[int] = None) -> list[list[int]]:
+    """
+    return a list indexed by spot index, of the bitmasks of the winning lines that pass
+    through each spot
+
+    >>> get_spot_line_masks(3)[4] == [56, 146, 273, 84]
+    True
+    """
+    return _get_line_table(side, win_len or side)[3]
+
+
+def get_spot_line_indices(side: int, win_len: Optional[int] = None) -> list[list[int]]:
+    """
+    return a list indexed by spot index, of the indices into `get_lines` of the winning
+    lines that pass through each spot
+
+    >>> get_spot_line_indices(3)[4]
+    [1, 4, 6, 7]
+    """
+    return _get_line_table(side, win_len or side)[4]
+
+
+################################################################################
+# Line evaluation
+################################################################################
+
+# the value of an open line grows by this factor with every piece on it
+LINE_WEIGHT = 10
+
+# cache of the line value tables for every winning length requested so far
+_LINE_VALUES = {}
+
+
+def get_line_values(win_len: int) -> tuple[list[int], list[int], list[int]]:
+    """
+    return three lists indexed by the piece count code of a winning line of length
+    `win_len`, which is `x_count + o_count * (win_len + 1)`:
+
+        - the value of the line, `LINE_WEIGHT ** (count - 1)` for a line that holds
+          `count` pieces of 'x' and none of 'o', negated for a line that holds only 'o',
+          and 0 for an empty line or one that is blocked by both pieces
+        - the change of the value when an 'x' is added to the line
+        - the change of the value when an 'o' is added to the line
+
+    the value of a board is the sum of the values of its lines, so placing a piece only
+    needs the lines through its spot to update it
+
+    >>> values, x_deltas, o_deltas = get_line_values(3)
+    >>> values[2], values[2 * 4], values[1 + 4]  # 'xx', 'oo', and a blocked line
+    (10, -10, 0)
+    >>> x_deltas[1 * 4]  # an 'x' blocks an 'o' line
+    1
+    """
+    if win_len not in _LINE_VALUES:
+        step = win_len + 1
+        values = [0] * (step * step)
+        for x_count in range(step):
+            for o_count in range(step):
+                if o_count == 0 and x_count > 0:
+                    value = LINE_WEIGHT ** (x_count - 1)
+                elif x_count == 0 and o_count > 0:
+                    value = -LINE_WEIGHT ** (o_count - 1)
+                else:
+                    value = 0
+                values[x_count + o_count * step] = value
+        # a code whose line is already full never gets another piece
+        x_deltas = [
+            values[code + 1] - values[code] if code % step < win_len else 0
+            for code in range(step * step)
+        ]
+        o_deltas = [
+            values[code + step] - values[code] if code + step < step * step else 0
+            for code in range(step * step)
+        ]
+        _LINE_VALUES[win_len] = (values, x_deltas, o_deltas)
+    return _LINE_VALUES[win_len]
+
+
+# cache of the line closing tables for every winning length requested so far
+_LINE_CLOSINGS = {}
+
+
+def get_line_closings(win_len: int) -> tuple[list[int], list[int]]:
+    """
+    return two lists indexed by the piece count code of a winning line of length
+    `win_len` (see `get_line_values`), of 1 where adding an 'x' or an 'o' to the line
+    blocks it for both players, and 0 where the line stays open to one of them or was
+    already blocked
+
+    a position where every line is blocked is a tie, however the game goes on, so
+    counting the open lines as pieces are placed finds such positions right away
+
+    >>> x_closings, o_closings = get_line_closings(3)
+    >>> x_closings[1 * 4], x_closings[1 + 1 * 4]  # an 'x' on an 'o' line, then again
+    (1, 0)
+    >>> o_closings[2], o_closings[0]  # an 'o' on an 'xx' line, or on an empty one
+    (1, 0)
+    """
+    if win_len not in _LINE_CLOSINGS:
+        step = win_len + 1
+        codes = range(step * step)
+        x_closings = [int(code >= step and code % step == 0) for code in codes]
+        o_closings = [int(code < step and code % step > 0) for code in codes]
+        _LINE_CLOSINGS[win_len] = (x_closings, o_closings)
+    return _LINE_CLOSINGS[win_len]
+
+
+################################################################################
+# Zobrist hashing
+################################################################################
+
+# cache of the Zobrist keys for every side length that has been requested so far
+_ZOBRIST_KEYS = {}
+
+
+def get_zobrist_keys(side: int) -> tuple[list[int], list[int]]:
+    """
+    return two lists of random keys indexed by spot index, one for 'x' and one for 'o',
+    for a board with sidelength `side`; the hash of a board is the XOR of the keys of
+    every piece on it, so it can be updated with a single XOR for each placed piece
+
+    the keys are seeded by the side length so the hashes are reproducible, and they
+    are kept below 2 ** 31 so that they stay native integers under Brython
+
+    >>> x_keys, o_keys = get_zobrist_keys(3)
+    >>> len(x_keys), len(set(x_keys + o_keys))
+    (9, 18)
+    >>> get_zobrist_keys(3)[0] == x_keys
+    True
+    """
+    if side not in _ZOBRIST_KEYS:
+        rng = random.Random(side)
+        keys = []
+        while len(keys) < 2 * side * side:
+            key = rng.randrange(1, 1 << 31)
+            if key not in keys:
+                keys.append(key)
+        _ZOBRIST_KEYS[side] = (keys[:side * side], keys[side * side:])
+    return _ZOBRIST_KEYS[side]
+
+
+################################################################################
+# Bitboard game state
+################################################################################
+
+class BitboardState:
+    """
+    A Tic Tac Toe game state that stores the board as two integer bitmasks, one for
+    each game piece, instead of a nested list of strings.
+
+    It exposes the same interface as `tictactoe.GameState`, so it can be used wherever
+    a game state is expected; placing and undoing a piece are constant time integer
+    operations, which makes it well suited for the simulated moves of a game tree
+    search.
+
+    Instance Attributes:
+        - next_player: the player from {'p1', 'p2'} that will place the next game piece
+        - move_history: a history of the spot indices of the moves that occured in this
+          game
+        - hash_key: the Zobrist hash of the pieces on the board, maintained by
+          `place_piece` and `undo_piece`; see `get_zobrist_keys`
+        - line_score: the sum of the values of every winning line on the board, also
+          maintained by `place_piece` and `undo_piece`; see `get_line_values`
+
+    >>> game = BitboardState(3)
+    >>> game.place_piece('x', 4)
+    >>> game.place_piece('o', 0)
+    >>> game.empty_spots
+    [1, 2, 3, 5, 6, 7, 8]
+    >>> game.undo_piece()
+    0
+    >>> game.get_num_empty()
+    8
+    """
+    next_player: str
+    move_history: list[int]
+    hash_key: int
+    line_score: int
+
+    # Private Instance Attributes:
+    #   - _x_bits: bitmask of the spots occupied by 'x'
+    #   - _o_bits: bitmask of the spots occupied by 'o'
+    #   - _board_side: the side length of the board
+    #   - _win_len: the number of adjacent pieces that wins the game
+    #   - _num_empty: the number of vacant spots left on the board
+    #   - _spot_masks: the masks of the winning lines through each spot
+    #   - _x_keys, _o_keys: the Zobrist keys of each spot for 'x' and 'o'
+    #   - _spot_line_idxs: the indices of the winning lines through each spot
+    #   - _line_codes: the piece count code of each winning line; see `get_line_values`
+    #   - _x_deltas, _o_deltas: the changes of a line's value when a piece is added
+    #   - _open_lines: the number of winning lines that do not hold both pieces, so
+    #     that either player may still complete them
+    #   - _x_closings, _o_closings: whether adding a piece blocks a line; see
+    #     `get_line_closings`
+    #   - _eval_scale: a number larger than any `line_score`, which `evaluate` divides by
+    #   - _winner: the piece that has completed a winning line, or `None`
+    #   - _win_move_count: the length of the move history when `_winner` was found, so
+    #     that undoing the winning move also clears it; -1 if the winner was already on
+    #     the board when this game state was created
+    _x_bits: int
+    _o_bits: int
+    _board_side: int
+    _win_len: int
+    _num_empty: int
+    _spot_masks: list[list[int]]
+    _x_keys: list[int]
+    _o_keys: list[int]
+    _spot_line_idxs: list[list[int]]
+    _line_codes: list[int]
+    _x_deltas: list[int]
+    _o_deltas: list[int]
+    _open_lines: int
+    _x_closings: list[int]
+    _o_closings: list[int]
+    _eval_scale: int
+    _winner: Optional[str]
+    _win_move_count: int
+
+    def __init__(
+            self,
+            side: int,
+            next_player: str = 'p1',
+            move_hist: Optional[list] = None,
+            x_bits: int = 0,
+            o_bits: int = 0,
+            win_len: Optional[int] = None
+    ) -> None:
+        self._board_side = side
+        self._win_len = win_len or side
+        self._x_bits = x_bits
+        self._o_bits = o_bits
+        self._num_empty = side * side - bin(x_bits | o_bits).count('1')
+        self._spot_masks = get_spot_line_masks(side, self._win_len)
+        self._x_keys, self._o_keys = get_zobrist_keys(side)
+        self.hash_key = 0
+        for idx in range(side * side):
+            if x_bits >> idx & 1:
+                self.hash_key ^= self._x_keys[idx]
+            elif o_bits >> idx & 1:
+                self.hash_key ^= self._o_keys[idx]
+        self._init_line_codes()
+        self.move_history = move_hist if move_hist is not None else []
+        self.next_player = next_player
+        self._winner = self._find_winner()
+        self._win_move_count = -1
+
+    def _init_line_codes(self) -> None:
+        """
+        count the pieces on every winning line of the board, sum up the line values, and
+        count the lines that are still open
+        """
+        win_len = self._win_len
+        values, self._x_deltas, self._o_deltas = get_line_values(win_len)
+        self._x_closings, self._o_closings = get_line_closings(win_len)
+        self._spot_line_idxs = get_spot_line_indices(self._board_side, win_len)
+        self._line_codes = []
+        self.line_score = 0
+        self._open_lines = 0
+        for mask in get_line_masks(self._board_side, win_len):
+            code = bin(self._x_bits & mask).count('1') \
+                + bin(self._o_bits & mask).count('1') * (win_len + 1)
+            self._line_codes.append(code)
+            self.line_score += values[code]
+            if code <= win_len or code % (win_len + 1) == 0:
+                self._open_lines += 1
+        self._eval_scale = len(self._line_codes) * LINE_WEIGHT ** (win_len - 1) + 1
+
+    @classmethod
+    def from_board(
+            cls,
+            board: list[list[str]],
+            next_player: str = 'p1',
+            move_hist: Optional[list] = None,
+            win_len: Optional[int] = None
+    ) -> Any:
+        """
+        build a bitboard game state from a nested list game board
+
+        >>> game = BitboardState.from_board([['x', '', ''], ['', 'o', ''], ['', '', '']])
+        >>> game.get_num_empty()
+        7
+        >>> game.empty_spots[:3]
+        [1, 2, 3]
+        """
+        side = len(board)
+        x_bits = 0
+        o_bits = 0
+        for row_idx in range(side):
+            for col_idx in range(side):
+                if board[row_idx][col_idx] == 'x':
+                    x_bits |= 1 << (row_idx * side + col_idx)
+                elif board[row_idx][col_idx] == 'o':
+                    o_bits |= 1 << (row_idx * side + col_idx)
+        return cls(side, next_player, move_hist, x_bits, o_bits, win_len)
+
+    def _find_winner(self) -> Optional[str]:
+        """
+        scan every winning line of the board for a winner; only used when a game state is
+        created, the winner is tracked incrementally by `place_piece` afterwards
+        """
+        for mask in get_line_masks(self._board_side, self._win_len):
+            if self._x_bits & mask == mask:
+                return 'x'
+            elif self._o_bits & mask == mask:
+                return 'o'
+        return None
+
+    @property
+    def empty_spots(self) -> list[int]:
+        """
+        a list of the indices of the vacant spots on the game board, in the same
+        row-major order as `tictactoe.GameState.empty_spots`
+        """
+        taken = self._x_bits | self._o_bits
+        return [idx for idx in range(self._board_side ** 2) if not taken >> idx & 1]
+
+    def get_side_length(self) -> int:
+        """
+        return the board's side length
+        """
+        return self._board_side
+
+    def get_win_length(self) -> int:
+        """
+        return the number of adjacent pieces that wins the game
+        """
+        return self._win_len
+
+    def get_num_empty(self) -> int:
+        """
+        return the number of vacant spots left on the board
+        """
+        return self._num_empty
+
+    def get_bitboards(self) -> tuple[int, int]:
+        """
+        return the bitmasks of the spots occupied by 'x' and by 'o'
+        """
+        return self._x_bits, self._o_bits
+
+    def get_position(self) -> tuple[int, int, int]:
+        """
+        return the hash and the two bitboards that identify this position in a
+        transposition table; `symmetry.SymmetricState` returns those of the position's
+        canonical orientation instead
+        """
+        return self.hash_key, self._x_bits, self._o_bits
+
+    def to_position_spot(self, spot: int) -> int:
+        """
+        map a spot on this board to the orientation of `get_position`; the orientation
+        is the board itself here, but not for `symmetry.SymmetricState`
+        """
+        return spot
+
+    def from_position_spot(self, spot: int) -> int:
+        """
+        map a spot in the orientation of `get_position` back onto this board
+        """
+        return spot
+
+    def get_distinct_spots(self) -> list[int]:
+        """
+        return the vacant spots that lead to distinct positions; every vacant spot here,
+        but `symmetry.SymmetricState` leaves out spots symmetric to an earlier one
+        """
+        return self.empty_spots
+
+    def place_piece(self, piece: str, spot: int) -> None:
+        """
+        place the given piece on the given spot on the game board, if the spot is empty;
+        only the winning lines through the given spot are checked for a new winner
+
+        Preconditions:
+            - `spot` must be the index `row * side + col` of a spot on the board, or a
+              `ValueError` will be raised
+            - the spot must be empty, or a `ValueError` will be raised
+            - piece in {'x', 'o'}
+        """
+        if spot >= self._board_side ** 2 or spot < 0:
+            raise ValueError(f"[!] Given spot {spot} is out of range.")
+        bit = 1 << spot
+
+        if (self._x_bits | self._o_bits) & bit:
+            raise ValueError(f"[!] Given spot {spot} is not empty.")
+
+        codes = self._line_codes
+        if piece == 'x':
+            self._x_bits |= bit
+            self.hash_key ^= self._x_keys[spot]
+            bits = self._x_bits
+            deltas, closings, step = self._x_deltas, self._x_closings, 1
+        else:
+            self._o_bits |= bit
+            self.hash_key ^= self._o_keys[spot]
+            bits = self._o_bits
+            deltas, closings, step = self._o_deltas, self._o_closings, self._win_len + 1
+        for line_idx in self._spot_line_idxs[spot]:
+            code = codes[line_idx]
+            self.line_score += deltas[code]
+            self._open_lines -= closings[code]
+            codes[line_idx] = code + step
+        self._num_empty -= 1
+        self.next_player = 'p2' if self.next_player == 'p1' else 'p1'
+        self.move_history.append(spot)
+
+        if self._winner is None:
+            for mask in self._spot_masks[spot]:
+                if bits & mask == mask:
+                    self._winner = piece
+                    self._win_move_count = len(self.move_history)
+                    break
+
+    def undo_piece(self) -> int:
+        """
+        take back the most recent move in the move history, and return its spot
+
+        Preconditions:
+            - len(self.move_history) > 0
+
+        >>> game = BitboardState(3)
+        >>> game.place_piece('x', 5)
+        >>> game.hash_key == get_zobrist_keys(3)[0][5]
+        True
+        >>> game.undo_piece()
+        5
+        >>> game.hash_key, game.line_score
+        (0, 0)
+        """
+        if self._win_move_count == len(self.move_history):
+            self._winner = None
+            self._win_move_count = -1
+
+        spot = self.move_history.pop()
+        bit = 1 << spot
+        if self._x_bits & bit:
+            self._x_bits &= ~bit
+            self.hash_key ^= self._x_keys[spot]
+            deltas, closings, step = self._x_deltas, self._x_closings, 1
+        else:
+            self._o_bits &= ~bit
+            self.hash_key ^= self._o_keys[spot]
+            deltas, closings, step = self._o_deltas, self._o_closings, self._win_len + 1
+        codes = self._line_codes
+        for line_idx in self._spot_line_idxs[spot]:
+            code = codes[line_idx] - step
+            self.line_score -= deltas[code]
+            self._open_lines += closings[code]
+            codes[line_idx] = code
+        self._num_empty += 1
+        self.next_player = 'p2' if self.next_player == 'p1' else 'p1'
+        return spot
+
+    def copy(self) -> Any:
+        """
+        return an independent copy of the current game state
+        """
+        new_game = BitboardState(
+            self._board_side,
+            self.next_player,
+            list(self.move_history),
+            self._x_bits,
+            self._o_bits,
+            self._win_len
+        )
+        new_game._win_move_count = self._win_move_count
+        return new_game
+
+    def to_bitboard(self) -> Any:
+        """
+        return a bitboard copy of the current game state, mirroring
+        `tictactoe.GameState.to_bitboard`
+        """
+        return self.copy()
+
+    def copy_and_place_piece(self, piece: str, spot: int) -> Any:
+        """
+        make a copy of the current game state, make a move in the game state copy, and
+        return the game state copy object
+        """
+        new_game = self.copy()
+        new_game.place_piece(piece, spot)
+        return new_game
+
+    def get_winning_piece(self) -> Optional[str]:
+        """
+        return 'x' or 'o' or `None` as the winner of the game in its current state, or
+        "tie" if the board is full without a winner, or if every winning line holds
+        both pieces so that no player can win anymore; the winner and the number of open
+        lines are kept by `place_piece`, so this is a constant time lookup
+
+        >>> board = [['x', 'x', ''], ['o', 'o', ''], ['', '', '']]
+        >>> game = BitboardState.from_board(board)
+        >>> game.place_piece('x', 2)
+        >>> game.get_winning_piece()
+        'x'
+        >>> game.undo_piece()
+        2
+        >>> game.get_winning_piece() is None
+        True
+        >>> game = BitboardState(4, win_len=3)
+        >>> for spot in [5, 0, 10, 1]:
+        ...     game.place_piece('x' if spot in {5, 10} else 'o', spot)
+        >>> game.place_piece('x', 15)
+        >>> game.get_winning_piece()
+        'x'
+        >>> board = [['x', 'o', 'x'], ['x', 'o', 'o'], ['o', '', '']]
+        >>> game = BitboardState.from_board(board)
+        >>> game.get_winning_piece() is None  # 'o' may still fill the middle column
+        True
+        >>> game.place_piece('x', 7)
+        >>> game.get_winning_piece(), game.get_num_empty()
+        ('tie', 1)
+        """
+        if self._winner is not None:
+            return self._winner
+
+        if self._num_empty == 0 or self._open_lines == 0:
+            return "tie"
+
+        return None
+
+    def evaluate(self) -> float:
+        """
+        return a heuristic score of the board for 'x', strictly between -1 and 1: the
+        `line_score` of the board, scaled down so that any position ranks below a game
+        won by 'x' and above a game won by 'o' in the Minimax scores of
+        `tictactoe.AIMinimaxPlayer`
+
+        >>> game = BitboardState(3)
+        >>> game.place_piece('x', 4)  # the centre is on 4 lines
+        >>> game.place_piece('o', 0)  # blocks 1 of them, and opens 2 of its own
+        >>> game.line_score
+        1
+        >>> game.place_piece('x', 8)  # opens 2 more lines
+        >>> game.line_score, 0 < game.evaluate() < 1
+        (3, True)
+        """
+        return self.line_score / self._eval_scale
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
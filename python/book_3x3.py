@@ -0,0 +1,217 @@
+"""
+Perfect-play moves for the 3x3 board, generated by `opening_book.py`; do not edit.
+
+Maps the `opening_book.book_key` of every canonical position to the
+index of its best move.
+"""
+BOOK = {
+    0: 0, 512: 4, 514: 3, 528: 1, 1024: 0, 1025: 3,
+    1040: 0, 1548: 4, 1552: 2, 1576: 4, 1604: 4, 2049: 3,
+    2562: 4, 2570: 4, 2576: 1, 2578: 7, 2600: 4, 3073: 3,
+    3089: 8, 4098: 0, 4610: 6, 4626: 7, 5121: 4, 5125: 4,
+    5136: 0, 5137: 8, 5188: 4, 5700: 4, 6145: 4, 6146: 4,
+    6147: 4, 6160: 0, 6161: 8, 6162: 7, 6674: 7, 6754: 7,
+    7185: 8, 7265: 8, 8192: 0, 8193: 1, 8194: 0, 8706: 8,
+    8714: 8, 8716: 8, 8744: 8, 8772: 8, 9217: 7, 9221: 7,
+    9228: 7, 9256: 7, 9284: 7, 9740: 5, 9768: 2, 9796: 3,
+    10241: 6, 10243: 6, 10250: 6, 10762: 5, 10792: 1, 10794: 6,
+    10850: 8, 11305: 6, 11361: 3, 12290: 5, 12291: 2, 12293: 1,
+    12870: 5, 12898: 8, 13317: 5, 13380: 0, 13381: 5, 13409: 7,
+    14339: 5, 14433: 1, 14434: 0, 14946: 8, 15457: 7, 16385: 2,
+    16906: 2, 16908: 1, 16964: 4, 17409: 6, 17420: 6, 17425: 8,
+    17476: 4, 17932: 4, 17948: 6, 17988: 4, 18433: 8, 18435: 8,
+    18442: 8, 18449: 8, 18954: 8, 18970: 7, 19473: 8, 20481: 4,
+    20482: 4, 20483: 2, 20485: 1, 20496: 0, 20497: 8, 20498: 7,
+    20548: 4, 21010: 7, 21060: 4, 21062: 4, 21509: 4, 21521: 8,
+    21525: 6, 21572: 4, 21573: 4, 22531: 4, 22545: 8, 22547: 7,
+    24577: 3, 24579: 2, 24586: 0, 24588: 0, 25098: 8, 25100: 8,
+    25102: 8, 25156: 1, 25158: 3, 25612: 7, 25613: 6, 25668: 0,
+    25669: 3, 26627: 3, 26634: 0, 26635: 6, 32770: 0, 33282: 3,
+    33292: 5, 33298: 7, 33320: 4, 33797: 8, 33804: 5, 33832: 4,
+    34316: 5, 34332: 5, 34344: 4, 34817: 4, 34818: 4, 34819: 4,
+    34826: 4, 34832: 1, 34833: 8, 34834: 7, 34856: 4, 35338: 4,
+    35346: 7, 35354: 5, 35368: 4, 35370: 4, 35857: 8, 35880: 4,
+    35881: 4, 36866: 0, 36867: 2, 36869: 1, 36882: 7, 37893: 8,
+    37909: 8, 38915: 4, 38930: 7, 38931: 7, 40962: 2, 40963: 2,
+    40965: 1, 40972: 0, 41484: 8, 41486: 8, 41512: 1, 41514: 2,
+    41989: 7, 41996: 7, 41997: 7, 42024: 0, 42025: 2, 45059: 2,
+    45061: 1, 49153: 2, 49154: 4, 49155: 2, 49157: 1, 49162: 2,
+    49164: 0, 49169: 8, 49170: 7, 49674: 4, 49676: 4, 49678: 4,
+    49682: 7, 49690: 7, 49692: 1, 50181: 4, 50188: 4, 50189: 4,
+    50193: 8, 50197: 8, 50204: 0, 50716: 7, 51203: 3, 51210: 0,
+    51211: 4, 51217: 8, 51218: 7, 51219: 7, 51226: 7, 51738: 7,
+    53251: 2, 53253: 1, 53265: 8, 53266: 7, 53267: 2, 53269: 1,
+    54293: 8, 55315: 7, 57347: 2, 57349: 1, 57354: 2, 57355: 2,
+    57356: 0, 57357: 1, 57358: 0, 57870: 8, 58381: 7, 65538: 0,
+    66050: 6, 66060: 4, 66066: 3, 66565: 4, 66572: 4, 66600: 4,
+    67084: 4, 67100: 5, 67112: 4, 67587: 6, 68114: 3, 68136: 4,
+    68138: 4, 68194: 3, 68649: 4, 68705: 3, 69634: 6, 69635: 2,
+    69637: 1, 69650: 0, 70162: 6, 70214: 4, 70242: 2, 70661: 4,
+    70677: 6, 70753: 4, 71683: 4, 71698: 6, 71699: 8, 71777: 1,
+    71778: 0, 72290: 4, 72306: 8, 72801: 4, 72817: 8, 73730: 0,
+    73731: 2, 73733: 1, 73740: 1, 74252: 1, 74254: 8, 74282: 8,
+    74310: 8, 74338: 8, 75779: 6, 75817: 6, 75873: 3, 76330: 6,
+    76386: 8, 76394: 8, 77827: 2, 77829: 1, 77894: 0, 77922: 2,
+    78406: 5, 78434: 8, 78438: 8, 79969: 1, 79970: 0, 79971: 8,
+    81921: 2, 81923: 2, 81930: 0, 81932: 0, 81937: 8, 82442: 8,
+    82444: 4, 82446: 4, 82458: 2, 82460: 6, 82500: 4, 82502: 4,
+    82956: 4, 82957: 6, 82961: 8, 82972: 6, 83013: 3, 83484: 6,
+    83971: 8, 83978: 8, 83979: 6, 83985: 8, 83987: 8, 83994: 8,
+    84506: 8, 86019: 2, 86021: 1, 86034: 0, 86035: 2, 86037: 1,
+    86086: 0, 86598: 4, 87061: 6, 87109: 4, 87365: 4, 88083: 8,
+    90115: 2, 90122: 0, 90123: 2, 90124: 1, 90125: 1, 90126: 0,
+    90181: 1, 90182: 0, 90638: 8, 90694: 3, 90702: 8, 92171: 6,
+    98306: 8, 98307: 2, 98309: 1, 98316: 8, 98322: 8, 98828: 8,
+    98830: 8, 98834: 2, 98844: 5, 98858: 4, 99333: 3, 99340: 0,
+    99341: 4, 99349: 8, 99356: 5, 99369: 4, 99868: 5, 100355: 3,
+    100370: 8, 100371: 8, 100393: 4, 100394: 4, 100906: 4, 101417: 4,
+    102403: 2, 102405: 1, 102418: 0, 102419: 2, 102421: 1, 103445: 8,
+    104467: 8, 106499: 2, 106501: 1, 106508: 0, 106509: 1, 106510: 0,
+    106537: 1, 106538: 0, 107022: 8, 107050: 2, 114691: 2, 114693: 1,
+    114700: 8, 114701: 1, 114702: 0, 114706: 8, 114707: 2, 114709: 1,
+    114716: 8, 115214: 8, 115228: 8, 115230: 8, 115725: 4, 115733: 8,
+    115740: 8, 115741: 8, 116747: 4, 116755: 8, 116762: 8, 116763: 8,
+    118803: 2, 118805: 1, 122893: 1, 122894: 0, 131073: 2, 131594: 4,
+    131596: 4, 131652: 4, 132097: 4, 132108: 4, 132113: 3, 132620: 4,
+    132636: 5, 132676: 4, 133121: 5, 133123: 5, 133130: 5, 133137: 5,
+    133642: 4, 133658: 5, 133730: 4, 134161: 5, 134185: 4, 134241: 3,
+    135171: 2, 135750: 4, 135778: 4, 136209: 2, 136261: 4, 137219: 5,
+    137233: 5, 137235: 7, 137313: 1, 137826: 4, 137842: 7, 138337: 4,
+    138353: 7, 139265: 2, 139267: 2, 139274: 0, 139276: 0, 140300: 0,
+    140301: 6, 140329: 6, 140357: 3, 141315: 3, 141322: 0, 141323: 6,
+    141353: 6, 141409: 3, 142377: 6, 142433: 3, 143363: 2, 143430: 0,
+    144453: 5, 144485: 7, 145505: 1, 145507: 7, 147457: 2, 147459: 2,
+    147466: 2, 147468: 0, 147473: 2, 147978: 2, 147980: 4, 147982: 4,
+    147994: 7, 147996: 6, 148038: 4, 148492: 6, 148493: 6, 148497: 2,
+    148508: 6, 148549: 3, 149020: 6, 151555: 2, 151569: 2, 151571: 2,
+    151621: 1, 151622: 0, 152134: 4, 152645: 4, 155651: 2, 155658: 0,
+    155659: 2, 155660: 0, 155661: 1, 155662: 0, 155717: 1, 155718: 0,
+    156685: 6, 156741: 3, 163842: 7, 163843: 2, 163845: 1, 163852: 7,
+    163858: 7, 164364: 1, 164366: 4, 164370: 7, 164380: 5, 164394: 4,
+    164869: 7, 164876: 7, 164877: 7, 164885: 7, 164892: 5, 164905: 4,
+    165404: 5, 165891: 3, 165898: 0, 165899: 4, 165905: 1, 165907: 7,
+    165914: 5, 165929: 4, 166426: 5, 166442: 4, 166570: 4, 166953: 4,
+    167939: 2, 167941: 1, 167954: 7, 167955: 2, 167957: 1, 168981: 7,
+    170003: 7, 172035: 2, 172037: 1, 172044: 0, 172045: 1, 172046: 0,
+    172073: 1, 172074: 0, 173069: 7, 173097: 2, 173101: 7, 180227: 2,
+    180234: 0, 180235: 2, 180236: 7, 180237: 1, 180238: 0, 180241: 1,
+    180243: 2, 180250: 7, 180252: 7, 180750: 4, 180762: 7, 180764: 7,
+    180766: 7, 181261: 7, 181276: 7, 181277: 7, 184339: 2, 184341: 1,
+    188427: 2, 188429: 1, 188430: 0, 196611: 2, 196620: 6, 197132: 1,
+    197134: 4, 197148: 5, 197190: 4, 197644: 0, 197645: 6, 197660: 5,
+    197673: 4, 198172: 5, 198252: 4, 198659: 3, 198675: 3, 198697: 4,
+    199274: 4, 199721: 4, 199777: 3, 199793: 3, 200707: 2, 200723: 2,
+    200774: 0, 201286: 4, 201314: 4, 201318: 4, 201330: 2, 201829: 4,
+    202771: 5, 202851: 4, 204803: 2, 204812: 0, 204813: 1, 204814: 0,
+    204841: 6, 204870: 0, 206889: 6, 206891: 6, 206947: 3, 206954: 0,
+    208966: 0, 208995: 2, 208997: 1, 212995: 2, 213002: 0, 213003: 2,
+    213004: 6, 213005: 1, 213006: 0, 213009: 1, 213011: 2, 213018: 0,
+    213020: 6, 213061: 1, 213062: 0, 213518: 4, 213530: 2, 213532: 6,
+    213534: 6, 213574: 4, 213582: 4, 214029: 6, 214044: 6, 214045: 6,
+    214085: 3, 217107: 2, 217158: 0, 221195: 2, 221197: 1, 221198: 0,
+    221253: 1, 221254: 0, 221262: 0, 262144: 0, 262145: 4, 262146: 0,
+    262160: 0, 262658: 3, 262666: 4, 262668: 4, 262672: 1, 262674: 7,
+    262696: 4, 262724: 4, 263169: 3, 263173: 4, 263180: 4, 263184: 0,
+    263185: 8, 263208: 4, 263236: 4, 263692: 4, 263708: 5, 263720: 2,
+    263748: 4, 264193: 5, 264195: 5, 264202: 8, 264209: 8, 264714: 4,
+    264722: 7, 264730: 5, 264744: 1, 264746: 4, 264802: 4, 265233: 8,
+    265257: 4, 265313: 3, 266242: 0, 266243: 2, 266245: 1, 266258: 7,
+    266770: 6, 266822: 4, 266850: 2, 267269: 4, 267281: 8, 267285: 5,
+    267332: 4, 267333: 4, 267361: 4, 268291: 4, 268305: 8, 268306: 7,
+    268307: 5, 268385: 4, 268386: 4, 268898: 4, 268914: 7, 269409: 4,
+    269425: 8, 270337: 1, 270338: 0, 270339: 2, 270341: 1, 270346: 0,
+    270348: 0, 270376: 0, 270404: 1, 270858: 8, 270860: 8, 270862: 8,
+    270888: 8, 270890: 8, 270916: 8, 270918: 8, 270946: 8, 271365: 7,
+    271372: 7, 271373: 7, 271400: 7, 271401: 7, 271428: 7, 271429: 7,
+    271457: 7, 271980: 7, 272387: 6, 272394: 6, 272395: 6, 272425: 6,
+    272481: 3, 272482: 0, 272938: 6, 272994: 8, 273002: 8, 273066: 6,
+    273449: 6, 273505: 7, 274435: 5, 274437: 5, 274502: 5, 274529: 1,
+    274530: 2, 275014: 5, 275042: 8, 275046: 8, 275525: 5, 275553: 7,
+    275557: 7, 275781: 5, 276577: 1, 276578: 0, 276579: 7, 278529: 2,
+    278531: 2, 278538: 0, 278540: 0, 278545: 8, 279050: 8, 279052: 1,
+    279054: 4, 279066: 7, 279068: 6, 279108: 4, 279110: 4, 279564: 0,
+    279565: 6, 279569: 8, 279580: 6, 279620: 4, 279621: 3, 280092: 6,
+    280579: 8, 280586: 8, 280587: 8, 280593: 8, 280595: 8, 280602: 8,
+    281114: 8, 282627: 4, 282629: 4, 282641: 8, 282642: 7, 282643: 2,
+    282645: 1, 282692: 4, 282693: 4, 282694: 4, 283206: 4, 283669: 6,
+    283717: 4, 283973: 4, 284691: 8, 286723: 3, 286730: 2, 286731: 2,
+    286732: 0, 286733: 1, 286734: 0, 286789: 3, 286790: 3, 287246: 8,
+    287302: 3, 287310: 8, 287757: 7, 287813: 3, 288779: 6, 294914: 0,
+    294915: 2, 294917: 1, 294924: 4, 294930: 7, 295436: 8, 295438: 8,
+    295442: 3, 295452: 5, 295464: 4, 295466: 4, 295941: 7, 295948: 7,
+    295949: 7, 295957: 8, 295964: 5, 295976: 4, 295977: 4, 296476: 5,
+    296963: 4, 296970: 4, 296971: 4, 296977: 8, 296978: 7, 296979: 3,
+    296986: 0, 297000: 4, 297001: 4, 297002: 4, 297498: 5, 297514: 4,
+    297642: 4, 298025: 4, 299011: 2, 299013: 1, 299026: 0, 299027: 2,
+    299029: 1, 300053: 8, 301075: 5, 303107: 2, 303109: 1, 303116: 7,
+    303117: 1, 303118: 0, 303145: 2, 303146: 2, 303630: 8, 303658: 2,
+    304141: 7, 304169: 2, 304173: 7, 311299: 2, 311301: 1, 311306: 2,
+    311307: 2, 311308: 0, 311309: 1, 311310: 0, 311313: 8, 311314: 7,
+    311315: 2, 311317: 1, 311322: 7, 311324: 0, 311822: 8, 311834: 7,
+    311836: 1, 311838: 7, 312333: 7, 312341: 8, 312348: 0, 312349: 8,
+    313355: 4, 313363: 8, 313370: 8, 313371: 8, 315411: 2, 315413: 1,
+    319499: 2, 319501: 1, 319502: 0, 327682: 0, 327683: 2, 327685: 1,
+    327692: 4, 327698: 0, 328204: 4, 328206: 8, 328210: 6, 328220: 1,
+    328234: 4, 328262: 4, 328290: 2, 328709: 4, 328716: 4, 328717: 4,
+    328725: 3, 328732: 0, 328744: 4, 328745: 4, 328801: 4, 329244: 5,
+    329324: 4, 329731: 6, 329747: 8, 329769: 1, 329825: 3, 330282: 4,
+    330338: 3, 330346: 4, 330354: 3, 330793: 4, 330849: 4, 330865: 3,
+    331779: 2, 331781: 1, 331794: 6, 331795: 2, 331797: 1, 331846: 0,
+    331874: 2, 332358: 4, 332386: 2, 332390: 4, 332402: 2, 332821: 5,
+    332897: 4, 332901: 4, 332913: 2, 333843: 8, 333921: 1, 333922: 0,
+    333923: 4, 333937: 8, 333938: 0, 334450: 8, 334961: 8, 335875: 2,
+    335877: 1, 335884: 1, 335885: 1, 335886: 0, 335913: 1, 335914: 6,
+    335942: 0, 336398: 8, 336426: 8, 336454: 8, 336482: 8, 336486: 8,
+    336490: 8, 336492: 1, 337961: 1, 337963: 6, 338017: 1, 338019: 3,
+    338026: 0, 338538: 8, 340038: 5, 340066: 0, 340067: 2, 340069: 1,
+    340070: 0, 340582: 8, 342115: 8, 344067: 2, 344074: 8, 344075: 2,
+    344076: 0, 344077: 1, 344078: 0, 344081: 8, 344083: 2, 344090: 8,
+    344092: 6, 344133: 1, 344134: 0, 344590: 8, 344602: 8, 344604: 6,
+    344606: 6, 344646: 4, 344654: 4, 345101: 4, 345116: 6, 345117: 6,
+    345157: 4, 346123: 8, 346131: 8, 346138: 8, 346139: 8, 348179: 2,
+    348181: 1, 348230: 4, 349509: 4, 352267: 2, 352269: 1, 352270: 0,
+    352325: 1, 352326: 3, 352334: 0, 352846: 8, 360451: 8, 360453: 8,
+    360460: 8, 360461: 8, 360462: 8, 360466: 8, 360467: 8, 360469: 8,
+    360476: 8, 360489: 8, 360490: 8, 360974: 8, 360988: 8, 360990: 8,
+    361002: 8, 361485: 4, 361493: 8, 361500: 8, 361501: 8, 361513: 4,
+    361517: 4, 362515: 8, 362537: 4, 362538: 4, 362539: 4, 364563: 8,
+    364565: 8, 368653: 1, 368654: 8, 368681: 1, 368682: 2, 368683: 2,
+    368685: 1, 376845: 8, 376846: 8, 376851: 8, 376853: 8, 376860: 8,
+    376861: 8, 376862: 8, 377374: 8, 377885: 8, 378907: 8, 393217: 2,
+    393219: 2, 393226: 2, 393228: 6, 393233: 2, 393738: 4, 393740: 4,
+    393742: 4, 393754: 2, 393756: 1, 393796: 4, 393798: 4, 393826: 4,
+    394252: 4, 394253: 6, 394257: 2, 394268: 0, 394281: 2, 394309: 3,
+    394780: 5, 394860: 4, 395267: 5, 395274: 5, 395275: 5, 395281: 5,
+    395283: 5, 395290: 5, 395305: 1, 395361: 3, 395802: 5, 395874: 4,
+    395882: 4, 395890: 3, 396329: 4, 396385: 3, 396401: 3, 397315: 2,
+    397331: 2, 397382: 0, 397894: 4, 397922: 4, 397926: 4, 397938: 2,
+    398405: 4, 398437: 4, 399379: 5, 399457: 1, 399459: 4, 399473: 1,
+    399986: 7, 400497: 7, 401411: 2, 401418: 0, 401419: 2, 401420: 0,
+    401421: 1, 401422: 0, 401449: 6, 401477: 1, 401478: 0, 402445: 7,
+    402473: 7, 402501: 7, 402533: 7, 403467: 5, 403497: 6, 403499: 6,
+    403553: 3, 403555: 3, 403562: 0, 405574: 0, 405603: 2, 405605: 1,
+    406629: 7, 407651: 7, 409603: 2, 409610: 2, 409611: 2, 409612: 0,
+    409613: 1, 409614: 0, 409617: 2, 409619: 2, 409626: 2, 409628: 6,
+    409669: 1, 409670: 0, 410126: 4, 410138: 2, 410140: 6, 410142: 6,
+    410182: 4, 410190: 4, 410637: 6, 410652: 6, 410653: 6, 410693: 3,
+    413715: 2, 413765: 4, 413766: 4, 417803: 2, 417805: 1, 417806: 0,
+    417861: 3, 417862: 0, 417870: 0, 425987: 7, 425989: 7, 425996: 7,
+    425997: 7, 425998: 7, 426002: 7, 426003: 7, 426005: 7, 426012: 7,
+    426025: 7, 426026: 7, 426510: 4, 426524: 7, 426526: 7, 426538: 4,
+    427021: 7, 427029: 7, 427036: 7, 427037: 7, 427049: 7, 427053: 7,
+    428043: 4, 428051: 5, 428058: 5, 428059: 5, 428073: 4, 428075: 4,
+    428714: 4, 430099: 7, 430101: 7, 434189: 7, 434190: 0, 434217: 2,
+    434218: 0, 434219: 2, 434221: 7, 435245: 7, 442379: 2, 442381: 7,
+    442382: 7, 442387: 2, 442394: 2, 442395: 2, 442396: 7, 442397: 7,
+    442398: 7, 442910: 7, 443421: 7, 458755: 6, 458764: 6, 458765: 6,
+    458766: 6, 458771: 6, 458780: 6, 458793: 6, 458822: 0, 459278: 4,
+    459292: 6, 459294: 6, 459334: 4, 459370: 4, 459789: 4, 459804: 6,
+    459805: 6, 459817: 4, 459877: 4, 460396: 4, 460819: 5, 460841: 6,
+    460843: 6, 460899: 3, 460906: 0, 461418: 4, 461937: 3, 462867: 6,
+    462918: 0, 462947: 2, 462949: 1, 463462: 4, 463474: 2, 463973: 4,
+    464995: 4, 466957: 1, 466958: 0, 466985: 1, 466987: 6, 467014: 0,
+    467043: 2, 467045: 1, 467050: 0, 469035: 6, 469091: 3, 469098: 0,
+    471139: 2, 471141: 1, 475147: 2, 475149: 6, 475150: 6, 475155: 2,
+    475162: 2, 475163: 2, 475164: 6, 475165: 6, 475166: 6, 475205: 1,
+    475206: 0, 475214: 0, 475678: 6, 475726: 4, 476189: 6, 483406: 0,
+}
@@ -0,0 +1,200 @@
+"""
+Builds `assets/brython/brython_modules.js`, the bundle of the Python standard library
+modules that the browser game imports, out of Brython's full standard library bundle
+`assets/brython/brython_stdlib.js`:
+
+    python3 build_modules.py
+
+The imports of the scripts loaded by `index.html` are followed through the game's own
+modules and the standard library, and only the standard library modules reached are
+bundled, so that the page downloads and parses a small fraction of the standard library.
+The game's own modules are not bundled: `index.html` adds this directory to Brython's
+import path, so the page always runs their current version. Rerun this script whenever
+a module starts importing another standard library module, then `build_service_worker.py`
+for the cache of the new bundle.
+
+Imports made under `if __name__ == '__main__':` only run from the command line, and
+those under `if TYPE_CHECKING:` only for type checkers (see `type_hints`), so both are
+left out.
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+import ast
+import json
+import os
+import time
+
+# the directory of the game's Python modules, and of the Brython distribution
+PYTHON_DIR = os.path.dirname(os.path.abspath(__file__))
+BRYTHON_DIR = os.path.join(PYTHON_DIR, os.pardir, "assets", "brython")
+
+# the Python scripts that `index.html` loads, as the page script and the Web Worker
+ENTRY_MODULES = ("interaction", "ai_worker")
+
+
+def read_vfs(path: str) -> dict:
+    """
+    return the modules of the Brython bundle at the given path, as a dictionary mapping
+    each module name to its entry: the file type, the source, and for Python modules,
+    the names it imports and whether it is a package
+    """
+    with open(path, encoding="utf-8") as vfs_file:
+        text = vfs_file.read()
+    start = text.index("var scripts = ") + len("var scripts = ")
+    end = text.index("\n", start)
+    scripts = json.loads(text[start:end].rstrip(";"))
+    return {name: entry for name, entry in scripts.items() if name != "$timestamp"}
+
+
+def find_imports(source: str) -> set[str]:
+    """
+    return the names of the modules imported by the given Python source, and of the
+    names imported from them, since those may be submodules; imports under
+    `if __name__ == '__main__':` and `if TYPE_CHECKING:` are left out
+
+    >>> sorted(find_imports("import a.b\\nfrom c import d\\nif __name__ == '__main__':\\n"
+    ...                     "    import e"))
+    ['a.b', 'c', 'c.d']
+    >>> sorted(find_imports("if TYPE_CHECKING:\\n    import f\\nelse:\\n    import g"))
+    ['g']
+    """
+    names = set()
+    nodes = list(ast.parse(source).body)
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, ast.If) and (_is_main_check(node.test)
+                                         or _is_type_checking(node.test)):
+            nodes.extend(node.orelse)
+            continue
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module)
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+        nodes.extend(ast.iter_child_nodes(node))
+    return names
+
+
+def _is_main_check(test: ast.expr) -> bool:
+    """
+    return whether the given condition is `__name__ == '__main__'`
+    """
+    return isinstance(test, ast.Compare) and isinstance(test.left, ast.Name) \
+        and test.left.id == "__name__" and len(test.comparators) == 1 \
+        and isinstance(test.comparators[0], ast.Constant) \
+        and test.comparators[0].value == "__main__"
+
+
+def _is_type_checking(test: ast.expr) -> bool:
+    """
+    return whether the given condition is `TYPE_CHECKING` or `typing.TYPE_CHECKING`
+    """
+    if isinstance(test, ast.Attribute):
+        return test.attr == "TYPE_CHECKING"
+    return isinstance(test, ast.Name) and test.id == "TYPE_CHECKING"
+
+
+def find_bundle_modules(stdlib: dict) -> list[str]:
+    """
+    return the sorted names of the modules of the standard library bundle `stdlib` (see
+    `read_vfs`) that the scripts of `ENTRY_MODULES` import, directly or through other
+    modules; names that are neither one of the game's modules nor in `stdlib` are built
+    into `brython.js`, or never imported in the browser
+    """
+    found = set()
+    visited = set()
+    pending = list(ENTRY_MODULES)
+    while pending:
+        name = pending.pop()
+        if name in visited:
+            continue
+        visited.add(name)
+
+        # a submodule needs its parent packages too
+        parts = name.split(".")
+        pending.extend(".".join(parts[:i]) for i in range(1, len(parts)))
+
+        own_path = os.path.join(PYTHON_DIR, name + ".py")
+        if "." not in name and os.path.isfile(own_path):
+            with open(own_path, encoding="utf-8") as module_file:
+                pending.extend(find_imports(module_file.read()))
+        elif name in stdlib:
+            found.add(name)
+            entry = stdlib[name]
+            if entry[0] == ".py":
+                # the imports listed by the bundle include those of the `__main__` blocks
+                pending.extend(_find_stdlib_imports(name, entry))
+    return sorted(found)
+
+
+def _find_stdlib_imports(name: str, entry: list) -> set[str]:
+    """
+    return the names imported by the standard library module `name` with the given
+    bundle entry, relative imports included; all the names the bundle lists for it if
+    its source cannot be parsed
+    """
+    try:
+        tree = ast.parse(entry[1])
+    except SyntaxError:
+        return set(entry[2])
+
+    # relative imports start from the module's package, or from itself if it is one
+    is_package = len(entry) == 4
+    package = name if is_package else name.rpartition(".")[0]
+    names = find_imports(entry[1])
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.level > 0:
+            base = package.split(".")[:len(package.split(".")) - node.level + 1]
+            module = ".".join(base + ([node.module] if node.module else []))
+            names.add(module)
+            names.update(f"{module}.{alias.name}" for alias in node.names)
+    return names
+
+
+def write_bundle(path: str, stdlib: dict, names: list[str]) -> None:
+    """
+    write the modules of `stdlib` with the given names as a Brython bundle to `path`
+    """
+    timestamp = int(time.time() * 1000)
+    scripts = {"$timestamp": timestamp}
+    scripts.update((name, stdlib[name]) for name in names)
+    with open(path, "w", encoding="utf-8") as bundle_file:
+        bundle_file.write(f"__BRYTHON__.VFS_timestamp = {timestamp}\n")
+        bundle_file.write("__BRYTHON__.use_VFS = true\n")
+        bundle_file.write(f"var scripts = {json.dumps(scripts)}\n")
+        bundle_file.write("__BRYTHON__.update_VFS(scripts)\n")
+
+
+if __name__ == '__main__':
+    stdlib_path = os.path.join(BRYTHON_DIR, "brython_stdlib.js")
+    bundle_path = os.path.join(BRYTHON_DIR, "brython_modules.js")
+    stdlib_modules = read_vfs(stdlib_path)
+    old_size = os.path.getsize(bundle_path) if os.path.isfile(bundle_path) else 0
+
+    bundle_names = find_bundle_modules(stdlib_modules)
+    write_bundle(bundle_path, stdlib_modules, bundle_names)
+    print(f"Wrote {len(bundle_names)} modules to {bundle_path}: "
+          f"{old_size / 1024:.0f} KiB -> {os.path.getsize(bundle_path) / 1024:.0f} KiB")
+    print(", ".join(bundle_names))
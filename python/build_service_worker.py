@@ -0,0 +1,133 @@
+"""
+Writes the list of engine files and the cache name into `service_worker.js`:
+
+    python3 build_service_worker.py
+
+The engine files are the game's Python modules that the scripts loaded by `index.html`
+import, its precomputed tables (such as `book_3x3`) included, and the Brython scripts
+that run them. The cache name holds a hash of the contents of every file the service
+worker caches, so a new version of any file installs a fresh cache and deletes the old
+one. Rerun this script after `build_modules.py`, and after changing any cached file.
+
+If the script is not rerun, the service worker still refreshes the engine files in the
+background (stale-while-revalidate), so the change reaches the game one load later.
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+import hashlib
+import os
+import re
+import build_modules as bm
+
+# the root of the site, which is served under `SITE_PREFIX`
+SITE_DIR = os.path.join(bm.PYTHON_DIR, os.pardir)
+SITE_PREFIX = "/bot-tac-toe/"
+SERVICE_WORKER_PATH = os.path.join(SITE_DIR, "service_worker.js")
+
+# the Brython scripts of the page and of the AI player's Web Worker
+BRYTHON_SCRIPTS = ("brython.js", "brython_modules.js", "brython_stdlib.js")
+
+
+def find_game_modules() -> list[str]:
+    """
+    return the sorted names of the game's own modules that the scripts of
+    `build_modules.ENTRY_MODULES` import, directly or through other modules, those
+    scripts included
+    """
+    found = set()
+    pending = list(bm.ENTRY_MODULES)
+    while pending:
+        name = pending.pop()
+        path = os.path.join(bm.PYTHON_DIR, name + ".py")
+        if name in found or not os.path.isfile(path):
+            continue
+        found.add(name)
+        with open(path, encoding="utf-8") as module_file:
+            pending.extend(bm.find_imports(module_file.read()))
+    return sorted(found)
+
+
+def get_engine_urls() -> list[str]:
+    """
+    return the URLs of the Brython scripts and of the game's Python modules
+    """
+    urls = [f"{SITE_PREFIX}assets/brython/{script}" for script in BRYTHON_SCRIPTS]
+    urls.extend(f"{SITE_PREFIX}python/{name}.py" for name in find_game_modules())
+    return urls
+
+
+def url_to_path(url: str) -> str:
+    """
+    return the path of the file served at the given URL of the site
+
+    >>> os.path.relpath(url_to_path("/bot-tac-toe/assets/x.ttf?v1"), SITE_DIR)
+    'assets/x.ttf'
+    >>> os.path.relpath(url_to_path("/bot-tac-toe/"), SITE_DIR)
+    'index.html'
+    """
+    relative = url[len(SITE_PREFIX):].split("?")[0] or "index.html"
+    return os.path.join(SITE_DIR, *relative.split("/"))
+
+
+def hash_files(urls: list[str]) -> str:
+    """
+    return a short hexadecimal hash of the URLs and the contents of the files served
+    at them
+    """
+    digest = hashlib.sha256()
+    for url in sorted(urls):
+        digest.update(url.encode("utf-8") + b"\0")
+        with open(url_to_path(url), "rb") as cached_file:
+            digest.update(cached_file.read())
+    return digest.hexdigest()[:16]
+
+
+def update_service_worker(source: str) -> str:
+    """
+    return the given source of `service_worker.js` with its engine URLs and its cache
+    name written for the current files
+    """
+    engine_urls = get_engine_urls()
+    url_list = "".join(f"\n    '{url}'," for url in engine_urls).rstrip(",")
+    source = re.sub(r"var engine_urls = \[.*?\n\];",
+                    f"var engine_urls = [{url_list}\n];", source, flags=re.DOTALL)
+
+    # the other cached files are listed by hand in `urls_to_cache`
+    match = re.search(r"var urls_to_cache = \[(.*?)\]", source, flags=re.DOTALL)
+    static_urls = re.findall(r"'([^']*)'", match.group(1))
+    cache_name = "pwa_cache_" + hash_files(static_urls + engine_urls)
+    return re.sub(r"var PWA_CACHE = '[^']*';", f"var PWA_CACHE = '{cache_name}';",
+                  source)
+
+
+if __name__ == '__main__':
+    with open(SERVICE_WORKER_PATH, encoding="utf-8") as worker_file:
+        old_source = worker_file.read()
+    new_source = update_service_worker(old_source)
+    with open(SERVICE_WORKER_PATH, "w", encoding="utf-8") as worker_file:
+        worker_file.write(new_source)
+    print(re.search(r"var PWA_CACHE = '[^']*';", new_source).group(0))
+    print(f"{len(get_engine_urls())} engine files",
+          "(unchanged)" if new_source == old_source else "(updated)")
@@ -25,7 +25,9 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 from __future__ import annotations
-from typing import Optional, Any
+from type_hints import Optional, Any
+from array import array
+import sys
 
 
 class GameTree:
@@ -39,12 +41,13 @@ class GameTree:
     piece (`is_x_move`), and the score that is maximized when 'x' is likely to win
 
     Instance Attributes:
-        - placement: the placement spot of the piece represented by this tree node
+        - placement: the index (`row * side + col`) of the placement spot of the piece
+          represented by this tree node
         - is_x_move: True if this node's plecement is done by 'x', False otherwise
         - x_win_score: the Minimax utility score that is large if 'x' is likely to win and
           small if 'o' is likely to win
     """
-    placement: Optional[str]
+    placement: Optional[int]
     is_x_move: bool
     x_win_score: int
 
@@ -56,7 +59,7 @@ class GameTree:
 
     def __init__(
             self,
-            placement: Optional[str] = None,
+            placement: Optional[int] = None,
             is_x_move: bool = True,
             x_win_score: int = 0
     ) -> None:
@@ -82,7 +85,7 @@ class GameTree:
         """
         return self._subtrees
 
-    def find_subtree_by_spot(self, spot: str) -> Any:
+    def find_subtree_by_spot(self, spot: int) -> Any:
         """
         find a particular subtree whose node contains the given spot
 
@@ -100,6 +103,14 @@ class GameTree:
         """
         self._subtrees.append(subtree)
 
+    def remove_subtrees(self) -> list:
+        """
+        detach all subtrees from the current game tree, and return them
+        """
+        subtrees = self._subtrees
+        self._subtrees = []
+        return subtrees
+
     def __str__(self, depth: int = 0) -> str:
         """
         return a string representation of the current game tree
@@ -116,6 +127,338 @@ class GameTree:
             return string
 
 
+class CompactGameTree:
+    """
+    A game tree node like `GameTree` that takes a fraction of its memory, for trees
+    with a great number of nodes.
+
+    The node has fixed `__slots__` instead of an attribute dictionary, and its
+    subtrees are kept in a list indexed by their placements, so `find_subtree_by_spot`
+    is a constant time lookup instead of a scan; `get_subtrees` lists them in the
+    order of their spots.
+
+    >>> tree = CompactGameTree()
+    >>> tree.add_subtree(CompactGameTree(4, False, 1))
+    >>> tree.add_subtree(CompactGameTree(0, False, -1))
+    >>> [subtree.placement for subtree in tree.get_subtrees()]
+    [0, 4]
+    >>> tree.find_subtree_by_spot(4).x_win_score
+    1
+    >>> tree.find_subtree_by_spot(8) is None
+    True
+
+    Instance Attributes:
+        - placement: the index of the placement spot of this node's piece, or `None`
+        - is_x_move: True if this node's placement is done by 'x', False otherwise
+        - x_win_score: the Minimax utility score that is large if 'x' is likely to win and
+          small if 'o' is likely to win
+    """
+    __slots__ = ('placement', 'is_x_move', 'x_win_score', '_children')
+    placement: Optional[int]
+    is_x_move: bool
+    x_win_score: int
+
+    # Private Instance Attributes:
+    #  - _children: a list indexed by spot index, of the subtree placed on each spot or
+    #    `None`; only as long as the largest placement needs, and `None` for a leaf
+    _children: Optional[list]
+
+    def __init__(
+            self,
+            placement: Optional[int] = None,
+            is_x_move: bool = True,
+            x_win_score: int = 0
+    ) -> None:
+        self.placement = placement
+        self.is_x_move = is_x_move
+        self.x_win_score = x_win_score
+        self._children = None
+
+    def get_subtrees(self) -> list:
+        """
+        return all subtrees under the current game tree, in the order of their spots
+        """
+        if self._children is None:
+            return []
+        return [subtree for subtree in self._children if subtree is not None]
+
+    def find_subtree_by_spot(self, spot: int) -> Any:
+        """
+        return the subtree placed on the given spot index, or `None`
+        """
+        children = self._children
+        if children is None or spot >= len(children):
+            return None
+        return children[spot]
+
+    def add_subtree(self, subtree: Any) -> None:
+        """
+        add the given subtree to the current game tree, replacing any subtree on the
+        same spot
+        """
+        spot = subtree.placement
+        if self._children is None:
+            self._children = [None] * (spot + 1)
+        elif spot >= len(self._children):
+            self._children.extend([None] * (spot + 1 - len(self._children)))
+        self._children[spot] = subtree
+
+    def remove_subtrees(self) -> list:
+        """
+        detach all subtrees from the current game tree, and return them
+        """
+        subtrees = self.get_subtrees()
+        self._children = None
+        return subtrees
+
+
+class ArrayGameTree:
+    """
+    A whole game tree stored as a structure of arrays, for trees that are generated in
+    bulk and only read afterwards, like the full tree of the 3x3 board.
+
+    Every node is an integer index into the arrays below, the root being node 0. All
+    the subtrees of a node are added at once by `add_subtrees`, so they have
+    consecutive indices and a node only records its first subtree and their number;
+    a node costs a few bytes in each array instead of a Python object.
+
+    >>> tree = ArrayGameTree(is_x_move=False)
+    >>> tree.add_subtrees(0, [0, 4, 8])
+    1
+    >>> list(tree.get_subtrees(0))
+    [1, 2, 3]
+    >>> tree.placements[2], tree.is_x_moves[2]
+    (4, 1)
+    >>> tree.find_subtree_by_spot(0, 8)
+    3
+    >>> len(tree)
+    4
+
+    Instance Attributes:
+        - placements: the spot index of each node's placement, -1 for the root
+        - is_x_moves: 1 if each node's placement is done by 'x', 0 otherwise
+        - x_win_scores: the Minimax utility score of each node
+        - first_subtrees: the index of each node's first subtree, or 0 for a leaf
+        - num_subtrees: the number of subtrees of each node
+    """
+    placements: array
+    is_x_moves: array
+    x_win_scores: array
+    first_subtrees: array
+    num_subtrees: array
+
+    def __init__(self, is_x_move: bool = True) -> None:
+        self.placements = array('h', [-1])
+        self.is_x_moves = array('b', [is_x_move])
+        self.x_win_scores = array('d', [0])
+        self.first_subtrees = array('l', [0])
+        self.num_subtrees = array('h', [0])
+
+    def __len__(self) -> int:
+        return len(self.placements)
+
+    def add_subtrees(self, node: int, spots: list[int]) -> int:
+        """
+        add a subtree placed by the other piece on each of the given spot indices to the
+        given leaf node, and return the index of the first one
+        """
+        assert self.num_subtrees[node] == 0
+        first = len(self.placements)
+        is_x_move = not self.is_x_moves[node]
+        for spot in spots:
+            self.placements.append(spot)
+            self.is_x_moves.append(is_x_move)
+            self.x_win_scores.append(0)
+            self.first_subtrees.append(0)
+            self.num_subtrees.append(0)
+        self.first_subtrees[node] = first
+        self.num_subtrees[node] = len(spots)
+        return first
+
+    def get_subtrees(self, node: int) -> range:
+        """
+        return the indices of the subtrees of the given node
+        """
+        first = self.first_subtrees[node]
+        return range(first, first + self.num_subtrees[node])
+
+    def find_subtree_by_spot(self, node: int, spot: int) -> Optional[int]:
+        """
+        return the index of the subtree of the given node placed on the given spot
+        index, or `None`
+        """
+        for subtree in self.get_subtrees(node):
+            if self.placements[subtree] == spot:
+                return subtree
+        return None
+
+
+class NodeStore:
+    """
+    A size-capped allocator of the game tree nodes kept by an AI player across moves.
+
+    Advancing the tree to the subtree of a played move discards the old root and the
+    subtrees of every move that was not played, since those positions can no longer
+    be reached. Discarded nodes are recycled by `new_node` instead of being left to the
+    garbage collector, and once the tree kept between moves grows past `max_nodes`,
+    its subtrees are discarded so the next search regenerates them.
+
+    A single search may still generate more than `max_nodes` nodes; the cap applies to
+    the tree that is kept once the search is over.
+
+    Discarding a large tree takes a while, so `advance` can leave it to a later call of
+    `collect`, e.g. once the move has been played:
+
+    >>> store = NodeStore()
+    >>> root = store.new_node(None, True, 0)
+    >>> for spot in [0, 1, 4]:
+    ...     root.add_subtree(store.new_node(spot, False, 0))
+    >>> root = store.advance(root, 4, defer=True)
+    >>> store.get_node_count()  # the deferred nodes are still counted
+    4
+    >>> store.collect(root)
+    >>> store.get_node_count()
+    1
+
+    >>> store = NodeStore(max_nodes=3)
+    >>> root = store.new_node(None, True, 0)
+    >>> for spot in [0, 1, 4]:
+    ...     root.add_subtree(store.new_node(spot, False, 0))
+    >>> store.get_node_count()
+    4
+    >>> root = store.advance(root, 4)
+    >>> root.placement, store.get_node_count()
+    (4, 1)
+    >>> store.new_node(8, True, 0) is not None  # reuses a discarded node
+    True
+    >>> store.get_byte_footprint() > 0
+    True
+
+    Instance Attributes:
+        - max_nodes: the maximum number of live and recycled nodes kept between moves
+        - node_class: the class of the nodes, `CompactGameTree` or `GameTree`
+    """
+    max_nodes: int
+    node_class: type
+
+    # Private Instance Attributes:
+    #   - _num_nodes: the number of nodes handed out by `new_node` and not yet discarded
+    #   - _free: discarded nodes, ready to be handed out again
+    #   - _node_bytes: the estimated size in bytes of one node, measured once
+    #   - _deferred: the trees left by `advance` for `collect` to discard
+    _num_nodes: int
+    _free: list
+    _node_bytes: Optional[int]
+    _deferred: list
+
+    def __init__(self, max_nodes: int = 200000, node_class: type = CompactGameTree) -> None:
+        assert max_nodes > 0
+        self.max_nodes = max_nodes
+        self.node_class = node_class
+        self._num_nodes = 0
+        self._free = []
+        self._node_bytes = None
+        self._deferred = []
+
+    def get_node_count(self) -> int:
+        """
+        return the number of nodes in use
+        """
+        return self._num_nodes
+
+    def get_byte_footprint(self) -> int:
+        """
+        return an estimate of the memory in bytes held by the nodes in use and the
+        recycled nodes, from the size of an empty node with its attributes, an empty
+        list of subtrees, and the reference to it in its parent's list of subtrees
+        """
+        if self._node_bytes is None:
+            node = self.node_class()
+            # plus a 64-bit reference from the parent's list of subtrees
+            self._node_bytes = sys.getsizeof(node) + sys.getsizeof([]) + 8
+            if hasattr(node, '__dict__'):
+                self._node_bytes += sys.getsizeof(node.__dict__)
+        return (self._num_nodes + len(self._free)) * self._node_bytes
+
+    def new_node(
+            self,
+            placement: Optional[int] = None,
+            is_x_move: bool = True,
+            x_win_score: int = 0
+    ) -> Any:
+        """
+        return a game tree node without subtrees, reusing a discarded node if possible
+        """
+        self._num_nodes += 1
+        if not self._free:
+            return self.node_class(placement, is_x_move, x_win_score)
+        node = self._free.pop()
+        node.placement = placement
+        node.is_x_move = is_x_move
+        node.x_win_score = x_win_score
+        return node
+
+    def discard(self, tree: Any) -> None:
+        """
+        discard the given node of this store and all of its subtrees; the nodes must
+        not be used afterwards
+        """
+        free = self._free
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.remove_subtrees())
+            self._num_nodes -= 1
+            if self._num_nodes + len(free) < self.max_nodes:
+                free.append(node)
+
+    def discard_subtrees(self, tree: Any) -> None:
+        """
+        discard every subtree of the given node, keeping the node itself
+        """
+        for subtree in tree.remove_subtrees():
+            self.discard(subtree)
+
+    def advance(self, tree: Any, spot: int, defer: bool = False) -> Any:
+        """
+        return the subtree of the given node whose placement is the given spot, and
+        discard the given node with all of its other subtrees; return `None` if there
+        is no such subtree, with the whole tree discarded
+
+        if the kept subtree holds more than `max_nodes` nodes, its own subtrees are
+        discarded too; if `defer` is set, the nodes are only discarded by the next call
+        of `collect`, which applies the cap instead
+        """
+        chosen = None
+        for subtree in tree.remove_subtrees():
+            if chosen is None and subtree.placement == spot:
+                chosen = subtree
+            elif defer:
+                self._deferred.append(subtree)
+            else:
+                self.discard(subtree)
+        if defer:
+            self._deferred.append(tree)
+            return chosen
+        self.discard(tree)
+
+        if chosen is not None and self._num_nodes > self.max_nodes:
+            self.discard_subtrees(chosen)
+        return chosen
+
+    def collect(self, tree: Any) -> None:
+        """
+        discard the nodes that `advance` has left to be discarded later, and then the
+        subtrees of the given tree that is kept, if it holds more than `max_nodes` nodes
+        """
+        if not self._deferred:
+            return
+        while self._deferred:
+            self.discard(self._deferred.pop())
+        if self._num_nodes > self.max_nodes:
+            self.discard_subtrees(tree)
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod()
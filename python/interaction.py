@@ -33,7 +33,8 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 from browser import document as dom
-from browser import html, DOMEvent, window, timer
+from browser import html, DOMEvent, window, timer, worker, bind
+from javascript import JSON
 import tictactoe as ttt
 
 
@@ -53,13 +54,13 @@ class ThemeColor:
 # GLOBAL VARIABLES
 class Config:
     """
-    global configurations (a total of 8) to keep track of
+    global configurations (a total of 13) to keep track of
 
     Class Attributes:
         - BOARD_SIDE_LENGTH: the side length of the game board
         - WINNING_STEP_LEN: the number of adjacent pieces that will result in a win;
-          currently unused due to implementation complexity and timme constraint, will be
-          used in the future
+          passed on to the game engine, but the UI buttons to change it are currently
+          disabled, so it always follows the board side length
         - PLAYER_1_PIECE: the game piece used by player 1, either 'x' or 'o'
         - START_FIRST: which player starts first, either 'p1' or 'p2'
         - PLAYER_2_ROLE: whether player 2 is another human or some kind of AI player
@@ -68,9 +69,22 @@ class Config:
           is human, is Theme green if player 2 is an AI
         - GAME_OBJS: a dictionary containing the game object as well as the two player
           objects; can be obtained by any function that needs it
+        - AI_TIME_BUDGET_MS: the longest time in milliseconds that the "hard" AI may
+          search for each move, so that it never freezes the page for long
+        - AI_IN_WORKER: True to run the AI players' searches in the `ai_worker` Web
+          Worker, so that the page stays responsive while they search; False to run
+          them on the main thread
+        - AI_PONDER: True to let the AI player in the worker search the human player's
+          likely replies while the human is thinking, so that it can answer them right
+          away; the AI never ponders on the main thread
+        - AI_WORKER: the running `ai_worker` Web Worker, or `None`
+        - AI_MOVE_ID: the id of the latest move requested from the worker; a reply with
+          any other id belongs to a cancelled search, and is ignored
+        - AI_MOVE_PENDING: True while the worker has not replied to the latest move
+          requested from it
     """
     BOARD_SIDE_LENGTH: int = 3
-    WINNING_STEP_LEN: int = 3  # currently unused but can be used when extended
+    WINNING_STEP_LEN: int = 3  # always the side length until the UI buttons are enabled
     PLAYER_1_PIECE: str = 'x'
     START_FIRST: str = "p1"  # p1 -> player 1; p2 -> player 2; nd -> not determined
     PLAYER_2_ROLE: str = "ai_easy"
@@ -78,17 +92,24 @@ class Config:
     PLAYER_2_COLOR: str = ThemeColor.green
     GAME_OBJS: dict = {}
     WIN_STATUS: bool = False
+    AI_TIME_BUDGET_MS: int = 1500
+    AI_IN_WORKER: bool = True
+    AI_PONDER: bool = True
+    AI_WORKER: object = None
+    AI_MOVE_ID: int = 0
+    AI_MOVE_PENDING: bool = False
 
 
 def draw_board(table: html.TABLE, side: int) -> None:
     """
-    draw the game board of a given side-length onto te given `html.TABLE`
+    draw the game board of a given side-length onto te given `html.TABLE`; each cell is
+    named by the game engine's index of its spot
     """
     table.text = ""
     for i in range(side):
         tr = html.TR()
         for j in range(side):
-            td = html.TD(html.SPAN(Class="cell", name=f"{i}{j}"))
+            td = html.TD(html.SPAN(Class="cell", name=str(ttt.spot_index(i, j, side))))
             tr.append(td)
         table.attach(tr)
 
@@ -236,7 +257,7 @@ def ev_who_starts_first(event: DOMEvent) -> None:
 def ev_player_2_role(event: DOMEvent) -> None:
     """
     change the role of player 2, between `another_human`, `ai_random`, `ai_easy`,
-    and `ai_hard`
+    `ai_hard`, and `ai_mcts`
     write the result into the configuration variable `Config.PLAYER_2_ROLE`
     also adjust `Config.PLAYER_2_COLOR` to be green if player 2 is an AI, or orange if
     player 2 is a human
@@ -296,10 +317,14 @@ def cell_click(event: DOMEvent) -> None:
     event functions on this cell, and trigger a game round
     """
     target = event.target
+
+    # ignore the clicks made while an AI player searches for its move in the worker
+    which_player = Config.GAME_OBJS["game"].next_player
+    if Config.GAME_OBJS[which_player] != "human":
+        return
     print(f"Clicked {target.attrs['name']}")
 
     # determine the player that clicked this cell, and its game piece
-    which_player = Config.GAME_OBJS["game"].next_player
     piece = Config.PLAYER_1_PIECE if which_player == "p1" else ttt.piece_not(Config.PLAYER_1_PIECE)
 
     # place game piece and unbind event functions
@@ -318,12 +343,12 @@ def cell_click(event: DOMEvent) -> None:
     timer.set_timeout(ev_game_round, 0, event)
 
 
-def draw_piece(piece: str, spot: str):
+def draw_piece(piece: str, spot: int):
     """
     helper function to draw a given game piece at the given spot on the game board UI
     """
     for c in dom.select('.cell'):
-        if c.attrs["name"] == spot:
+        if c.attrs["name"] == str(spot):
             c.text = piece
 
             # unbind event functions once the piece has been drawn
@@ -348,8 +373,11 @@ def check_winner(game: ttt.GameState):
     # check for winners
     if winning_piece := game.get_winning_piece():
 
-        # find out whether player 1 or 2 won the game
-        if winning_piece not in {'x', 'o'}:
+        # find out whether player 1 or 2 won the game; a tie can be called before the
+        # board is full, once every line is blocked by both pieces
+        if winning_piece not in {'x', 'o'} and game.empty_spots:
+            announce_txt = "It's a tie! No one can complete a line."
+        elif winning_piece not in {'x', 'o'}:
             announce_txt = "It's a tie!"
         else:
             winner_num = 1 if winning_piece == Config.PLAYER_1_PIECE else 2
@@ -384,16 +412,114 @@ def check_winner(game: ttt.GameState):
         """
 
 
-def ai_make_move(player: ttt.Player, game: ttt.GameState, prev_move: str) -> None:
+def ai_make_move(player: ttt.Player, game: ttt.GameState, prev_move: int) -> None:
     """
     helper function to obtain the player's move, place the game piece, and draw it on the
-    UI
+    UI; `prev_move` is the spot of the opponent's most recent move, or `None`
+
+    if the AI runs in the worker, the move is only requested here, and made by
+    `ev_ai_worker_move` once the worker replies
     """
+    if Config.AI_WORKER is not None:
+        Config.AI_MOVE_ID += 1
+        Config.AI_MOVE_PENDING = True
+        Config.AI_WORKER.send(JSON.stringify({
+            "type": "move", "id": Config.AI_MOVE_ID, "moves": game.move_history
+        }))
+        return
+
     piece, spot = player.return_move(game, prev_move)
     game.place_piece(piece, spot)
     draw_piece(piece, spot)
 
 
+def ev_ai_worker_move(event: DOMEvent) -> None:
+    """
+    event function that responds to a move chosen by the AI worker; place the game
+    piece, draw it on the UI, and check for winners
+    """
+    reply = JSON.parse(event.data)
+    if "error" in reply:
+        fall_back_to_main_thread(reply["error"])
+        return
+    if reply["id"] != Config.AI_MOVE_ID or Config.WIN_STATUS:
+        return
+    Config.AI_MOVE_PENDING = False
+
+    game = Config.GAME_OBJS["game"]
+    game.place_piece(reply["piece"], reply["spot"])
+    draw_piece(reply["piece"], reply["spot"])
+    check_winner(game)
+
+
+def ev_ai_worker_error(event: DOMEvent) -> None:
+    """
+    event function that responds to an error the AI worker could not report in a reply,
+    such as its script failing to load
+    """
+    fall_back_to_main_thread(getattr(event, "message", "unknown error"))
+
+
+def fall_back_to_main_thread(error: str) -> None:
+    """
+    stop the failed AI worker, so that the AI players search on the main thread from now
+    on, and make the move that the worker has not replied to, if any
+    """
+    # a worker that has already been stopped may still have sent more errors
+    if Config.AI_WORKER is None:
+        return
+    print(f"[!] The AI worker failed, searching on the main thread: {error}")
+    is_move_pending = Config.AI_MOVE_PENDING
+    stop_ai_worker()
+
+    # the players of `Config.GAME_OBJS` were created with the game, and can take over
+    game = Config.GAME_OBJS["game"]
+    if is_move_pending and not Config.WIN_STATUS:
+        prev_move = game.move_history[-1] if game.move_history else None
+        timer.set_timeout(ai_make_move, 0, Config.GAME_OBJS[game.next_player], game,
+                          prev_move)
+        timer.set_timeout(check_winner, 0, game)
+
+
+def start_ai_worker(game: ttt.GameState) -> None:
+    """
+    start the AI worker for the given new game, unless the AI players search on the main
+    thread or no player is an AI; fall back to the main thread if the worker cannot start
+    """
+    if not Config.AI_IN_WORKER or Config.PLAYER_2_ROLE[:2] != "ai":
+        return
+    try:
+        Config.AI_WORKER = worker.Worker("ai_worker")
+    except Exception as error:
+        print(f"[!] The AI worker could not start, searching on the main thread: {error}")
+        return
+    bind(Config.AI_WORKER, "message")(ev_ai_worker_move)
+    bind(Config.AI_WORKER, "error")(ev_ai_worker_error)
+
+    Config.AI_WORKER.send(JSON.stringify({
+        "type": "init",
+        "side": Config.BOARD_SIDE_LENGTH,
+        "win_len": Config.WINNING_STEP_LEN,
+        "p1_piece": Config.PLAYER_1_PIECE,
+        "start_first": game.next_player,
+        "p1_role": "human",
+        "p2_role": Config.PLAYER_2_ROLE,
+        "time_budget_ms": Config.AI_TIME_BUDGET_MS,
+        "ponder": Config.AI_PONDER
+    }))
+
+
+def stop_ai_worker() -> None:
+    """
+    stop the AI worker, cancelling the search it may be running
+    """
+    if Config.AI_WORKER is not None:
+        Config.AI_WORKER.terminate()
+        Config.AI_WORKER = None
+        Config.AI_MOVE_ID += 1
+        Config.AI_MOVE_PENDING = False
+
+
 def ai_move_if_not_won(game: ttt.GameState) -> None:
     """
     schedule the next AI move if the game is not won and the next player is not human
@@ -431,7 +557,7 @@ def ev_game_round(event: DOMEvent) -> None:
 
     # when getting called by a human player, place the piece for the human
     elif "cell" in target.classList:
-        spot = target.attrs['name']
+        spot = int(target.attrs['name'])
         if game.next_player == "p1":
             piece = Config.PLAYER_1_PIECE
         else:
@@ -458,7 +584,9 @@ def ev_start_game(event: DOMEvent) -> None:
         Config.PLAYER_1_PIECE,
         Config.START_FIRST,
         Config.PLAYER_2_ROLE,
-        p1_role="human"
+        p1_role="human",
+        win_len=Config.WINNING_STEP_LEN,
+        time_budget_ms=Config.AI_TIME_BUDGET_MS
     )
 
     # update the game objects store according to the newly initialized game
@@ -466,6 +594,9 @@ def ev_start_game(event: DOMEvent) -> None:
     Config.GAME_OBJS["p1"] = p1
     Config.GAME_OBJS["p2"] = p2
 
+    # move the AI players' searches off the main thread
+    start_ai_worker(game)
+
     # bind trigger functions for each cell of the game board UI
     bind_cells()
 
@@ -481,7 +612,9 @@ def ev_start_game(event: DOMEvent) -> None:
 def ev_reset_game(event) -> None:
     """
     this function gets triggered by the reset button, and it refershes the browser page
+    after cancelling the AI player's search
     """
+    stop_ai_worker()
     window.location.reload()
 
 
@@ -498,6 +631,9 @@ if __name__ == '__main__':
     <span style="display: inline-block;">and click "Start" to begin!</span>
     """
 
+    # log the startup time, from the start of the page load until the game is ready
+    print(f"Game ready in {window.performance.now():.0f} ms.")
+
     # show the start button once game has loaded
     dom["btn_start"].attrs["style"] = ""
 
@@ -0,0 +1,329 @@
+"""
+The game tree and the playouts of the Monte Carlo Tree Search player
+`tictactoe.AIMCTSPlayer`.
+
+Instead of scoring every position to a fixed depth like Minimax, every iteration of the
+search walks down the tree by the UCT rule, adds one new node, and scores it by finishing
+the game with random moves (a "playout"). Each iteration costs about the same on any
+board, so the strength of the player grows with the number of playouts it is given,
+instead of the cost of a search growing exponentially with its depth.
+
+[c] The search follows the UCT algorithm of "Bandit based Monte-Carlo Planning", by
+    Levente Kocsis and Csaba Szepesvari (2006); see also
+    https://www.chessprogramming.org/UCT
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+from type_hints import Optional, Any
+import math
+import random
+import sys
+import bitboard as bb
+
+# the weight of the exploration term of the UCT rule; the square root of 2 suits results
+# between 0 and 1
+EXPLORATION = 1.4
+
+# the result of a game for 'x', which every node sums up over its playouts
+X_WIN, TIE, O_WIN = 1.0, 0.5, 0.0
+
+
+class MCTSNode:
+    """
+    A node of the game tree of the Monte Carlo Tree Search, for the position after the
+    piece placement `placement`.
+
+    >>> board = PlayoutBoard(bb.BitboardState(3))
+    >>> root = MCTSNode(None, False)
+    >>> for _ in range(200):
+    ...     run_iteration(root, board)
+    >>> root.visits, sum(child.visits for child in root.get_children())
+    (200, 200)
+
+    Instance Attributes:
+        - placement: the index of the placement spot of this node's piece, or `None` for
+          the root of a new search
+        - is_x_move: True if this node's placement is done by 'x', False otherwise
+        - visits: the number of playouts that passed through this node
+        - x_score: the sum of the results of those playouts for 'x': `X_WIN`, `TIE` or
+          `O_WIN` each
+    """
+    __slots__ = ('placement', 'is_x_move', 'visits', 'x_score', '_children', '_untried',
+                 '_mean', '_explore')
+    placement: Optional[int]
+    is_x_move: bool
+    visits: int
+    x_score: float
+
+    # Private Instance Attributes:
+    #  - _children: the nodes of the moves that have been tried from this position
+    #  - _untried: the spots of the moves not tried yet, in random order; `None` until the
+    #    first iteration that reaches this node
+    #  - _mean: the mean result of the playouts for the player who made this node's move
+    #  - _explore: `EXPLORATION` divided by the square root of `visits`
+    #
+    # `_mean` and `_explore` are only updated by `add_result`, so that `select_child`
+    # does not compute them again for every child, since arithmetic on floats is slow
+    # in Brython
+    _children: list
+    _untried: Optional[list[int]]
+    _mean: float
+    _explore: float
+
+    def __init__(self, placement: Optional[int], is_x_move: bool) -> None:
+        self.placement = placement
+        self.is_x_move = is_x_move
+        self.visits = 0
+        self.x_score = 0.0
+        self._children = []
+        self._untried = None
+        self._mean = 0.0
+        self._explore = 0.0
+
+    def get_children(self) -> list:
+        """
+        return the nodes of the moves tried from this position
+        """
+        return self._children
+
+    def find_child(self, spot: int) -> Any:
+        """
+        return the node of the move to the given spot, or `None` if it was not tried
+        """
+        for child in self._children:
+            if child.placement == spot:
+                return child
+        return None
+
+    def add_result(self, result: float) -> None:
+        """
+        count a playout through this node, with the given result for 'x'
+        """
+        self.visits += 1
+        self.x_score += result
+        mean = self.x_score / self.visits
+        self._mean = mean if self.is_x_move else 1.0 - mean
+        self._explore = EXPLORATION / math.sqrt(self.visits)
+
+    def select_child(self) -> Any:
+        """
+        return the child with the best UCT value for the player who moves next: its mean
+        result for that player, plus an exploration bonus that is larger the less often
+        the child was visited
+        """
+        sqrt_log_visits = math.sqrt(math.log(self.visits))
+        children = self._children
+        best_child = None
+        best_value = -1.0
+        for i in range(len(children)):  # see `random_playout`
+            child = children[i]
+            value = child._mean + child._explore * sqrt_log_visits
+            if value > best_value:
+                best_child, best_value = child, value
+        return best_child
+
+    def best_child(self) -> Any:
+        """
+        return the child that was visited most often, which is the move the search trusts
+        the most; the one with the best mean result among them
+
+        >>> root = MCTSNode(None, False)
+        >>> for spot, visits, x_score in ((0, 5, 1.0), (4, 9, 6.0), (8, 9, 4.5)):
+        ...     child = MCTSNode(spot, True)
+        ...     child.visits, child.x_score = visits, x_score
+        ...     root.get_children().append(child)
+        >>> root.best_child().placement
+        4
+        """
+        sign = 1.0 if not self.is_x_move else -1.0
+        return max(self._children,
+                   key=lambda child: (child.visits, sign * child.x_score / child.visits))
+
+    def get_byte_footprint(self) -> int:
+        """
+        return an estimate of the memory in bytes held by this node and its subtrees,
+        from their number and the size of an empty node with its lists of children and
+        untried spots
+
+        >>> root = MCTSNode(None, False)
+        >>> root.get_children().append(MCTSNode(4, True))
+        >>> root.get_byte_footprint() == 2 * MCTSNode(None, False).get_byte_footprint()
+        True
+        """
+        num_nodes = 0
+        stack = [self]
+        while stack:
+            num_nodes += 1
+            stack.extend(stack.pop()._children)
+        return num_nodes * (sys.getsizeof(self) + 2 * sys.getsizeof([]) + 8)
+
+
+class PlayoutBoard:
+    """
+    The position at the root of a search, kept as the number of pieces of each player on
+    every winning line, which is what the iterations of the search copy and play on.
+
+    Placing a piece only adds 1 to the counts of the lines through its spot, and a line
+    whose count reaches the winning length is won; unlike the bitmasks of
+    `bitboard.BitboardState`, this takes no bitwise operations, which are much slower
+    than list operations in Brython.
+
+    >>> game = bb.BitboardState(3)
+    >>> for spot in (4, 0, 8):
+    ...     game.place_piece('x' if spot != 0 else 'o', spot)
+    >>> board = PlayoutBoard(game)
+    >>> board.empty_spots, board.x_counts[6], board.o_counts[0]  # 6: the 0-4-8 diagonal
+    ([1, 2, 3, 5, 6, 7], 2, 1)
+    >>> board.open_lines  # all but the 0-4-8 diagonal
+    7
+
+    Instance Attributes:
+        - x_counts: the number of 'x' pieces on each winning line, in the order of
+          `bitboard.get_lines`
+        - o_counts: the number of 'o' pieces on each winning line
+        - empty_spots: the vacant spots of the board
+        - spot_lines: the indices of the winning lines through each spot
+        - win_len: the number of adjacent pieces that wins the game
+        - open_lines: the number of winning lines that do not hold both pieces; the game
+          is a tie once it drops to 0, so the search does not expand the tree past it
+    """
+    x_counts: list[int]
+    o_counts: list[int]
+    empty_spots: list[int]
+    spot_lines: list[list[int]]
+    win_len: int
+    open_lines: int
+
+    def __init__(self, game: bb.BitboardState) -> None:
+        side, self.win_len = game.get_side_length(), game.get_win_length()
+        self.spot_lines = bb.get_spot_line_indices(side, self.win_len)
+        self.empty_spots = game.empty_spots
+        x_bits, o_bits = game.get_bitboards()
+        self.x_counts = []
+        self.o_counts = []
+        self.open_lines = 0
+        for line in bb.get_lines(side, self.win_len):
+            self.x_counts.append(sum(x_bits >> idx & 1 for idx in line))
+            self.o_counts.append(sum(o_bits >> idx & 1 for idx in line))
+            if self.x_counts[-1] == 0 or self.o_counts[-1] == 0:
+                self.open_lines += 1
+
+
+def run_iteration(root: MCTSNode, board: PlayoutBoard) -> None:
+    """
+    run one iteration of the search from `root`, whose position is the given board: walk
+    down the tree by `MCTSNode.select_child` to a node with untried moves, add the node of
+    one of them, finish the game from there with random moves, and add the result to
+    every node on the way; `board` itself is not changed
+    """
+    x_counts = board.x_counts[:]
+    o_counts = board.o_counts[:]
+    empty_spots = board.empty_spots[:]
+    spot_lines = board.spot_lines
+    win_len = board.win_len
+    open_lines = board.open_lines
+
+    node = root
+    path = [root]
+    result = None
+    while result is None:
+        if node._untried is None:
+            node._untried = empty_spots[:]
+            random.shuffle(node._untried)
+        is_x = not node.is_x_move
+        is_new = bool(node._untried)
+        if is_new:
+            spot = node._untried.pop()
+            child = MCTSNode(spot, is_x)
+            node._children.append(child)
+        else:
+            child = node.select_child()
+            spot = child.placement
+        node = child
+        path.append(node)
+
+        # place the piece, and check the lines through it
+        counts, other_counts = (x_counts, o_counts) if is_x else (o_counts, x_counts)
+        lines = spot_lines[spot]
+        for j in range(len(lines)):  # see `random_playout`
+            count = counts[lines[j]] + 1
+            counts[lines[j]] = count
+            if count == win_len:
+                result = X_WIN if is_x else O_WIN
+            elif count == 1 and other_counts[lines[j]]:
+                open_lines -= 1
+        empty_spots.remove(spot)
+        if result is None and (not empty_spots or open_lines == 0):
+            result = TIE
+        elif result is None and is_new:
+            # finish the game with random moves from the new node
+            result = random_playout(x_counts, o_counts, not is_x, empty_spots,
+                                    spot_lines, win_len)
+
+    for i in range(len(path)):
+        path[i].add_result(result)
+
+
+def random_playout(
+        x_counts: list[int],
+        o_counts: list[int],
+        x_moves_next: bool,
+        empty_spots: list[int],
+        spot_lines: list[list[int]],
+        win_len: int
+) -> float:
+    """
+    finish the game by placing the pieces on the empty spots in a random order, and
+    return its result for 'x'; the arguments are those of a `PlayoutBoard`, and the
+    counts and `empty_spots` are changed in place
+
+    unlike `run_iteration`, this does not stop at a position where every line holds both
+    pieces: the result is a tie either way, and the extra check on every piece costs
+    more in Brython than the moves it saves
+
+    >>> lines = bb.get_spot_line_indices(3, 3)
+    >>> x_counts = [2, 1, 0, 1, 2, 0, 2, 1]  # x on spots 0, 1 and 4, o on spot 3
+    >>> o_counts = [0, 1, 0, 1, 0, 0, 0, 0]
+    >>> random_playout(x_counts, o_counts, True, [2, 8], lines, 3)  # x wins at 2 or 8
+    1.0
+    """
+    random.shuffle(empty_spots)
+    # the loops run over index ranges, since iterating over a list is many times slower
+    # than over a `range` in Brython
+    for i in range(len(empty_spots)):
+        counts = x_counts if x_moves_next else o_counts
+        lines = spot_lines[empty_spots[i]]
+        for j in range(len(lines)):
+            count = counts[lines[j]] + 1
+            if count == win_len:
+                return X_WIN if x_moves_next else O_WIN
+            counts[lines[j]] = count
+        x_moves_next = not x_moves_next
+    return TIE
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
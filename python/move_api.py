@@ -0,0 +1,443 @@
+"""
+A JSON endpoint that answers the AI player's move in a game sent by the client, by
+running the engine natively under CPython on the server, so that a client does not need
+to run the Brython runtime to play against the AI. `main.py --api` serves it next to the
+static files of the game.
+
+A POST to `API_PATH` sends a game as a JSON object:
+    - "board": the rows of the board, as lists of 'x', 'o' or '' for an empty spot
+    - "piece": the piece of the player to move, 'x' or 'o'
+    - "difficulty": one of the keys of `DIFFICULTIES`
+    - "side" (optional): the side length of the board, checked against "board"
+    - "win_len" (optional): the number of adjacent pieces that wins the game; a full
+      line if not given
+    - "session" (optional): an id of the game, chosen by the client, e.g. a random UUID;
+      the server keeps the AI player of the game between the moves of one session in an
+      `EngineCache`, so that the player reuses the game tree and the transposition table
+      of its previous search, as it does in the browser
+
+and the reply is the move of the AI player as a JSON object:
+    - "piece" and "spot": the piece and the placement spot (`row * side + col`) of the
+      move, as returned by `tictactoe.Player.return_move`
+    - "row" and "col": the coordinates of the spot
+    - "score": the Minimax utility score of the move, which is large if 'x' is likely to
+      win (see `tictactoe.AIMinimaxPlayer.get_move_score`); `null` if the move was not
+      searched by Minimax
+
+A request that is not a valid game to move in is answered with the status 400 and a
+JSON object whose "error" tells why.
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+from typing import Optional
+import http.server
+import json
+import threading
+import time
+import tictactoe as ttt
+
+# the path of the endpoint
+API_PATH = "/api/move"
+
+# the difficulties of a request, and the roles of `tictactoe.role_to_player` that play
+# them
+DIFFICULTIES = {
+    "random": "ai_random",
+    "easy": "ai_easy",
+    "hard": "ai_hard",
+    "mcts": "ai_mcts"
+}
+
+# the board side lengths that the "hard" search depths of `tictactoe.AIMinimaxPlayer`
+# are set for, which are the ones the browser game offers
+SIDES = (3, 4, 5)
+
+# the largest request body in bytes that is read; a 5x5 board takes a few hundred
+MAX_REQUEST_BYTES = 4096
+
+# the longest session id
+MAX_SESSION_ID_LEN = 64
+
+
+def parse_request(request: dict) -> tuple[ttt.GameState, str, str]:
+    """
+    return the game state, the piece to move and the difficulty of the given request;
+    raise `ValueError` if the request is not a game that the piece can move in
+
+    >>> game, piece, difficulty = parse_request(
+    ...     {"board": [['x', '', ''], ['', '', ''], ['', '', '']], "piece": 'o',
+    ...      "difficulty": "hard"})
+    >>> game.empty_spots, piece, difficulty
+    ([1, 2, 3, 4, 5, 6, 7, 8], 'o', 'hard')
+    >>> parse_request({"board": [['x', '', ''], ['', '', ''], ['', '', '']],
+    ...                "piece": 'x', "difficulty": "hard"})
+    Traceback (most recent call last):
+    ValueError: it is not the turn of 'x'
+
+    Values of the wrong JSON type are refused the same way:
+
+    >>> parse_request({"board": [['x', [], ''], ['', '', ''], ['', '', '']],
+    ...                "piece": 'o', "difficulty": {}})
+    Traceback (most recent call last):
+    ValueError: the spots of 'board' must be 'x', 'o' or ''
+    """
+    if not isinstance(request, dict):
+        raise ValueError("the request must be a JSON object")
+
+    board = request.get("board")
+    side = len(board) if isinstance(board, list) else 0
+    if side not in SIDES or not all(isinstance(row, list) and len(row) == side
+                                    for row in board):
+        raise ValueError(f"'board' must be a square list of rows of a side in {SIDES}")
+    # JSON arrays and objects are not hashable, so every value is checked to be a string
+    # before it is looked up in a set or a dictionary
+    if not all(isinstance(cell, str) and cell in {'x', 'o', ''}
+               for row in board for cell in row):
+        raise ValueError("the spots of 'board' must be 'x', 'o' or ''")
+    if request.get("side", side) != side:
+        raise ValueError(f"'side' is {request['side']}, but 'board' has {side} rows")
+
+    win_len = request.get("win_len")
+    if win_len is not None and (not isinstance(win_len, int) or
+                                not 3 <= win_len <= side):
+        raise ValueError(f"'win_len' must be between 3 and {side}")
+
+    piece = request.get("piece")
+    if not isinstance(piece, str) or piece not in {'x', 'o'}:
+        raise ValueError("'piece' must be 'x' or 'o'")
+    difficulty = request.get("difficulty")
+    if not isinstance(difficulty, str) or difficulty not in DIFFICULTIES:
+        raise ValueError(f"'difficulty' must be one of {sorted(DIFFICULTIES)}")
+
+    # either player may start, so the pieces differ by at most 1, and the piece that has
+    # been placed fewer times moves next
+    counts = {p: sum(row.count(p) for row in board) for p in ('x', 'o')}
+    if abs(counts['x'] - counts['o']) > 1:
+        raise ValueError("the numbers of 'x' and 'o' on 'board' differ by more than 1")
+    if counts[piece] > counts[ttt.piece_not(piece)]:
+        raise ValueError(f"it is not the turn of '{piece}'")
+
+    game = ttt.GameState([list(row) for row in board], win_len=win_len)
+    if game.get_winning_piece() is not None:
+        raise ValueError("the game on 'board' is over")
+    return game, piece, difficulty
+
+
+class Session:
+    """
+    The AI player of one game, kept by an `EngineCache` between the moves of the game.
+
+    Instance Attributes:
+        - player: the AI player
+        - settings: the side length, the winning length, the piece and the difficulty of
+          the requests that the player answers
+        - position: the bitboards ('x', 'o') of the game right after the player's most
+          recent move
+        - last_used: the time in seconds since the epoch of the player's most recent move
+        - byte_footprint: the memory in bytes that the player keeps between moves, as
+          estimated by `tictactoe.Player.get_byte_footprint` after its most recent move
+    """
+    player: ttt.Player
+    settings: tuple
+    position: tuple[int, int]
+    last_used: float
+    byte_footprint: int
+
+    def __init__(
+            self,
+            player: ttt.Player,
+            settings: tuple,
+            position: tuple[int, int]
+    ) -> None:
+        self.player = player
+        self.settings = settings
+        self.position = position
+        self.last_used = time.time()
+        self.byte_footprint = player.get_byte_footprint()
+
+    def find_reply(self, settings: tuple, position: tuple[int, int]) -> Optional[int]:
+        """
+        return the spot of the opponent's reply to the player's most recent move, if the
+        given position of a request with the given settings follows from it by that one
+        reply; `None` otherwise
+
+        >>> session = Session(ttt.AIRandomPlayer('o'), (3, 3, 'o', "random"), (0b1, 0b10))
+        >>> session.find_reply((3, 3, 'o', "random"), (0b10001, 0b10))
+        4
+        >>> session.find_reply((3, 3, 'o', "random"), (0b10101, 0b10)) is None
+        True
+        """
+        if settings != self.settings:
+            return None
+        is_x = settings[2] == 'x'
+        mine, theirs = self.position if is_x else self.position[::-1]
+        new_mine, new_theirs = position if is_x else position[::-1]
+        added = new_theirs & ~theirs
+        if new_mine != mine or new_theirs != theirs | added or added & (added - 1) != 0:
+            return None
+        return added.bit_length() - 1 if added != 0 else None
+
+
+class EngineCache:
+    """
+    A store of the `Session`s of the games played through the endpoint, keyed by their
+    session ids, and bounded by the number of sessions and by the memory they keep.
+
+    A session is taken out of the cache while its player searches, so that two requests
+    of one session at the same time cannot both move its player; the second one plays
+    with a new player. Once the cache is full, putting a session back evicts the least
+    recently used sessions first, and a session is dropped once it has been idle for
+    `idle_seconds`.
+
+    >>> cache = EngineCache(max_sessions=2)
+    >>> for session_id in ("a", "b", "c"):
+    ...     cache.put(session_id, Session(ttt.AIRandomPlayer('o'), (), (0, 0)))
+    >>> cache.take("a") is None, cache.take("b") is not None, len(cache)
+    (True, True, 1)
+
+    Instance Attributes:
+        - max_sessions: the maximum number of sessions held by the cache
+        - max_bytes: the maximum memory in bytes that the players of the sessions keep,
+          by their estimates
+        - idle_seconds: the number of seconds that a session is kept after its most
+          recent move
+    """
+    max_sessions: int
+    max_bytes: int
+    idle_seconds: float
+
+    # Private Instance Attributes:
+    #   - _sessions: a dictionary mapping session ids to sessions, from the least to the
+    #     most recently used
+    #   - _total_bytes: the sum of the byte footprints of `_sessions`
+    #   - _lock: the lock held while `_sessions` is changed, since the server answers
+    #     every request in its own thread
+    _sessions: dict[str, Session]
+    _total_bytes: int
+    _lock: threading.Lock
+
+    def __init__(
+            self,
+            max_sessions: int = 100,
+            max_bytes: int = 256 * 1024 * 1024,
+            idle_seconds: float = 600
+    ) -> None:
+        assert max_sessions > 0
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self._sessions = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get_byte_footprint(self) -> int:
+        """
+        return the memory in bytes kept by the players of the sessions, by their estimates
+        """
+        return self._total_bytes
+
+    def take(self, session_id: str) -> Optional[Session]:
+        """
+        remove and return the session of the given id, or `None` if the cache does not
+        hold it
+        """
+        with self._lock:
+            self._evict_idle()
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._total_bytes -= session.byte_footprint
+            return session
+
+    def put(self, session_id: str, session: Session) -> None:
+        """
+        store the given session under the given id as the most recently used one, and
+        evict the least recently used sessions while the cache holds too many sessions
+        or too much memory
+        """
+        with self._lock:
+            old_session = self._sessions.pop(session_id, None)
+            if old_session is not None:
+                self._total_bytes -= old_session.byte_footprint
+            self._sessions[session_id] = session
+            self._total_bytes += session.byte_footprint
+
+            self._evict_idle()
+            while self._sessions and (len(self._sessions) > self.max_sessions
+                                      or self._total_bytes > self.max_bytes):
+                oldest_id = next(iter(self._sessions))
+                self._total_bytes -= self._sessions.pop(oldest_id).byte_footprint
+
+    def _evict_idle(self) -> None:
+        """
+        remove the sessions that have been idle for longer than `idle_seconds`; they are
+        the least recently used ones, at the front of `_sessions`
+        """
+        expiry = time.time() - self.idle_seconds
+        while self._sessions:
+            session_id = next(iter(self._sessions))
+            if self._sessions[session_id].last_used >= expiry:
+                break
+            self._total_bytes -= self._sessions.pop(session_id).byte_footprint
+
+
+def answer_move(
+        request: dict,
+        time_budget_ms: Optional[int] = None,
+        cache: Optional[EngineCache] = None
+) -> dict:
+    """
+    return the reply to the given request: the move of an AI player of the requested
+    difficulty, where "hard" and "mcts" players search for at most `time_budget_ms`
+    milliseconds (to a fixed depth or number of playouts if not given); raise
+    `ValueError` if the request is not valid
+
+    The player of a request with a "session" id is kept in the given cache, and moves
+    again for the next request of the session if that request's board only adds the
+    opponent's reply; otherwise, a new player moves.
+
+    >>> request = {"board": [['x', 'x', ''], ['o', '', ''], ['', '', '']], "piece": 'o',
+    ...            "difficulty": "easy"}
+    >>> answer_move(request)
+    {'piece': 'o', 'spot': 2, 'row': 0, 'col': 2, 'score': 0}
+
+    The "hard" player looks up its moves on the 3x3 board in a table, without a search:
+
+    >>> answer_move({**request, "difficulty": "hard"})["score"] is None
+    True
+
+    A session of a "hard" player on the 4x4 board searches on from its previous move:
+
+    >>> cache = EngineCache()
+    >>> request = {"board": [['x', '', '', ''], ['', '', '', ''], ['', '', '', ''],
+    ...                      ['', '', '', '']], "piece": 'o', "difficulty": "hard",
+    ...            "session": "game-1"}
+    >>> reply = answer_move(request, cache=cache)
+    >>> session = cache.take("game-1")
+    >>> cache.put("game-1", session)
+    >>> request["board"][3][3] = 'x'
+    >>> request["board"][reply["row"]][reply["col"]] = 'o'
+    >>> _ = answer_move(request, cache=cache)
+    >>> cache.take("game-1").player is session.player
+    True
+    """
+    game, piece, difficulty = parse_request(request)
+    session_id = request.get("session")
+    if session_id is not None and (not isinstance(session_id, str) or
+                                   not 0 < len(session_id) <= MAX_SESSION_ID_LEN):
+        raise ValueError(f"'session' must be a string of 1 to {MAX_SESSION_ID_LEN} "
+                         "characters")
+
+    # reuse the player of the session if the game went on from its most recent move
+    settings = (game.get_side_length(), game.get_win_length(), piece, difficulty)
+    position = game.to_bitboard().get_bitboards()
+    prev_move = None
+    session = None
+    if cache is not None and session_id is not None:
+        session = cache.take(session_id)
+    if session is not None:
+        prev_move = session.find_reply(settings, position)
+    if prev_move is not None:
+        player = session.player
+    else:
+        player = ttt.role_to_player(DIFFICULTIES[difficulty], piece, time_budget_ms)
+    piece, spot = player.return_move(game, prev_move)
+
+    if cache is not None and session_id is not None:
+        bit = 1 << spot
+        position = ((position[0] | bit, position[1]) if piece == 'x'
+                    else (position[0], position[1] | bit))
+        cache.put(session_id, Session(player, settings, position))
+
+    side = game.get_side_length()
+    score = None
+    if isinstance(player, ttt.AIMinimaxPlayer):
+        score = player.get_move_score()
+    return {
+        "piece": piece,
+        "spot": spot,
+        "row": spot // side,
+        "col": spot % side,
+        "score": score
+    }
+
+
+class MoveRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """
+    A request handler that serves the static files of the current directory like
+    `http.server.SimpleHTTPRequestHandler`, and answers a POST to `API_PATH` by
+    `answer_move`
+
+    Class Attributes:
+        - time_budget_ms: the search time budget of the "hard" and "mcts" AI players of
+          `answer_move`; `None` to search to a fixed depth or number of playouts
+        - cache: the cache of the sessions of `answer_move`; `None` to answer every
+          request with a new player
+    """
+    time_budget_ms: Optional[int] = None
+    cache: Optional[EngineCache] = None
+
+    def do_POST(self) -> None:
+        """
+        answer a POST request to `API_PATH`
+        """
+        if self.path != API_PATH:
+            self.send_error(404, "only POST to " + API_PATH)
+            return
+
+        try:
+            # `read` of a negative length waits for the client to close the connection
+            length = self.headers.get("Content-Length") or "0"
+            if not length.isdigit():
+                raise ValueError("'Content-Length' must be a non-negative integer")
+            length = int(length)
+            if length > MAX_REQUEST_BYTES:
+                self.send_json(413, {"error": f"the request is over {MAX_REQUEST_BYTES}"
+                                              " bytes"})
+                return
+            request = json.loads(self.rfile.read(length))
+            reply = answer_move(request, self.time_budget_ms, self.cache)
+        except ValueError as error:  # `json.JSONDecodeError` is a `ValueError` too
+            self.send_json(400, {"error": str(error)})
+            return
+        self.send_json(200, reply)
+
+    def send_json(self, status: int, obj: dict) -> None:
+        """
+        send a response of the given status with the given object as its JSON body
+        """
+        body = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
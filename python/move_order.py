@@ -0,0 +1,240 @@
+"""
+Move ordering heuristics for the Minimax search, which try the most promising moves
+first so that Alpha-Beta pruning cuts off as many of the remaining moves as possible.
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+from type_hints import Optional
+import bitboard as bb
+import game_tree as gt
+
+
+class MoveOrdering:
+    """
+    A move ordering heuristic that leaves the moves in the order they are given, which
+    is the row-major order of the board for a freshly generated game tree node.
+
+    Subclasses reorder the subtrees of a game tree node before the search visits them,
+    and may learn from the moves that caused a cutoff.
+
+    [c] The killer move and history heuristics below are classic chess engine
+        techniques; see https://www.chessprogramming.org/Move_Ordering
+    """
+
+    def order(self, subtrees: list, ply: int, hash_move: Optional[int]) -> list:
+        """
+        return the given subtrees of a game tree node in the order to search them
+
+        `ply` is the number of moves played in the game before this node's moves, and
+        `hash_move` is the best move stored for this position in the transposition
+        table, or `None`
+        """
+        return subtrees
+
+    def record_cutoff(self, spot: int, ply: int, depth: int) -> None:
+        """
+        learn that the move to `spot` at the given ply caused a cutoff, in a search with
+        `depth` steps left
+        """
+
+    def reset(self) -> None:
+        """
+        forget everything learned from earlier searches
+        """
+
+
+class StaticOrdering(MoveOrdering):
+    """
+    Search the spots that lie on the most winning lines first: the centre, then the
+    corners on the 3x3 board, and similarly on larger boards.
+
+    >>> ordering = StaticOrdering(3)
+    >>> [s.placement for s in ordering.order(_subtrees(0, 1, 4), 0, None)]
+    [4, 0, 1]
+    """
+    # Private Instance Attributes:
+    #   - _priority: a list indexed by spot, of the number of winning lines through it
+    _priority: list[int]
+
+    def __init__(self, side: int, win_len: Optional[int] = None) -> None:
+        self._priority = [len(masks) for masks in bb.get_spot_line_masks(side, win_len)]
+
+    def order(self, subtrees: list, ply: int, hash_move: Optional[int]) -> list:
+        return sorted(subtrees, key=lambda s: -self._priority[s.placement])
+
+
+class KillerOrdering(MoveOrdering):
+    """
+    Search the two most recent moves that caused a cutoff at the same ply first, since
+    a move that refutes one position often refutes its siblings too.
+
+    >>> ordering = KillerOrdering()
+    >>> ordering.record_cutoff(4, 2, 3)
+    >>> [s.placement for s in ordering.order(_subtrees(0, 1, 4), 2, None)]
+    [4, 0, 1]
+    """
+    # Private Instance Attributes:
+    #   - _killers: a mapping from each ply to its (up to two) killer moves, most recent
+    #     first
+    _killers: dict
+
+    def __init__(self) -> None:
+        self._killers = {}
+
+    def order(self, subtrees: list, ply: int, hash_move: Optional[int]) -> list:
+        killers = self._killers.get(ply)
+        if not killers:
+            return subtrees
+        # Brython fails to sort by `bool` keys, so the keys are integers
+        return sorted(subtrees, key=lambda s: 0 if s.placement in killers else 1)
+
+    def record_cutoff(self, spot: int, ply: int, depth: int) -> None:
+        killers = self._killers.get(ply, [])
+        if spot not in killers:
+            self._killers[ply] = [spot] + killers[:1]
+
+    def reset(self) -> None:
+        self._killers = {}
+
+
+class HistoryOrdering(MoveOrdering):
+    """
+    Search the moves that caused the most cutoffs anywhere in the search first; cutoffs
+    far from the leaves are worth more, by the square of the depth left.
+
+    >>> ordering = HistoryOrdering()
+    >>> ordering.record_cutoff(1, 5, 1)
+    >>> ordering.record_cutoff(4, 2, 3)
+    >>> [s.placement for s in ordering.order(_subtrees(0, 1, 4), 0, None)]
+    [4, 1, 0]
+    """
+    # Private Instance Attributes:
+    #   - _history: a mapping from each spot to its accumulated cutoff score
+    _history: dict
+
+    def __init__(self) -> None:
+        self._history = {}
+
+    def order(self, subtrees: list, ply: int, hash_move: Optional[int]) -> list:
+        history = self._history
+        return sorted(subtrees, key=lambda s: -history.get(s.placement, 0))
+
+    def record_cutoff(self, spot: int, ply: int, depth: int) -> None:
+        self._history[spot] = self._history.get(spot, 0) + depth * depth
+
+    def reset(self) -> None:
+        self._history = {}
+
+
+class HashMoveOrdering(MoveOrdering):
+    """
+    Search the best move stored in the transposition table first, which is usually the
+    best move found by a shallower search of the same position.
+
+    >>> ordering = HashMoveOrdering()
+    >>> [s.placement for s in ordering.order(_subtrees(0, 1, 4), 0, 1)]
+    [1, 0, 4]
+    """
+
+    def order(self, subtrees: list, ply: int, hash_move: Optional[int]) -> list:
+        if hash_move is None:
+            return subtrees
+        # integer keys, like `KillerOrdering.order`
+        return sorted(subtrees, key=lambda s: 0 if s.placement == hash_move else 1)
+
+
+class CombinedOrdering(MoveOrdering):
+    """
+    Apply several move orderings, from the least to the most important one; since the
+    sorting is stable, each ordering breaks the ties of the next.
+
+    >>> ordering = CombinedOrdering([StaticOrdering(3), HashMoveOrdering()])
+    >>> [s.placement for s in ordering.order(_subtrees(0, 1, 4), 0, 1)]
+    [1, 4, 0]
+    """
+    # Private Instance Attributes:
+    #   - _orderings: the combined orderings, least important first
+    _orderings: list
+
+    def __init__(self, orderings: list) -> None:
+        self._orderings = orderings
+
+    def order(self, subtrees: list, ply: int, hash_move: Optional[int]) -> list:
+        for ordering in self._orderings:
+            subtrees = ordering.order(subtrees, ply, hash_move)
+        return subtrees
+
+    def record_cutoff(self, spot: int, ply: int, depth: int) -> None:
+        for ordering in self._orderings:
+            ordering.record_cutoff(spot, ply, depth)
+
+    def reset(self) -> None:
+        for ordering in self._orderings:
+            ordering.reset()
+
+
+# the names accepted by `get_ordering`
+ORDERING_NAMES = ("none", "static", "killer", "history", "hash", "all")
+
+
+def get_ordering(name: str, side: int, win_len: Optional[int] = None) -> MoveOrdering:
+    """
+    return a new move ordering by its name in `ORDERING_NAMES`, for a board with
+    sidelength `side`; "all" combines all of them, most importantly the hash move, then
+    the killer moves, the history scores, and the centre and corner prior
+
+    >>> type(get_ordering("killer", 3)).__name__
+    'KillerOrdering'
+    """
+    if name == "static":
+        return StaticOrdering(side, win_len)
+    elif name == "killer":
+        return KillerOrdering()
+    elif name == "history":
+        return HistoryOrdering()
+    elif name == "hash":
+        return HashMoveOrdering()
+    elif name == "all":
+        return CombinedOrdering([
+            StaticOrdering(side, win_len),
+            HistoryOrdering(),
+            KillerOrdering(),
+            HashMoveOrdering()
+        ])
+    else:
+        assert name == "none"
+        return MoveOrdering()
+
+
+def _subtrees(*spots: int) -> list:
+    """
+    return a list of game tree nodes for the given spots; used by the doctests above
+    """
+    return [gt.CompactGameTree(spot) for spot in spots]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,186 @@
+"""
+A perfect-play move table for the 3x3 Tic Tac Toe board, and its offline generator.
+
+Every position that can be reached on the 3x3 board is solved once by an exhaustive
+Minimax search, and the best move of each position is written into the `book_3x3`
+module, so that the AI player can answer instantly instead of searching every turn.
+Regenerate the table by running this module:
+
+    python3 opening_book.py
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+from type_hints import Optional
+import bitboard as bb
+import symmetry as sym
+import book_3x3
+
+# the board covered by the table; the game must be won with a full line
+BOOK_SIDE = 3
+
+
+def book_key(x_bits: int, o_bits: int, piece: str) -> int:
+    """
+    return the table key of the 3x3 board with the given (canonical) bitboards, when the
+    given piece is the next to move
+
+    >>> book_key(0b1, 0b10, 'o')
+    263169
+    """
+    return x_bits | o_bits << 9 | (1 << 18 if piece == 'o' else 0)
+
+
+################################################################################
+# Table lookup
+################################################################################
+
+def lookup_move(game: bb.BitboardState, piece: str) -> Optional[int]:
+    """
+    return the best move for the given piece in the given game state from the table,
+    or `None` if the table does not cover the game
+
+    >>> game = bb.BitboardState.from_board([['x', 'x', ''], ['o', 'o', ''], ['', '', '']])
+    >>> lookup_move(game, 'x')  # win right away
+    2
+    >>> lookup_move(game, 'o')
+    5
+    >>> lookup_move(bb.BitboardState(4), 'x') is None
+    True
+    """
+    if game.get_side_length() != BOOK_SIDE or game.get_win_length() != BOOK_SIDE:
+        return None
+
+    x_bits, o_bits = game.get_bitboards()
+    canon_x, canon_o, t_idx = sym.canonicalize(x_bits, o_bits, BOOK_SIDE)
+    canon_idx = book_3x3.BOOK.get(book_key(canon_x, canon_o, piece))
+    if canon_idx is None:
+        return None
+
+    # map the move on the canonical board back onto the given board
+    return sym.get_inverse_transforms(BOOK_SIDE)[t_idx][canon_idx]
+
+
+################################################################################
+# Table generator
+################################################################################
+
+def _winner(x_bits: int, o_bits: int) -> Optional[str]:
+    """
+    return the piece that has a full line on the 3x3 board, or `None`
+    """
+    for mask in bb.get_line_masks(BOOK_SIDE):
+        if x_bits & mask == mask:
+            return 'x'
+        elif o_bits & mask == mask:
+            return 'o'
+    return None
+
+
+def _solve(x_bits: int, o_bits: int, piece: str, solved: dict) -> int:
+    """
+    return the Minimax score of the given position with perfect play from both sides,
+    and record the best move of every non-terminal position reached into `solved`,
+    keyed by the canonical `book_key`
+
+    the scores are like those of `tictactoe.AIMinimaxPlayer._score_node`, but count the
+    empty spots before the winning move is made: a win that fills the last spot of the
+    board must still score better than a tie. Among the moves with the best score, the
+    first one on the canonical board is recorded
+    """
+    canon_x, canon_o, _ = sym.canonicalize(x_bits, o_bits, BOOK_SIDE)
+    key = book_key(canon_x, canon_o, piece)
+    if key in solved:
+        return solved[key][1]
+
+    best_idx = None
+    best_score = None
+    taken = canon_x | canon_o
+    num_empty = BOOK_SIDE ** 2 - bin(taken).count('1')
+    for idx in range(BOOK_SIDE ** 2):
+        if taken >> idx & 1:
+            continue
+
+        if piece == 'x':
+            new_x, new_o = canon_x | 1 << idx, canon_o
+        else:
+            new_x, new_o = canon_x, canon_o | 1 << idx
+
+        winner = _winner(new_x, new_o)
+        if winner == 'x':
+            score = num_empty
+        elif winner == 'o':
+            score = -num_empty
+        elif num_empty == 1:
+            score = 0
+        else:
+            score = _solve(new_x, new_o, 'o' if piece == 'x' else 'x', solved)
+
+        if best_score is None or \
+                (piece == 'x' and score > best_score) or \
+                (piece == 'o' and score < best_score):
+            best_idx = idx
+            best_score = score
+
+    solved[key] = (best_idx, best_score)
+    return best_score
+
+
+def generate_book() -> dict:
+    """
+    solve every position reachable on the 3x3 board, with either piece moving first,
+    and return a dictionary mapping the canonical `book_key` of each non-terminal
+    position to the index of its best move on the canonical board
+    """
+    solved = {}
+    _solve(0, 0, 'x', solved)
+    _solve(0, 0, 'o', solved)
+    return {key: solved[key][0] for key in sorted(solved)}
+
+
+def write_book(path: str) -> None:
+    """
+    generate the table and write it to the given path as the `book_3x3` module
+    """
+    book = generate_book()
+    with open(path, 'w') as book_file:
+        book_file.write(
+            '"""\n'
+            'Perfect-play moves for the 3x3 board, generated by `opening_book.py`; '
+            'do not edit.\n\n'
+            'Maps the `opening_book.book_key` of every canonical position to the\n'
+            'index of its best move.\n'
+            '"""\n'
+        )
+        book_file.write('BOOK = {\n')
+        items = [f'{key}: {idx}' for key, idx in book.items()]
+        for start in range(0, len(items), 6):
+            book_file.write('    ' + ', '.join(items[start:start + 6]) + ',\n')
+        book_file.write('}\n')
+    print(f"Wrote {len(book)} positions to {path}")
+
+
+if __name__ == '__main__':
+    import os
+    write_book(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'book_3x3.py'))
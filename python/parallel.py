@@ -0,0 +1,234 @@
+"""
+A Minimax player that splits the moves at the root of its search across a pool of
+worker processes, for running the engine under CPython on a multi-core machine (e.g. a
+server or a batch of games); the browser game does not import this module.
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union
+import os
+import bitboard as bb
+import move_order as mo
+import tictactoe as ttt
+import transposition as tp
+
+
+class ParallelMinimaxPlayer(ttt.AIMinimaxPlayer):
+    """
+    An `AIMinimaxPlayer` whose in-place search scores the subtrees of the root in
+    worker processes.
+
+    The root moves are taken in the order of the move ordering heuristic. The first
+    one is searched on its own with the full alpha-beta window, since it is usually the
+    best and bounds all the others; the rest are searched `workers` at a time, every
+    batch with the window narrowed by the best score of the batches before it. Among
+    the moves with the best score, the first one in that order is played, which is the
+    move the serial search plays too:
+
+    >>> game = ttt.GameState(ttt.empty_board(4))
+    >>> for spot in (5, 0, 10):
+    ...     game.place_piece('x' if spot != 0 else 'o', spot)
+    >>> serial = ttt.AIMinimaxPlayer('o', 'hard', heuristic=True)
+    >>> with ParallelMinimaxPlayer('o', 'hard', workers=2, heuristic=True) as player:
+    ...     player.return_move(game, 10) == serial.return_move(game, 10)
+    True
+
+    Each worker searches its subtree with a fresh transposition table and move ordering,
+    so the workers prune a little less than one process that shares them would.
+
+    [c] Splitting the root of an alpha-beta search, and searching the first move before
+        its siblings, follows the "Young Brothers Wait" idea; see
+        https://www.chessprogramming.org/Young_Brothers_Wait_Concept
+
+    Instance Attributes:
+        - workers: the number of worker processes, which is also the number of root
+          moves searched at the same time
+    """
+    workers: int
+
+    # Private Instance Attributes:
+    #   - _table_size: the transposition table size given to every worker's search
+    #   - _executor: the pool of worker processes, started by the first search unless
+    #     given; `None` if not started or closed
+    #   - _owns_executor: True if `close` shuts down `_executor`, False if it was given
+    _table_size: int
+    _executor: Optional[ProcessPoolExecutor]
+    _owns_executor: bool
+
+    def __init__(
+            self,
+            piece: str,
+            difficulty: str,
+            workers: Optional[int] = None,
+            table_size: int = 50000,
+            executor: Optional[ProcessPoolExecutor] = None,
+            **kwargs
+    ) -> None:
+        """
+        initialize the player with `workers` worker processes, one per CPU if not given;
+        the processes of `executor` are used if given, so that several players can share
+        one pool, and it is left running by `close`
+
+        any other keyword arguments are passed on to `AIMinimaxPlayer`, but the search
+        must be in place, and cannot collect statistics
+        """
+        super().__init__(piece, difficulty, table_size=table_size, **kwargs)
+        assert self.in_place and not self.collect_stats
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self._table_size = table_size
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def __enter__(self) -> ParallelMinimaxPlayer:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        shut down the worker processes, unless they were given; a later search starts
+        them again
+        """
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown()
+        self._executor = None
+        self._owns_executor = True
+
+    def _search_root(self, game: ttt.GameState, depth: int) -> int:
+        """
+        score the subtrees of the current game tree by searching them to the given depth
+        in the worker processes, and return the best placement for my piece
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers)
+
+        tree = self._tree
+        subtrees = tree.get_subtrees()
+        if subtrees == []:
+            self._gen_subtrees_in_place(tree, game)
+            subtrees = tree.get_subtrees()
+
+        # order the root moves like the serial search does
+        table = self._table
+        hash_move = None
+        if table is not None:
+            hash_key, x_bits, o_bits = game.get_position()
+            key = tp.position_key(hash_key, self._piece)
+            entry = table.probe(key, x_bits, o_bits)
+            if entry is not None:
+                hash_move = game.from_position_spot(entry[3])
+        subtrees = self._ordering.order(subtrees, len(game.move_history), hash_move)
+
+        is_x = self._piece == 'x'
+        alpha, beta = float("-inf"), float("inf")
+        best_score = None
+        best_move = None
+        batches = [subtrees[:1]] + [
+            subtrees[start:start + self.workers]
+            for start in range(1, len(subtrees), self.workers)
+        ]
+        for batch in batches:
+            tasks = [self._task(game, s.placement, depth, alpha, beta) for s in batch]
+            if depth == 1:
+                # the moves are scored faster than they are sent to the workers
+                results = [_search_subtree(task) for task in tasks]
+            else:
+                futures = [self._executor.submit(_search_subtree, task) for task in tasks]
+                try:
+                    results = [future.result() for future in futures]
+                except Exception:
+                    # e.g. a timeout; stop the moves that have not started yet
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+            # the moves of a batch are searched with the same window, so a score that is
+            # not strictly better than the best one is at most an equal bound
+            for subtree, (score, nodes) in zip(batch, results):
+                subtree.x_win_score = score
+                self._nodes += nodes
+                if best_score is None or (score > best_score if is_x
+                                          else score < best_score):
+                    best_score = score
+                    best_move = subtree.placement
+            if is_x:
+                alpha = max(alpha, best_score)
+            else:
+                beta = min(beta, best_score)
+
+        tree.x_win_score = best_score
+        self._root_move = best_move
+        if table is not None:
+            best_move_key = game.to_position_spot(best_move)
+            table.store(key, best_score, depth, tp.EXACT, best_move_key, x_bits, o_bits)
+        return best_move
+
+    def _task(
+            self,
+            game: bb.BitboardState,
+            spot: int,
+            depth: int,
+            alpha: Union[float, int],
+            beta: Union[float, int]
+    ) -> tuple:
+        """
+        return the arguments of `_search_subtree` for searching the move to `spot` in
+        the given game state with the given window, to the given depth from the root
+        """
+        settings = (self._piece, self.difficulty, self._table_size, self.heuristic,
+                    self.move_ordering, self._deadline)
+        return settings, game, spot, depth, alpha, beta
+
+
+def _search_subtree(task: tuple) -> tuple[Union[float, int], int]:
+    """
+    place the root move of the given task (see `ParallelMinimaxPlayer._task`) and search
+    the position after it like `AIMinimaxPlayer._minimax_in_place` does; return its score
+    and the number of nodes visited
+
+    a `tictactoe._SearchTimeout` is raised if the search runs past the deadline
+    """
+    settings, game, spot, depth, alpha, beta = task
+    piece, difficulty, table_size, heuristic, move_ordering, deadline = settings
+    searcher = ttt.AIMinimaxPlayer(piece, difficulty, table_size=table_size,
+                                   heuristic=heuristic, move_ordering=move_ordering)
+    searcher._ordering = mo.get_ordering(
+        move_ordering, game.get_side_length(), game.get_win_length()
+    )
+    searcher._deadline = deadline
+
+    subtree = searcher._store.new_node(spot, piece == 'x', 0)
+    game = game.copy()
+    game.place_piece(piece, spot)
+    other_piece = ttt.piece_not(piece)
+    searcher._minimax_in_place(subtree, game, depth - 1, other_piece, alpha, beta)
+    return subtree.x_win_score, searcher.get_nodes_searched()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
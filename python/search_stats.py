@@ -0,0 +1,303 @@
+"""
+Statistics of the Minimax search of `tictactoe.AIMinimaxPlayer`, collected only by the
+players created with `collect_stats=True`.
+
+The counters are not updated by the search code itself: for every move, the player's
+search methods, and the methods of its game state, transposition table and move
+ordering that the search calls, are wrapped by counting and timing versions on the
+instances. A player that does not collect statistics runs exactly the same code as
+before.
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+from type_hints import Any, Callable
+import time
+
+
+class SearchStats:
+    """
+    The counters and timers of the search for one move.
+
+    Depths count the moves from the root of the search, which is at depth 0.
+
+    Instance Attributes:
+        - nodes_by_depth: the number of game tree nodes visited at each depth
+        - cutoffs_by_depth: the number of nodes at each depth whose remaining subtrees
+          were pruned by a cutoff; counted by the in-place search only
+        - terminal_hits: the number of nodes visited where the game is over
+        - horizon_hits: the number of nodes visited where the depth limit was reached
+          in an unfinished game
+        - table_probes: the number of transposition table lookups
+        - table_hits: the number of lookups that found the position
+        - winner_check_seconds: the time spent checking game states for a winner
+        - copy_seconds: the time spent copying game states
+        - iteration_seconds: the search depth and the time taken of every search from
+          the root; one for a fixed depth search, one per finished or interrupted
+          iteration of iterative deepening
+        - total_seconds: the time taken by the whole move
+    """
+    nodes_by_depth: list[int]
+    cutoffs_by_depth: list[int]
+    terminal_hits: int
+    horizon_hits: int
+    table_probes: int
+    table_hits: int
+    winner_check_seconds: float
+    copy_seconds: float
+    iteration_seconds: list[tuple[int, float]]
+    total_seconds: float
+
+    # Private Instance Attributes:
+    #   - _root_ply: the number of moves played in the game at the root of the search
+    #   - _copying: True while a copy is being timed, so that a copying method that calls
+    #     another one is only timed once
+    _root_ply: int
+    _copying: bool
+
+    def __init__(self, root_ply: int) -> None:
+        self.nodes_by_depth = []
+        self.cutoffs_by_depth = []
+        self.terminal_hits = 0
+        self.horizon_hits = 0
+        self.table_probes = 0
+        self.table_hits = 0
+        self.winner_check_seconds = 0.0
+        self.copy_seconds = 0.0
+        self.iteration_seconds = []
+        self.total_seconds = 0.0
+        self._root_ply = root_ply
+        self._copying = False
+
+    def get_nodes(self) -> int:
+        """
+        return the total number of nodes visited
+        """
+        return sum(self.nodes_by_depth)
+
+    def get_cutoffs(self) -> int:
+        """
+        return the total number of cutoffs
+        """
+        return sum(self.cutoffs_by_depth)
+
+    def as_dict(self) -> dict:
+        """
+        return the statistics as a dictionary of plain values, e.g. to write as JSON
+        """
+        return {
+            "nodes": self.get_nodes(),
+            "nodes_by_depth": list(self.nodes_by_depth),
+            "cutoffs": self.get_cutoffs(),
+            "cutoffs_by_depth": list(self.cutoffs_by_depth),
+            "terminal_hits": self.terminal_hits,
+            "horizon_hits": self.horizon_hits,
+            "table_probes": self.table_probes,
+            "table_hits": self.table_hits,
+            "winner_check_seconds": self.winner_check_seconds,
+            "copy_seconds": self.copy_seconds,
+            "iteration_seconds": [list(item) for item in self.iteration_seconds],
+            "total_seconds": self.total_seconds
+        }
+
+    def count_node(self, ply: int, is_terminal: bool, is_horizon: bool) -> None:
+        """
+        count a node visited after `ply` moves of the game
+        """
+        depth = ply - self._root_ply
+        _add_at(self.nodes_by_depth, depth)
+        if is_terminal:
+            self.terminal_hits += 1
+        elif is_horizon:
+            self.horizon_hits += 1
+
+    def count_cutoff(self, ply: int) -> None:
+        """
+        count a cutoff at a node after `ply` moves of the game
+        """
+        _add_at(self.cutoffs_by_depth, ply - self._root_ply)
+
+
+def _add_at(counts: list[int], idx: int) -> None:
+    """
+    add 1 to `counts[idx]`, extending `counts` with zeros as needed
+    """
+    while len(counts) <= idx:
+        counts.append(0)
+    counts[idx] += 1
+
+
+################################################################################
+# Wrappers
+################################################################################
+
+def instrument_search(player: Any, game: Any, stats: SearchStats) -> Any:
+    """
+    make the given `tictactoe.AIMinimaxPlayer` count and time its next search into
+    `stats`, and return an instrumented version of the game state it will search
+
+    every wrapper calls the method of the object's class, so instrumenting the same
+    player again for its next move replaces the wrappers instead of stacking them;
+    `uninstrument_search` removes them once the move is made
+    """
+    player_class = type(player)
+    for name in ("_minimax", "_minimax_in_place"):
+        search = getattr(player_class, name).__get__(player)
+        setattr(player, name, _counted_search(search, stats))
+    root_search = player_class._search_root.__get__(player)
+    player._search_root = _timed_root_search(root_search, stats)
+
+    if player._table is not None:
+        table = player._table
+        table.probe = _counted_probe(type(table).probe.__get__(table), stats)
+    if player._ordering is not None:
+        ordering = player._ordering
+        record_cutoff = type(ordering).record_cutoff.__get__(ordering)
+        ordering.record_cutoff = _counted_cutoff(record_cutoff, stats)
+
+    return instrument_game(game, stats)
+
+
+def uninstrument_search(player: Any) -> None:
+    """
+    remove the wrappers `instrument_search` installed on the given player, its
+    transposition table and its move ordering, so that a search outside of a move,
+    such as pondering, does not count into the statistics of the previous move
+    """
+    for name in ("_minimax", "_minimax_in_place", "_search_root"):
+        _remove_wrapper(player, name)
+    if player._table is not None:
+        _remove_wrapper(player._table, "probe")
+    if player._ordering is not None:
+        _remove_wrapper(player._ordering, "record_cutoff")
+
+
+def _remove_wrapper(obj: Any, name: str) -> None:
+    """
+    delete the instance attribute `name` of `obj` that shadows the method of its
+    class, if there is one
+    """
+    if name in vars(obj):
+        delattr(obj, name)
+
+
+def instrument_game(game: Any, stats: SearchStats) -> Any:
+    """
+    make the given game state, and every copy made of it, time its winner checks and
+    copies into `stats`; return the game state
+    """
+    game_class = type(game)
+    get_winning_piece = game_class.get_winning_piece.__get__(game)
+
+    def timed_get_winning_piece() -> Any:
+        start = time.time()
+        piece = get_winning_piece()
+        stats.winner_check_seconds += time.time() - start
+        return piece
+
+    game.get_winning_piece = timed_get_winning_piece
+    for name in ("copy", "copy_and_place_piece"):
+        if hasattr(game_class, name):
+            copy = getattr(game_class, name).__get__(game)
+            setattr(game, name, _timed_copy(copy, stats))
+    return game
+
+
+def _counted_search(search: Callable, stats: SearchStats) -> Callable:
+    """
+    return a version of the given Minimax search method that counts every node
+    """
+    def counted_search(tree: Any, game: Any, depth: int, piece: str, alpha: Any,
+                       beta: Any) -> None:
+        # check the winner without the timing wrapper, which would count it twice
+        is_terminal = bool(type(game).get_winning_piece(game))
+        stats.count_node(len(game.move_history), is_terminal, depth == 0)
+        search(tree, game, depth, piece, alpha, beta)
+
+    return counted_search
+
+
+def _timed_root_search(root_search: Callable, stats: SearchStats) -> Callable:
+    """
+    return a version of `AIMinimaxPlayer._search_root` that times every search
+    """
+    def timed_root_search(game: Any, depth: int) -> int:
+        start = time.time()
+        try:
+            return root_search(game, depth)
+        finally:
+            stats.iteration_seconds.append((depth, time.time() - start))
+
+    return timed_root_search
+
+
+def _counted_probe(probe: Callable, stats: SearchStats) -> Callable:
+    """
+    return a version of `TranspositionTable.probe` that counts lookups and hits
+    """
+    def counted_probe(key: int, x_bits: int, o_bits: int) -> Any:
+        entry = probe(key, x_bits, o_bits)
+        stats.table_probes += 1
+        if entry is not None:
+            stats.table_hits += 1
+        return entry
+
+    return counted_probe
+
+
+def _counted_cutoff(record_cutoff: Callable, stats: SearchStats) -> Callable:
+    """
+    return a version of `MoveOrdering.record_cutoff`, which the in-place search calls
+    at every cutoff, that counts the cutoffs
+    """
+    def counted_cutoff(spot: int, ply: int, depth: int) -> None:
+        stats.count_cutoff(ply)
+        record_cutoff(spot, ply, depth)
+
+    return counted_cutoff
+
+
+def _timed_copy(copy: Callable, stats: SearchStats) -> Callable:
+    """
+    return a version of a game state copying method that times the copies, and
+    instruments them like the original
+    """
+    def timed_copy(*args) -> Any:
+        if stats._copying:
+            return copy(*args)
+        stats._copying = True
+        start = time.time()
+        try:
+            new_game = copy(*args)
+        finally:
+            stats.copy_seconds += time.time() - start
+            stats._copying = False
+        return instrument_game(new_game, stats)
+
+    return timed_copy
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,230 @@
+"""
+A headless runner of games between two AI players, for checking the strength and the
+speed of the AI players over many games without the browser game of `interaction`:
+
+    python3 selfplay.py ai_hard ai_random --side 4 --games 100 --workers 4
+
+Every finished game is written to the standard output as one line of JSON, and a
+summary of all the games to the standard error.
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+import argparse
+import json
+import random
+import sys
+import time
+import tictactoe as ttt
+
+# the roles of `tictactoe.role_to_player` that can play without a human
+AI_ROLES = ("ai_random", "ai_easy", "ai_hard", "ai_mcts")
+
+
+class GameConfig:
+    """
+    The settings of one headless game.
+
+    Instance Attributes:
+        - index: the number of the game in its batch, counting from 0
+        - side: the side length of the game board
+        - win_len: the number of adjacent pieces that wins the game, or `None` for a full
+          line
+        - p1_role: the role of player 1, one of `AI_ROLES`
+        - p2_role: the role of player 2, one of `AI_ROLES`
+        - p1_piece: the game piece of player 1, either 'x' or 'o'
+        - start_first: the player that makes the first move, either 'p1' or 'p2'
+        - time_budget_ms: the search time budget of the "hard" and "mcts" AI players;
+          see `tictactoe.init_game`
+        - seed: the seed of the random moves made during the game
+    """
+    index: int
+    side: int
+    win_len: Optional[int]
+    p1_role: str
+    p2_role: str
+    p1_piece: str
+    start_first: str
+    time_budget_ms: Optional[int]
+    seed: int
+
+    def __init__(
+            self,
+            index: int,
+            side: int,
+            p1_role: str,
+            p2_role: str,
+            p1_piece: str = 'x',
+            start_first: str = 'p1',
+            win_len: Optional[int] = None,
+            time_budget_ms: Optional[int] = None,
+            seed: int = 0
+    ) -> None:
+        assert p1_role in AI_ROLES and p2_role in AI_ROLES
+        assert start_first in {'p1', 'p2'}
+        self.index = index
+        self.side = side
+        self.win_len = win_len
+        self.p1_role = p1_role
+        self.p2_role = p2_role
+        self.p1_piece = p1_piece
+        self.start_first = start_first
+        self.time_budget_ms = time_budget_ms
+        self.seed = seed
+
+
+def play_game(config: GameConfig) -> dict:
+    """
+    play one game with the given settings, and return its record as a dictionary with
+    the keys:
+        - "game", "side", "win_len", "p1", "p2", "p1_piece", "first": the settings of
+          the game
+        - "winner": 'p1', 'p2', or "tie"
+        - "moves": the spots played, in order
+        - "latency_ms": the milliseconds each move took to choose
+
+    >>> record = play_game(GameConfig(0, 3, "ai_hard", "ai_random", seed=1))
+    >>> record["winner"] in {'p1', 'tie'}
+    True
+    >>> len(record["latency_ms"]) == len(record["moves"])
+    True
+    """
+    random.seed(config.seed)
+    game, player1, player2 = ttt.init_game(
+        config.side,
+        config.p1_piece,
+        config.start_first,
+        config.p2_role,
+        p1_role=config.p1_role,
+        win_len=config.win_len,
+        time_budget_ms=config.time_budget_ms
+    )
+    players = {'p1': player1, 'p2': player2}
+
+    latency_ms = []
+    prev_move = None
+    while game.get_winning_piece() is None:
+        start = time.perf_counter()
+        piece, prev_move = players[game.next_player].return_move(game, prev_move)
+        latency_ms.append(round((time.perf_counter() - start) * 1000, 3))
+        game.place_piece(piece, prev_move)
+
+    winning_piece = game.get_winning_piece()
+    if winning_piece == "tie":
+        winner = "tie"
+    else:
+        winner = 'p1' if winning_piece == config.p1_piece else 'p2'
+
+    return {
+        "game": config.index,
+        "side": config.side,
+        "win_len": game.get_win_length(),
+        "p1": config.p1_role,
+        "p2": config.p2_role,
+        "p1_piece": config.p1_piece,
+        "first": config.start_first,
+        "winner": winner,
+        "moves": game.move_history,
+        "latency_ms": latency_ms
+    }
+
+
+def play_games(configs: list[GameConfig], workers: int = 1) -> Iterator[dict]:
+    """
+    play the games with the given settings, in `workers` processes if more than one, and
+    yield their records (see `play_game`) in the order of the settings
+    """
+    if workers <= 1:
+        for config in configs:
+            yield play_game(config)
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            yield from executor.map(play_game, configs)
+
+
+def make_configs(
+        num_games: int,
+        side: int,
+        p1_role: str,
+        p2_role: str,
+        first: str = "alternate",
+        win_len: Optional[int] = None,
+        time_budget_ms: Optional[int] = None,
+        seed: int = 0
+) -> list[GameConfig]:
+    """
+    return the settings of `num_games` games, where player 1 plays 'x'; `first` is the
+    player that starts every game, either 'p1' or 'p2', or "alternate" to let them take
+    turns starting; every game has its own random seed, counting up from `seed`
+
+    >>> [config.start_first for config in make_configs(3, 3, "ai_easy", "ai_hard")]
+    ['p1', 'p2', 'p1']
+    """
+    configs = []
+    for i in range(num_games):
+        if first == "alternate":
+            start_first = 'p1' if i % 2 == 0 else 'p2'
+        else:
+            start_first = first
+        configs.append(GameConfig(
+            i, side, p1_role, p2_role, 'x', start_first, win_len, time_budget_ms, seed + i
+        ))
+    return configs
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument("p1_role", choices=AI_ROLES, help="the role of player 1 ('x')")
+    parser.add_argument("p2_role", choices=AI_ROLES, help="the role of player 2 ('o')")
+    parser.add_argument("--side", type=int, default=3, help="the board side length")
+    parser.add_argument("--win-len", type=int, default=None,
+                        help="the number of adjacent pieces that wins; a full line if "
+                             "not given")
+    parser.add_argument("--games", type=int, default=10, help="the number of games")
+    parser.add_argument("--first", choices=["p1", "p2", "alternate"],
+                        default="alternate", help="the player that starts each game")
+    parser.add_argument("--time-budget-ms", type=int, default=None,
+                        help="the search time of the \"hard\" and \"mcts\" AIs per "
+                             "move; a fixed depth or number of playouts if not given")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="the number of processes that play the games")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="the random seed of the first game")
+    args = parser.parse_args()
+
+    configs = make_configs(args.games, args.side, args.p1_role, args.p2_role, args.first,
+                           args.win_len, args.time_budget_ms, args.seed)
+    results = {'p1': 0, 'p2': 0, "tie": 0}
+    num_moves = 0
+    start = time.time()
+    for record in play_games(configs, args.workers):
+        print(json.dumps(record), flush=True)
+        results[record["winner"]] += 1
+        num_moves += len(record["moves"])
+    seconds = time.time() - start
+    print(f"{args.games} games in {seconds:.2f} s ({num_moves / seconds:.1f} moves/s): "
+          f"{args.p1_role} won {results['p1']}, {args.p2_role} won {results['p2']}, "
+          f"{results['tie']} ties", file=sys.stderr)
@@ -0,0 +1,294 @@
+"""
+Symmetries of the Tic Tac Toe board, used to treat rotated or reflected game positions
+as one.
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+from type_hints import Optional, Any
+import bitboard as bb
+
+
+################################################################################
+# Board transforms
+################################################################################
+
+# caches of the transform tables for every side length that has been requested so far
+_TRANSFORMS = {}
+_INVERSE_TRANSFORMS = {}
+
+
+def get_transforms(side: int) -> list[list[int]]:
+    """
+    return the 8 symmetries of a square board with sidelength `side` (the identity, the
+    three rotations and the four reflections) as lists indexed by spot index, of the
+    index each spot is moved to; the identity is always the first transform
+
+    >>> get_transforms(3)[1]  # rotate clockwise by 90 degrees
+    [2, 5, 8, 1, 4, 7, 0, 3, 6]
+    >>> len(get_transforms(4))
+    8
+    """
+    if side not in _TRANSFORMS:
+        last = side - 1
+        coords = (
+            lambda r, c: (r, c),  # identity
+            lambda r, c: (c, last - r),  # rotate by 90 degrees
+            lambda r, c: (last - r, last - c),  # rotate by 180 degrees
+            lambda r, c: (last - c, r),  # rotate by 270 degrees
+            lambda r, c: (r, last - c),  # reflect left to right
+            lambda r, c: (last - r, c),  # reflect top to bottom
+            lambda r, c: (c, r),  # reflect along the main diagonal
+            lambda r, c: (last - c, last - r)  # reflect along the anti-diagonal
+        )
+        transforms = []
+        for coord in coords:
+            perm = [0] * (side * side)
+            for row in range(side):
+                for col in range(side):
+                    new_row, new_col = coord(row, col)
+                    perm[row * side + col] = new_row * side + new_col
+            transforms.append(perm)
+        _TRANSFORMS[side] = transforms
+    return _TRANSFORMS[side]
+
+
+def get_inverse_transforms(side: int) -> list[list[int]]:
+    """
+    return the inverse of each transform of `get_transforms`, in the same order
+
+    >>> perm, inv = get_transforms(3)[1], get_inverse_transforms(3)[1]
+    >>> [inv[perm[idx]] for idx in range(9)] == list(range(9))
+    True
+    """
+    if side not in _INVERSE_TRANSFORMS:
+        inverses = []
+        for perm in get_transforms(side):
+            inv = [0] * len(perm)
+            for idx, new_idx in enumerate(perm):
+                inv[new_idx] = idx
+            inverses.append(inv)
+        _INVERSE_TRANSFORMS[side] = inverses
+    return _INVERSE_TRANSFORMS[side]
+
+
+def transform_bits(bits: int, perm: list[int]) -> int:
+    """
+    return the bitboard `bits` with every spot moved by the transform `perm`
+
+    >>> transform_bits(0b000000001, get_transforms(3)[1])  # top-left to top-right
+    4
+    """
+    new_bits = 0
+    for idx in range(len(perm)):
+        if bits >> idx & 1:
+            new_bits |= 1 << perm[idx]
+    return new_bits
+
+
+def canonicalize(x_bits: int, o_bits: int, side: int) -> tuple[int, int, int]:
+    """
+    return the canonical orientation of a board given by its two bitboards, as a tuple
+    of its 'x' bitboard, its 'o' bitboard, and the index of the transform that maps
+    the given board onto it; the canonical orientation is the transformed board with
+    the smallest pair of bitboards, so all symmetric boards share one canonical form
+
+    a spot on the canonical board is mapped back onto the given board through
+    `get_inverse_transforms(side)[transform]`
+
+    >>> canonicalize(0b000000001, 0, 3)  # x in the top-left corner
+    (1, 0, 0)
+    >>> canonicalize(0b100000000, 0, 3)  # x in the bottom-right corner
+    (1, 0, 2)
+    """
+    best = None
+    for t_idx, perm in enumerate(get_transforms(side)):
+        candidate = (transform_bits(x_bits, perm), transform_bits(o_bits, perm), t_idx)
+        if best is None or candidate < best:
+            best = candidate
+    return best
+
+
+################################################################################
+# Symmetry-aware game state
+################################################################################
+
+class SymmetricState(bb.BitboardState):
+    """
+    A bitboard game state that recognizes rotated and reflected positions as one while
+    only a few pieces are on the board.
+
+    `get_position` identifies the position by its canonical orientation, so that
+    transposition table lookups hit across rotations and reflections, and
+    `get_distinct_spots` leaves out the vacant spots that are symmetric to an earlier
+    one on the current board, which prunes the mirrored moves of the opening.
+
+    Symmetric positions are almost only found in the first few moves of a game, so
+    positions with more than `max_pieces` pieces are treated exactly like
+    `bitboard.BitboardState` does, which keeps the deep nodes of a search as cheap.
+
+    >>> game = SymmetricState(3)
+    >>> game.get_distinct_spots()  # a corner, an edge and the centre
+    [0, 1, 4]
+    >>> game.place_piece('x', 0)
+    >>> game.get_distinct_spots()
+    [1, 2, 4, 5, 8]
+    >>> other = SymmetricState(3)
+    >>> other.place_piece('x', 8)
+    >>> other.get_position() == game.get_position()
+    True
+    >>> other.from_position_spot(game.to_position_spot(1))
+    7
+
+    Instance Attributes:
+        - max_pieces: the largest number of pieces on the board for which symmetric
+          positions are recognized
+    """
+    max_pieces: int
+
+    # Private Instance Attributes:
+    #   - _perms: the transforms of `get_transforms`
+    #   - _inverse_perms: the inverse transforms of `get_inverse_transforms`
+    #   - _canonical: the bitboards of the last board that was canonicalized, and the
+    #     result as a tuple of (transform index, hash, 'x' bitboard, 'o' bitboard)
+    _perms: list[list[int]]
+    _inverse_perms: list[list[int]]
+    _canonical: tuple
+
+    def __init__(
+            self,
+            side: int,
+            next_player: str = 'p1',
+            move_hist: Optional[list] = None,
+            x_bits: int = 0,
+            o_bits: int = 0,
+            win_len: Optional[int] = None,
+            max_pieces: int = 4
+    ) -> None:
+        super().__init__(side, next_player, move_hist, x_bits, o_bits, win_len)
+        self.max_pieces = max_pieces
+        self._perms = get_transforms(side)
+        self._inverse_perms = get_inverse_transforms(side)
+        self._canonical = (None, None, None)
+
+    @classmethod
+    def from_bitboard(cls, game: bb.BitboardState, max_pieces: int = 4) -> Any:
+        """
+        build a symmetry-aware copy of the given bitboard game state
+        """
+        x_bits, o_bits = game.get_bitboards()
+        return cls(
+            game.get_side_length(),
+            game.next_player,
+            list(game.move_history),
+            x_bits,
+            o_bits,
+            game.get_win_length(),
+            max_pieces
+        )
+
+    def copy(self) -> Any:
+        """
+        return an independent copy of the current game state
+        """
+        return SymmetricState.from_bitboard(self, self.max_pieces)
+
+    def _is_shallow(self) -> bool:
+        """
+        return whether few enough pieces are on the board to look for symmetries
+        """
+        return self._board_side ** 2 - self._num_empty <= self.max_pieces
+
+    def _canonicalize(self) -> tuple[int, int, int, int]:
+        """
+        return the canonical orientation of the current board as a tuple of the index
+        of the transform onto it, its Zobrist hash, and its two bitboards; the result
+        for the most recent board is remembered, since it is needed by several methods
+        """
+        x_bits, o_bits = self._x_bits, self._o_bits
+        if self._canonical[0] != x_bits or self._canonical[1] != o_bits:
+            canon_x, canon_o, t_idx = canonicalize(x_bits, o_bits, self._board_side)
+            hash_key = 0
+            for idx in range(self._board_side ** 2):
+                if canon_x >> idx & 1:
+                    hash_key ^= self._x_keys[idx]
+                elif canon_o >> idx & 1:
+                    hash_key ^= self._o_keys[idx]
+            self._canonical = (x_bits, o_bits, (t_idx, hash_key, canon_x, canon_o))
+        return self._canonical[2]
+
+    def get_position(self) -> tuple[int, int, int]:
+        """
+        return the hash and the two bitboards of the canonical orientation of the board,
+        which are shared by all the boards symmetric to this one
+        """
+        if not self._is_shallow():
+            return self.hash_key, self._x_bits, self._o_bits
+        return self._canonicalize()[1:]
+
+    def to_position_spot(self, spot: int) -> int:
+        """
+        map a spot on this board onto the orientation of `get_position`
+        """
+        if not self._is_shallow():
+            return spot
+        return self._perms[self._canonicalize()[0]][spot]
+
+    def from_position_spot(self, spot: int) -> int:
+        """
+        map a spot on the orientation of `get_position` back onto this board
+        """
+        if not self._is_shallow():
+            return spot
+        return self._inverse_perms[self._canonicalize()[0]][spot]
+
+    def get_distinct_spots(self) -> list[int]:
+        """
+        return the vacant spots of the board, leaving out every spot that is symmetric
+        to an earlier one under a symmetry of the current board
+        """
+        if not self._is_shallow():
+            return self.empty_spots
+
+        x_bits, o_bits = self._x_bits, self._o_bits
+        # the transforms (other than the identity) that leave the board unchanged
+        stabilizer = [
+            perm for perm in self._perms[1:]
+            if transform_bits(x_bits, perm) == x_bits
+            and transform_bits(o_bits, perm) == o_bits
+        ]
+        if not stabilizer:
+            return self.empty_spots
+
+        distinct_spots = []
+        for spot in self.empty_spots:
+            # keep the spot only if no symmetry maps it onto an earlier spot
+            if all(perm[spot] >= spot for perm in stabilizer):
+                distinct_spots.append(spot)
+        return distinct_spots
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -25,10 +25,17 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 from __future__ import annotations
-from typing import Optional, Any, Union
+from type_hints import Optional, Any, Union
 import random
-import copy
+import time
 import game_tree as gt
+import bitboard as bb
+import transposition as tp
+import symmetry as sym
+import opening_book as ob
+import move_order as mo
+import search_stats as ss
+import mcts
 
 
 ################################################################################
@@ -49,6 +56,28 @@ def empty_board(side: int) -> list:
     return board
 
 
+def spot_index(row: int, col: int, side: int) -> int:
+    """
+    return the index of the spot at the given row and column of a board with sidelength
+    `side`, which is how game states and players refer to spots
+
+    >>> spot_index(1, 2, 3)
+    5
+    """
+    return row * side + col
+
+
+def spot_coords(spot: int, side: int) -> tuple[int, int]:
+    """
+    return the row and the column of the spot with the given index on a board with
+    sidelength `side`
+
+    >>> spot_coords(5, 3)
+    (1, 2)
+    """
+    return divmod(spot, side)
+
+
 class GameState():
     """
     A class representing a Tic Tac Toe game state.
@@ -61,120 +90,270 @@ class GameState():
         - next_player: the player from {'p1', 'p2'} that will place the next game piece
         - empty_spots: a list of vacant spot on the game board available to be filled
         - move_history: a history of moves that occured in this game
+
+    A spot on the board is the integer index `row * side + col`; see `spot_index`.
     """
     next_player: str
-    empty_spots: list[Optional[str]]
-    move_history: list[Optional[str]]
+    empty_spots: list[int]
+    move_history: list[int]
 
     # Private Instance Attributes:
     #   - _board: a nested list representing a tictactoe board
     #   - _board_side: the side length of the board
+    #   - _win_len: the number of adjacent pieces that wins the game
+    #   - _winner: the piece that has completed a winning line, or `None`; updated by
+    #     `place_piece` so that `get_winning_piece` does not rescan the board
+    #   - _win_move_count: the length of the move history when `_winner` was found, so
+    #     that `undo_piece` can clear it; -1 if the board was created with a winner
+    #   - _open_lines: the number of winning lines that do not hold both pieces, so that
+    #     either player may still complete them; updated by `place_piece` and
+    #     `undo_piece` from the lines through the spot
     _board: list[list[str]]
     _board_side: int
+    _win_len: int
+    _winner: Optional[str]
+    _win_move_count: int
+    _open_lines: int
 
     def __init__(
             self,
             board: list[list[str]],
             next_player: str = 'p1',
-            move_hist: Optional[list] = None
+            move_hist: Optional[list] = None,
+            win_len: Optional[int] = None
     ) -> None:
         self._board = board
         self._board_side = len(self._board)  # calculate the side length of the game board
+        self._win_len = win_len or self._board_side  # win with a full line by default
         self.move_history = move_hist if move_hist is not None else []
         self.next_player = next_player
         self.empty_spots = self._find_empty_spots()
+        self._winner = self._find_winner()
+        self._win_move_count = -1
+        self._open_lines = sum(
+            not self._line_holds(line, 'x') or not self._line_holds(line, 'o')
+            for line in bb.get_lines(self._board_side, self._win_len)
+        )
 
-    def _find_empty_spots(self) -> list[Optional[str]]:
+    def _find_empty_spots(self) -> list[int]:
         empty_spots = []
         for row_idx in range(self._board_side):
             for col_idx in range(self._board_side):
                 if self._board[row_idx][col_idx] == '':
-                    empty_spots.append(str(row_idx) + str(col_idx))
+                    empty_spots.append(row_idx * self._board_side + col_idx)
         return empty_spots
 
+    def _line_is_filled_by(self, line: tuple, piece: str) -> bool:
+        """
+        return whether every spot on the given winning line holds the given piece
+        """
+        side = self._board_side
+        return all(self._board[idx // side][idx % side] == piece for idx in line)
+
+    def _line_holds(self, line: tuple, piece: str) -> bool:
+        """
+        return whether any spot on the given winning line holds the given piece
+        """
+        side = self._board_side
+        return any(self._board[idx // side][idx % side] == piece for idx in line)
+
+    def _count_closed_lines(self, spot: int) -> int:
+        """
+        return the number of winning lines through the given occupied spot that its
+        piece blocks: the lines that also hold the other piece, but no other spot of
+        this piece, so that they would be open again without it
+        """
+        side = self._board_side
+        piece = self._board[spot // side][spot % side]
+        other = piece_not(piece)
+        closed = 0
+        for line in bb.get_spot_lines(side, self._win_len)[spot]:
+            own = sum(self._board[idx // side][idx % side] == piece for idx in line)
+            if own == 1 and self._line_holds(line, other):
+                closed += 1
+        return closed
+
+    def _find_winner(self) -> Optional[str]:
+        """
+        scan every winning line of the board for a winner; only used when a game state is
+        created, the winner is tracked incrementally by `place_piece` afterwards
+        """
+        for line in bb.get_lines(self._board_side, self._win_len):
+            if self._line_is_filled_by(line, 'x'):
+                return 'x'
+            elif self._line_is_filled_by(line, 'o'):
+                return 'o'
+        return None
+
     def get_side_length(self) -> int:
         """
         return the board's side length
         """
         return self._board_side
 
-    def place_piece(self, piece: str, spot: str) -> None:
+    def get_win_length(self) -> int:
+        """
+        return the number of adjacent pieces that wins the game
+        """
+        return self._win_len
+
+    def get_num_empty(self) -> int:
+        """
+        return the number of vacant spots left on the board
+        """
+        return len(self.empty_spots)
+
+    def evaluate(self) -> float:
+        """
+        return a heuristic score of the board for 'x', strictly between -1 and 1; see
+        `bitboard.BitboardState.evaluate`
+        """
+        return self.to_bitboard().evaluate()
+
+    def to_bitboard(self) -> bb.BitboardState:
+        """
+        return a compact `bitboard.BitboardState` copy of the current game state, which
+        is much cheaper to copy and modify during the AI players' searches
+
+        >>> game = GameState(empty_board(3))
+        >>> game.place_piece('x', 4)
+        >>> bitgame = game.to_bitboard()
+        >>> bitgame.empty_spots == game.empty_spots
+        True
+        """
+        return bb.BitboardState.from_board(
+            self._board, self.next_player, list(self.move_history), self._win_len
+        )
+
+    def place_piece(self, piece: str, spot: int) -> None:
         """
         place the given piece on the given spot on the game board, if the spot is empty;
         ensure that the spot given exists on the board (is not out of range)
 
+        only the winning lines passing through the given spot are checked for a new
+        winner, since no other line can be completed by this move
+
         Preconditions:
-            - `spot` must be a string of two integers, first representing the row, second
-              representing the column in the board. `ValueError`s will be raised if this
-              is not satisfied
+            - `spot` must be the index `row * side + col` of a spot on the board, or a
+              `ValueError` will be raised
             - the spot must be empty, or a `ValueError` will be raised
             - piece in {'x', 'o'}
         """
-        row = int(spot[0])
-        col = int(spot[1])
-
-        if row > self._board_side or row < 0:
-            raise ValueError(f"[!] Given row {row} in spot {spot} is out of range.")
-        if col > self._board_side or col < 0:
-            raise ValueError(f"[!] Given column {col} in spot {spot} is out of range.")
+        if spot >= self._board_side ** 2 or spot < 0:
+            raise ValueError(f"[!] Given spot {spot} is out of range.")
+        row, col = divmod(spot, self._board_side)
 
-        if spot in self.empty_spots:  # check if the spot is empty
+        if self._board[row][col] == '':  # check if the spot is empty
             self._board[row][col] = piece
             self.empty_spots.remove(spot)
             self.next_player = 'p2' if self.next_player == 'p1' else 'p1'
             self.move_history.append(spot)
         else:
             raise ValueError(f"[!] Given spot {spot} is not empty.")
+        self._open_lines -= self._count_closed_lines(spot)
+
+        # check the winning lines through the new piece
+        if self._winner is None:
+            spot_lines = bb.get_spot_lines(self._board_side, self._win_len)
+            for line in spot_lines[spot]:
+                if self._line_is_filled_by(line, piece):
+                    self._winner = piece
+                    self._win_move_count = len(self.move_history)
+                    break
+
+    def undo_piece(self) -> int:
+        """
+        take back the most recent move in the move history, and return its spot;
+        the spot is put back into `empty_spots` at its original row-major position
+
+        Preconditions:
+            - len(self.move_history) > 0
+
+        >>> game = GameState(empty_board(3))
+        >>> game.place_piece('x', 4)
+        >>> game.place_piece('o', 0)
+        >>> game.undo_piece()
+        0
+        >>> game.empty_spots
+        [0, 1, 2, 3, 5, 6, 7, 8]
+        >>> game.next_player
+        'p2'
+        """
+        if self._win_move_count == len(self.move_history):
+            self._winner = None
+            self._win_move_count = -1
+
+        spot = self.move_history.pop()
+        self._open_lines += self._count_closed_lines(spot)
+        row, col = divmod(spot, self._board_side)
+        self._board[row][col] = ''
+        self.next_player = 'p2' if self.next_player == 'p1' else 'p1'
 
-    def copy_and_place_piece(self, piece: str, spot: str) -> Any:
+        insert_at = len(self.empty_spots)
+        while insert_at > 0 and self.empty_spots[insert_at - 1] > spot:
+            insert_at -= 1
+        self.empty_spots.insert(insert_at, spot)
+
+        return spot
+
+    def copy(self) -> Any:
+        """
+        return an independent copy of the current game state
+
+        the board holds only strings, so copying its rows is enough, and the empty spots
+        and the winner are copied instead of found again by scanning the board
+
+        >>> game = GameState(empty_board(3))
+        >>> game.place_piece('x', 4)
+        >>> new_game = game.copy()
+        >>> new_game.place_piece('o', 0)
+        >>> game.empty_spots == [0, 1, 2, 3, 5, 6, 7, 8]
+        True
+        """
+        new_game = GameState.__new__(GameState)
+        new_game._board = [row[:] for row in self._board]
+        new_game._board_side = self._board_side
+        new_game._win_len = self._win_len
+        new_game.move_history = list(self.move_history)
+        new_game.next_player = self.next_player
+        new_game.empty_spots = list(self.empty_spots)
+        new_game._winner = self._winner
+        new_game._win_move_count = self._win_move_count
+        new_game._open_lines = self._open_lines
+        return new_game
+
+    def copy_and_place_piece(self, piece: str, spot: int) -> Any:
         """
         make a copy of the current game state, make a move in the game state copy, and
         return the game state copy object
         """
-        next_player = 'p2' if self.next_player == 'p1' else 'p1'
-        new_board = copy.deepcopy(self._board)
-        new_hist = copy.deepcopy(self.move_history)
-        new_game = GameState(new_board, next_player, new_hist)
+        new_game = self.copy()
         new_game.place_piece(piece, spot)
         return new_game
 
     def get_winning_piece(self) -> str:
         """
-        return 'x' or 'o' or `None` as the winner of the game in its current state
+        return 'x' or 'o' or `None` as the winner of the game in its current state, or
+        "tie" if no player can win anymore; the winner and the number of open lines are
+        kept by `place_piece`, so this does not rescan the board
+
+        >>> game = GameState([['x', 'x', ''], ['o', 'o', ''], ['', '', '']])
+        >>> game.get_winning_piece() is None
+        True
+        >>> game.place_piece('x', 2)
+        >>> game.get_winning_piece()
+        'x'
+        >>> game = GameState([['x', 'o', 'x'], ['x', 'o', 'o'], ['o', '', '']])
+        >>> game.place_piece('x', 7)  # the last open line was the middle column
+        >>> game.get_winning_piece(), game.empty_spots
+        ('tie', [8])
         """
-        # check each row
-        for row in self._board:
-            if all(spot == 'x' for spot in row):
-                return 'x'
-            elif all(spot == 'o' for spot in row):
-                return 'o'
-
-        # grab the side length fo the game board
-        side = self._board_side
-
-        # if no winners in rows, check each column
-        for col_num in range(side):
-            if all(row2[col_num] == 'x' for row2 in self._board):
-                return 'x'
-            elif all(row2[col_num] == 'o' for row2 in self._board):
-                return 'o'
+        if self._winner is not None:
+            return self._winner
 
-        # if still no winners, check the two diagonals
-        # top-left to bottom-right
-        if all(self._board[i][i] == 'x' for i in range(side)):
-            return 'x'
-        elif all(self._board[i][i] == 'o' for i in range(side)):
-            return 'o'
-        # top-right to bottom-left
-        if all(self._board[i][side - i - 1] == 'x' for i in range(side)):
-            return 'x'
-        elif all(self._board[i][side - i - 1] == 'o' for i in range(side)):
-            return 'o'
-
-        # if there are no empty spots in the board then it's a tie
-        # [*] this can be improved by predicting early ties, but I won't implement it
-        # right now
-        if not self.empty_spots:
+        # it's a tie if the board is full, or if every winning line is blocked by both
+        # pieces already, so that the game can only end in a tie
+        if not self.empty_spots or self._open_lines == 0:
             return "tie"
 
         # otherwise there's no winner yet
@@ -201,7 +380,7 @@ class Player:
         assert piece in {'x', 'o'}
         self._piece = piece
 
-    def return_move(self, game: GameState, prev_move: str) -> tuple[str, str]:
+    def return_move(self, game: GameState, prev_move: Optional[int]) -> tuple[str, int]:
         """
         return the game piece {'x', 'o'} and a move in the given game state
 
@@ -210,13 +389,34 @@ class Player:
         """
         raise NotImplementedError
 
+    def ponder(self, game: GameState, time_ms: int) -> bool:
+        """
+        prepare for the opponent's reply in the given game state, which is the game right
+        after this player's own most recent move, for about `time_ms` milliseconds of
+        the opponent's thinking time; return whether there is more to prepare, so that
+        the caller may call this again while the opponent is still thinking
+
+        players that cannot use the opponent's time have nothing to prepare
+        """
+        return False
+
+    def get_byte_footprint(self) -> int:
+        """
+        return an estimate of the memory in bytes that this player keeps between its
+        moves; 0 for a player that keeps nothing
+
+        the estimates take `sys.getsizeof`, which Brython does not provide, so they are
+        only available under CPython, e.g. on the server of `move_api`
+        """
+        return 0
+
 
 class AIRandomPlayer(Player):
     """
     An 'AI' player that simply makes random moves that are available in the game state.
     """
 
-    def return_move(self, game: GameState, prev_move: str) -> tuple[str, str]:
+    def return_move(self, game: GameState, prev_move: Optional[int]) -> tuple[str, int]:
         """
         return the game piece {'x', 'o'} and a move in the given game state;
         for this player, the move will be chosen at random from the available empty spots
@@ -232,24 +432,124 @@ class AIMinimaxPlayer(Player):
     An 'AI' player that employs a MiniMax algorithm on a game tree to make moves in the
     game state.
 
+    By default the search runs "in place": a single copy of the game state is shared by
+    the whole search, and every simulated move is placed before and undone after its
+    subtree is searched, instead of copying the game state for every node. Both modes
+    choose the same moves:
+
+    >>> def self_play(side: int, in_place: bool) -> list:
+    ...     game = GameState(empty_board(side))
+    ...     players = {'p1': AIMinimaxPlayer('x', 'easy', in_place, move_ordering="none"),
+    ...                'p2': AIMinimaxPlayer('o', 'hard', in_place, move_ordering="none")}
+    ...     prev_move = None
+    ...     while game.get_winning_piece() is None:
+    ...         piece, prev_move = players[game.next_player].return_move(game, prev_move)
+    ...         game.place_piece(piece, prev_move)
+    ...     return game.move_history
+    >>> all(self_play(side, True) == self_play(side, False) for side in (3, 4))
+    True
+
     Instance Attributes:
         - `difficulty`: "easy" or "hard"; used to determine search depth of the algorithm
         - `is_x`: True if my piece is 'x', False if my piece is 'o'
+        - `in_place`: True to search by placing and undoing moves on one shared game
+          state, False to search on a copy of the game state for every node
+        - `symmetric`: True to treat rotated and reflected positions as one in the
+          in-place search, which skips mirrored moves and shares transposition table
+          entries between symmetric positions
+        - `time_budget_ms`: if not `None`, "hard" mode searches by iterative deepening
+          instead of to a fixed depth: it searches 1 step ahead, then 2 steps, and so
+          on, until this many milliseconds have passed, and plays the best move of the
+          deepest search that finished
+        - `heuristic`: True to score the positions where the search reaches its depth
+          limit by the open lines of each piece (see `bitboard.BitboardState.evaluate`),
+          False to score them as ties
+        - `max_depth`: if not `None`, iterative deepening stops after searching this many
+          steps ahead, even if time is left
+        - `move_ordering`: the name of the heuristic that orders the moves of the in-place
+          search; one of `move_order.ORDERING_NAMES`
+        - `collect_stats`: True to count and time the search of every move; see
+          `get_search_stats`
     """
     difficulty: str
     is_x: bool
+    in_place: bool
+    symmetric: bool
+    time_budget_ms: Optional[int]
+    heuristic: bool
+    max_depth: Optional[int]
+    move_ordering: str
+    collect_stats: bool
 
     # Private Instance Attributes:
     #   - _tree: game tree generated by the current player
-    _tree: gt.GameTree
+    #   - _store: the allocator of the nodes of `_tree`, which discards the subtrees of
+    #     the moves that were not played
+    #   - _depth: the search depth of the most recent move
+    #   - _table: transposition table of the positions scored by the in-place search,
+    #     kept across moves; `None` if disabled
+    #   - _deadline: the time (from `time.time`) the current search has to stop at, or
+    #     `None` if the search is not timed
+    #   - _nodes: the number of nodes visited by the in-place search for the current move
+    #   - _root_move: the best move found at the root by the latest in-place search
+    #   - _ordering: the move ordering heuristic of `move_ordering`, created for the board
+    #     of the first move
+    #   - _stats: the statistics of the search of the most recent move, or `None` if not
+    #     collected
+    #   - _pondered: the opponent's replies searched by `ponder` since my most recent
+    #     move, each mapped to a tuple of the depth searched, my best move, and whether
+    #     the search of the reply is finished
+    _tree: gt.CompactGameTree
+    _store: gt.NodeStore
     _depth: int
+    _table: Optional[tp.TranspositionTable]
+    _deadline: Optional[float]
+    _nodes: int
+    _root_move: Optional[int]
+    _ordering: Optional[mo.MoveOrdering]
+    _stats: Optional[ss.SearchStats]
+    _pondered: dict[int, tuple[int, Optional[int], bool]]
 
-    def __init__(self, piece: str, difficulty: str) -> None:
+    def __init__(
+            self,
+            piece: str,
+            difficulty: str,
+            in_place: bool = True,
+            table_size: int = 50000,
+            symmetric: bool = True,
+            time_budget_ms: Optional[int] = None,
+            heuristic: bool = False,
+            max_depth: Optional[int] = None,
+            move_ordering: str = "all",
+            max_tree_nodes: int = 200000,
+            collect_stats: bool = False
+    ) -> None:
+        """
+        initialize the player; `table_size` caps the number of positions in the
+        transposition table used by the in-place search, or disables it if 0, and
+        `max_tree_nodes` caps the number of game tree nodes kept between moves
+        """
         super().__init__(piece)
         self.difficulty = difficulty
         self.is_x = True if piece == 'x' else False
+        self.in_place = in_place
+        self.symmetric = symmetric
+        self.time_budget_ms = time_budget_ms
+        self.heuristic = heuristic
+        self.max_depth = max_depth
+        self.move_ordering = move_ordering
+        self.collect_stats = collect_stats
+        self._stats = None
+        self._depth = 0
+        self._deadline = None
+        self._nodes = 0
+        self._root_move = None
+        self._ordering = None
+        self._pondered = {}
+        self._table = tp.TranspositionTable(table_size) if table_size > 0 else None
         # initialize an empty game tree with my piece, and a 0 x win score
-        self._tree = gt.GameTree(None, self.is_x, 0)
+        self._store = gt.NodeStore(max_tree_nodes)
+        self._tree = self._store.new_node(None, self.is_x, 0)
 
     @staticmethod
     def _score_node(game: GameState) -> int:
@@ -267,13 +567,23 @@ class AIMinimaxPlayer(Player):
         """
         piece = game.get_winning_piece()
         if piece == 'x':
-            return 1 * len(game.empty_spots)
+            return 1 * game.get_num_empty()
         elif piece == 'o':
-            return -1 * len(game.empty_spots)
+            return -1 * game.get_num_empty()
         else:
             return 0
 
-    def _gen_subtrees(self, node: gt.GameTree, game: GameState) -> None:
+    def _score_cutoff(self, game: GameState) -> Union[float, int]:
+        """
+        return the score of a node where the search stops, because the game is over or
+        the depth limit is reached; an unfinished game is scored by its heuristic
+        evaluation if `self.heuristic` is set, or as a tie by `_score_node` otherwise
+        """
+        if self.heuristic and game.get_winning_piece() is None:
+            return game.evaluate()
+        return self._score_node(game)
+
+    def _gen_subtrees(self, node: gt.CompactGameTree, game: GameState) -> None:
         """
         generate subtrees for a given node based on the available moves in the game
         """
@@ -282,11 +592,25 @@ class AIMinimaxPlayer(Player):
             piece = 'o' if node.is_x_move else 'x'
             mock_game = game.copy_and_place_piece(piece, spot)
             score = self._score_node(mock_game)
-            node.add_subtree(gt.GameTree(spot, not node.is_x_move, score))
+            node.add_subtree(self._store.new_node(spot, not node.is_x_move, score))
+
+    def _gen_subtrees_in_place(self, node: gt.CompactGameTree, game: GameState) -> None:
+        """
+        generate subtrees for a given node based on the available moves in the game, by
+        placing and undoing each move on the given game state instead of copying it;
+        moves symmetric to an earlier one are left out if the game state tracks symmetries
+        """
+        assert node.get_subtrees() == []
+        piece = 'o' if node.is_x_move else 'x'
+        for spot in game.get_distinct_spots():
+            game.place_piece(piece, spot)
+            score = self._score_node(game)
+            game.undo_piece()
+            node.add_subtree(self._store.new_node(spot, not node.is_x_move, score))
 
     def _minimax(
             self,
-            tree: gt.GameTree,
+            tree: gt.CompactGameTree,
             game: GameState,
             depth: int,
             piece: str,
@@ -304,7 +628,7 @@ class AIMinimaxPlayer(Player):
         # if we get a winner, or reach the depth limit, or reach a tie, return score;
         # static evaluation
         if depth == 0 or game.get_winning_piece():
-            tree.x_win_score = self._score_node(game)
+            tree.x_win_score = self._score_cutoff(game)
 
         # maximizer, 'x'
         elif piece == 'x':
@@ -314,6 +638,7 @@ class AIMinimaxPlayer(Player):
             # generate subtrees if depth is not reached but no more subtrees are available
             if depth != 0 and subtrees == []:
                 self._gen_subtrees(tree, game)
+                subtrees = tree.get_subtrees()
 
             # iterate through each subtree, compute the sub score, and maximize
             for subtree in subtrees:
@@ -342,6 +667,7 @@ class AIMinimaxPlayer(Player):
             # generate subtrees if depth is not reached but no more subtrees are available
             if depth != 0 and subtrees == []:
                 self._gen_subtrees(tree, game)
+                subtrees = tree.get_subtrees()
 
             # iterate through each subtree, compute the sub score, and minimize
             for subtree in subtrees:
@@ -359,68 +685,641 @@ class AIMinimaxPlayer(Player):
 
             tree.x_win_score = min_score
 
-    def return_move(self, game: GameState, prev_move: Optional[str]) -> tuple[str, str]:
+    def _minimax_in_place(
+            self,
+            tree: gt.CompactGameTree,
+            game: GameState,
+            depth: int,
+            piece: str,
+            alpha: Union[float, int],
+            beta: Union[float, int]
+    ) -> None:
+        """
+        perform the same minimax algorithm with Alpha-Beta pruning as `_minimax`, but
+        every simulated move is placed on the given game state before recursing and undone
+        afterwards, so the game state is left unchanged once this method returns
+
+        the game tree always mirrors the game, so the placement of every subtree is still
+        vacant in the given game state
+
+        positions searched before, possibly through a different order of moves, are
+        looked up in the transposition table: a stored score searched at least as deep
+        is either returned directly, or used to narrow the alpha-beta window; the root
+        of the search is never looked up, since each of its subtrees must be scored
+
+        a `_SearchTimeout` is raised if the search runs past `self._deadline`, leaving
+        the game state in the middle of the search
+        """
+        assert piece in {'x', 'o'}
+
+        # check the clock every 16 nodes of a timed search; a node takes about a
+        # millisecond under Brython, and the slices of `ponder` are only a few dozen
+        self._nodes += 1
+        if self._deadline is not None and self._nodes & 15 == 0 \
+                and time.time() > self._deadline:
+            raise _SearchTimeout
+
+        # if we get a winner, or reach the depth limit, or reach a tie, return score;
+        # static evaluation
+        if depth == 0 or game.get_winning_piece():
+            tree.x_win_score = self._score_cutoff(game)
+            return
+
+        # look up the position in the transposition table; symmetric game states give
+        # the position in its canonical orientation
+        table = self._table
+        hash_move = None
+        if table is not None:
+            hash_key, x_bits, o_bits = game.get_position()
+            key = tp.position_key(hash_key, piece)
+            orig_alpha, orig_beta = alpha, beta
+            entry = table.probe(key, x_bits, o_bits)
+            if entry is not None:
+                hash_move = game.from_position_spot(entry[3])
+            if entry is not None and entry[1] >= depth and tree is not self._tree:
+                score, _, bound, _, _, _ = entry
+                if bound == tp.EXACT:
+                    tree.x_win_score = score
+                    return
+                elif bound == tp.LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    tree.x_win_score = score
+                    return
+
+        # generate subtrees if depth is not reached but no more subtrees are available
+        subtrees = tree.get_subtrees()
+        if subtrees == []:
+            self._gen_subtrees_in_place(tree, game)
+            subtrees = tree.get_subtrees()
+
+        # visit the subtrees in the order given by the move ordering heuristic
+        ply = len(game.move_history)
+        ordered_subtrees = self._ordering.order(subtrees, ply, hash_move)
+
+        # maximizer, 'x'
+        if piece == 'x':
+            max_score = -1 * (game.get_side_length() ** 2) - 1
+            for subtree in ordered_subtrees:
+                game.place_piece('x', subtree.placement)
+                self._minimax_in_place(subtree, game, depth - 1, 'o', alpha, beta)
+                game.undo_piece()
+
+                if subtree.x_win_score > max_score:
+                    max_score = subtree.x_win_score
+                    best_move = subtree.placement
+                # update the alpha score, and prune if possible
+                alpha = max(alpha, subtree.x_win_score)
+                if beta <= alpha:
+                    self._ordering.record_cutoff(subtree.placement, ply, depth)
+                    break
+
+            tree.x_win_score = max_score
+
+        # minimizer, 'o'
+        else:
+            min_score = 1 * (game.get_side_length() ** 2) + 1
+            for subtree in ordered_subtrees:
+                game.place_piece('o', subtree.placement)
+                self._minimax_in_place(subtree, game, depth - 1, 'x', alpha, beta)
+                game.undo_piece()
+
+                if subtree.x_win_score < min_score:
+                    min_score = subtree.x_win_score
+                    best_move = subtree.placement
+                # update the beta score, and prune if possible
+                beta = min(beta, subtree.x_win_score)
+                if beta <= alpha:
+                    self._ordering.record_cutoff(subtree.placement, ply, depth)
+                    break
+
+            tree.x_win_score = min_score
+
+        # the subtrees searched after the best one may only have proved that they are no
+        # better, with a bound equal to the best score, so the root remembers which move
+        # was searched to be the best
+        if tree is self._tree:
+            self._root_move = best_move
+
+        # store the score with the kind of bound it proves
+        if table is not None:
+            if tree.x_win_score <= orig_alpha:
+                bound = tp.UPPER
+            elif tree.x_win_score >= orig_beta:
+                bound = tp.LOWER
+            else:
+                bound = tp.EXACT
+            best_move = game.to_position_spot(best_move)
+            table.store(key, tree.x_win_score, depth, bound, best_move, x_bits, o_bits)
+
+    def return_move(self, game: GameState, prev_move: Optional[int]) -> tuple[str, int]:
         """
         return the game piece {'x', 'o'} and a move in the given game state by the Minimax
         algorithm
 
         `prev_move` is the opponent player's most recent move, or `None` if no moves
         have been made
+
+        a timed player plays on any board size, including those larger than the browser
+        game offers:
+
+        >>> player = AIMinimaxPlayer('x', 'hard', time_budget_ms=50)
+        >>> player.return_move(GameState(empty_board(6)), None)[1] in range(36)
+        True
         """
+        # a reply that `ponder` has already searched as deep as my previous move, or to
+        # the end, is answered right away; while the player ponders, the nodes of the
+        # other replies are only discarded by the next `ponder`, after the move is played
+        pondered = self._pondered.get(prev_move)
+        is_pondered = pondered is not None and self._is_ready(pondered)
+        defer = self._pondered != {}
+        self._pondered = {}
+        if not defer:
+            self._store.collect(self._tree)
+
         # set the search depth
         if self.difficulty == "easy":
             # easy mode will let the algorithm only search 3 steps ahead
             self._depth = 2
-        else:
+        elif not (self._is_timed() and self.in_place):
             # hard mode depends onthe board side length, due to computational complexity
-            # side length to search depth mapping recorded in `depthmap`
+            # side length to search depth mapping recorded in `depthmap`; a timed search
+            # finds its own depth, and larger boards are searched as deep as the 5x5 one
             side = game.get_side_length()
             depthmap = {3: 5, 4: 4, 5: 3}
-            self._depth = depthmap[side]
+            self._depth = depthmap.get(side, 3)
+
+        if self._ordering is None:
+            self._ordering = mo.get_ordering(
+                self.move_ordering, game.get_side_length(), game.get_win_length()
+            )
+
+        search_game = self._to_search_game(game)
+
+        if self.collect_stats:
+            self._stats = ss.SearchStats(len(game.move_history))
+            search_game = ss.instrument_search(self, search_game, self._stats)
+            move_start = time.time()
 
         if prev_move is None:
-            for spot in game.empty_spots:
-                self._tree.add_subtree(gt.GameTree(spot, self.is_x, 0))
+            for spot in search_game.get_distinct_spots():
+                self._tree.add_subtree(self._store.new_node(spot, self.is_x, 0))
         else:
-            # update the game tree to start from the previous move made
-            prevtree = self._tree.find_subtree_by_spot(prev_move)
+            # update the game tree to start from the previous move made, discarding the
+            # subtrees of the moves that were not made
+            prevtree = self._store.advance(self._tree, prev_move, defer=defer)
             if prevtree is None:
-                prevtree = gt.GameTree(prev_move, not self.is_x, 0)
-                self._tree.add_subtree(prevtree)
+                prevtree = self._store.new_node(prev_move, not self.is_x, 0)
             self._tree = prevtree
 
         # print(f"Initial subtrees:\n{self._tree}")
 
-        # calculate the minimax score for each subtree
-        subtrees = self._tree.get_subtrees()
-        self._minimax(
+        # calculate the minimax score for each subtree, and pick the best placement
+        self._nodes = 0
+        self._ordering.reset()
+        try:
+            if is_pondered:
+                self._depth, spot_choice = pondered[0], pondered[1]
+            elif self._is_timed() and self.in_place:
+                spot_choice = self._deepen_iteratively(search_game)
+            else:
+                spot_choice = self._search_root(search_game, self._depth)
+        finally:
+            if self.collect_stats:
+                # pondering after this move must not count into its statistics
+                ss.uninstrument_search(self)
+
+        # advance the tree after having made the placement decision
+        self._tree = self._store.advance(self._tree, spot_choice, defer=defer)
+
+        if self.collect_stats:
+            self._stats.total_seconds = time.time() - move_start
+
+        return self._piece, spot_choice
+
+    def ponder(self, game: GameState, time_ms: int) -> bool:
+        """
+        search the opponent's replies to my most recent move in the given game state
+        for about `time_ms` milliseconds, and return whether there is more to search
+
+        the replies are the subtrees of the current game tree, and each one is searched
+        by iterative deepening, the most likely reply first (the one scored best for the
+        opponent by the latest search) until it is as deep as my previous move was
+        searched, when `return_move` can answer it without searching again; once every
+        reply is that deep, a timed "hard" search keeps deepening the least deep one,
+        and a search to a fixed depth is done
+
+        only the in-place search ponders
+
+        >>> game = GameState(empty_board(3))
+        >>> player = AIMinimaxPlayer('o', 'hard')
+        >>> game.place_piece('x', 0)
+        >>> game.place_piece(*player.return_move(game, 0))
+        >>> while player.ponder(game, 1000):
+        ...     pass
+        >>> game.place_piece('x', 8)
+        >>> _ = player.return_move(game, 8)
+        >>> player.get_nodes_searched()  # the reply was searched while pondering
+        0
+        """
+        # there is nothing to search from before my first search, e.g. while every move
+        # comes from the table of `AIBookPlayer`, or once the game is over
+        if not self.in_place or self._ordering is None \
+                or game.get_winning_piece() is not None:
+            return False
+
+        deadline = time.time() + time_ms / 1000
+        self._store.collect(self._tree)
+        search_game = self._to_search_game(game)
+        root = self._tree
+        if root.get_subtrees() == []:
+            self._gen_subtrees_in_place(root, search_game)
+        other_piece = piece_not(self._piece)
+        sign = 1 if other_piece == 'o' else -1
+        unsearched = (0, None, False)
+
+        def priority(reply: gt.CompactGameTree) -> tuple[int, int, Union[float, int]]:
+            entry = self._pondered.get(reply.placement, unsearched)
+            if self._is_ready(entry):
+                return 1, entry[0], sign * reply.x_win_score
+            return 0, 0, sign * reply.x_win_score
+
+        while True:
+            pending = [reply for reply in root.get_subtrees()
+                       if not self._pondered.get(reply.placement, unsearched)[2]]
+            if pending == []:
+                return False
+            reply = min(pending, key=priority)
+            depth = self._pondered.get(reply.placement, unsearched)[0] + 1
+
+            search_game.place_piece(other_piece, reply.placement)
+            if search_game.get_winning_piece() is not None:
+                # the reply ends the game, so there is no move to answer it with
+                self._pondered[reply.placement] = (depth, None, True)
+                search_game.undo_piece()
+                continue
+
+            # search the position after the reply as if it were my move
+            last_depth = search_game.get_num_empty()
+            self._tree = reply
+            self._deadline = deadline
+            self._ordering.reset()
+            try:
+                # search on a copy, as `_deepen_iteratively` does
+                spot_choice = self._search_root(search_game.copy(), depth)
+            except _SearchTimeout:
+                return True
+            finally:
+                self._tree = root
+                self._deadline = None
+                search_game.undo_piece()
+
+            # the search of the reply is finished once a win is certain, or once it is as
+            # deep as my moves are searched
+            best_score = reply.find_subtree_by_spot(spot_choice).x_win_score
+            is_win = best_score >= 1 if self.is_x else best_score <= -1
+            if self.max_depth is not None:
+                last_depth = min(last_depth, self.max_depth)
+            if not self._is_timed():
+                last_depth = min(last_depth, self._depth)
+            self._pondered[reply.placement] = (depth, spot_choice,
+                                               is_win or depth >= last_depth)
+
+            if time.time() >= deadline:
+                return True
+
+    def get_nodes_searched(self) -> int:
+        """
+        return the number of game tree nodes visited by the in-place search for the most
+        recent move
+        """
+        return self._nodes
+
+    def get_search_stats(self) -> Optional[ss.SearchStats]:
+        """
+        return the statistics of the search for the most recent move, or `None` if the
+        player does not collect them
+
+        >>> player = AIMinimaxPlayer('x', 'hard', collect_stats=True)
+        >>> _ = player.return_move(GameState(empty_board(3)), None)
+        >>> stats = player.get_search_stats()
+        >>> stats.get_nodes() == player.get_nodes_searched()
+        True
+        >>> stats.nodes_by_depth[:2]  # the root, and its 3 distinct moves
+        [1, 3]
+        >>> nodes = stats.get_nodes()
+        >>> game = GameState(empty_board(3))
+        >>> game.place_piece('x', 4)
+        >>> _ = player.ponder(game, 100)
+        >>> stats.get_nodes() == nodes  # pondering is not part of the move
+        True
+        """
+        return self._stats
+
+    def get_search_depth(self) -> int:
+        """
+        return the number of steps ahead searched for the most recent move
+        """
+        return self._depth
+
+    def get_move_score(self) -> Optional[Union[float, int]]:
+        """
+        return the Minimax utility score of my most recent move, which is large if 'x' is
+        likely to win and small if 'o' is likely to win; `None` if the move was not
+        searched
+
+        >>> game = GameState([['x', 'x', ''], ['o', '', ''], ['', '', '']])
+        >>> player = AIMinimaxPlayer('o', 'hard')
+        >>> player.return_move(game, 1)
+        ('o', 2)
+        >>> player.get_move_score() > 0  # 'x' still wins, by forking at the centre
+        True
+        """
+        if self._depth == 0:
+            return None
+        return self._tree.x_win_score
+
+    def get_byte_footprint(self) -> int:
+        """
+        return an estimate of the memory in bytes held by the game tree and the
+        transposition table kept between moves
+        """
+        table_bytes = self._table.get_byte_footprint() if self._table is not None else 0
+        return self._store.get_byte_footprint() + table_bytes
+
+    def get_node_store(self) -> gt.NodeStore:
+        """
+        return the allocator of the game tree kept between moves, which reports its
+        node count and memory footprint
+        """
+        return self._store
+
+    def _is_ready(self, entry: tuple[int, Optional[int], bool]) -> bool:
+        """
+        return whether the reply of the given entry of `self._pondered` has been searched
+        as deep as my previous move, or as deep as it can be
+        """
+        return entry[2] or entry[0] >= self._depth
+
+    def _is_timed(self) -> bool:
+        """
+        return whether my moves are searched by iterative deepening within
+        `self.time_budget_ms`, instead of to a fixed depth
+        """
+        return self.time_budget_ms is not None and self.difficulty != "easy"
+
+    def _to_search_game(self, game: GameState) -> GameState:
+        """
+        return a copy of the given game state to search on: a compact bitboard copy,
+        since the search simulates a great number of moves, which also recognizes
+        symmetric positions if `self.symmetric` is set
+        """
+        search_game = game.to_bitboard()
+        if self.in_place and self.symmetric:
+            search_game = sym.SymmetricState.from_bitboard(search_game)
+        return search_game
+
+    def _search_root(self, game: GameState, depth: int) -> int:
+        """
+        score the subtrees of the current game tree by searching the given game state to
+        the given depth, and return the best placement for my piece
+        """
+        minimax = self._minimax_in_place if self.in_place else self._minimax
+        minimax(
             tree=self._tree,
             game=game,
-            depth=self._depth,
+            depth=depth,
             piece=self._piece,
             alpha=float("-inf"),
             beta=float("inf")
         )
 
+        # the in-place search visits the subtrees in the order of the move ordering, so
+        # the first subtree with the best score is not necessarily the best move
+        if self.in_place:
+            return self._root_move
+
         # return the max score placement or min score placement based on my piece
+        subtrees = self._tree.get_subtrees()
         if self._piece == 'x':
-            spot_choice = max(subtrees, key=lambda s: s.x_win_score).placement
+            return max(subtrees, key=lambda s: s.x_win_score).placement
         else:
-            spot_choice = min(subtrees, key=lambda s: s.x_win_score).placement
+            return min(subtrees, key=lambda s: s.x_win_score).placement
 
-        # advance the tree after having made the placement decision
-        self._tree = self._tree.find_subtree_by_spot(spot_choice)
+    def _deepen_iteratively(self, game: GameState) -> int:
+        """
+        search the given game state 1 step ahead, then 2 steps ahead, and so on, until
+        the whole game is searched or `self.time_budget_ms` runs out; return the best
+        placement found by the deepest search that finished
+
+        each iteration stores the best move of every position it searched in the
+        transposition table, and the hash move ordering (see `move_order`) searches those
+        moves first in the next iteration, so the deeper iterations prune more
+        """
+        deadline = time.time() + self.time_budget_ms / 1000
+        spot_choice = None
+
+        last_depth = game.get_num_empty()
+        if self.max_depth is not None:
+            last_depth = min(last_depth, self.max_depth)
+
+        for depth in range(1, last_depth + 1):
+            # the first iteration always finishes, so there is always a move to play
+            self._deadline = deadline if spot_choice is not None else None
+            try:
+                # search on a copy, since a search that runs out of time does not undo
+                # the moves it has placed
+                spot_choice = self._search_root(game.copy(), depth)
+            except _SearchTimeout:
+                break
+            finally:
+                self._deadline = None
+            self._depth = depth
+
+            # stop early once a win is certain, or the time is up
+            best_score = self._tree.find_subtree_by_spot(spot_choice).x_win_score
+            # heuristic scores are never a full point away from a tie
+            is_win = best_score >= 1 if self.is_x else best_score <= -1
+            if is_win or time.time() >= deadline:
+                break
+
+        return spot_choice
+
+
+class _SearchTimeout(Exception):
+    """
+    raised by `AIMinimaxPlayer._minimax_in_place` when a timed search runs out of time
+    """
+
+
+class AIBookPlayer(AIMinimaxPlayer):
+    """
+    An 'AI' player that plays perfectly on the 3x3 board by looking up its moves in a
+    precomputed table (see `opening_book`), and falls back to the Minimax algorithm of
+    `AIMinimaxPlayer` on the boards that the table does not cover.
+
+    >>> game = GameState([['x', 'x', ''], ['o', 'o', ''], ['', '', '']])
+    >>> AIBookPlayer('o', 'hard').return_move(game, 1)
+    ('o', 5)
+    """
+
+    def return_move(self, game: GameState, prev_move: Optional[int]) -> tuple[str, int]:
+        """
+        return the game piece {'x', 'o'} and a move in the given game state from the
+        perfect-play table, or by the Minimax algorithm if the table does not cover the
+        game
+
+        `prev_move` is the opponent player's most recent move, or `None` if no moves
+        have been made
+        """
+        spot_choice = ob.lookup_move(game.to_bitboard(), self._piece)
+        if spot_choice is None:
+            return super().return_move(game, prev_move)
+
+        # restart the game tree from the chosen move, so that a later Minimax search
+        # still starts from a node that matches the game; the move was not searched
+        self._depth = 0
+        self._store.discard(self._tree)
+        self._tree = self._store.new_node(spot_choice, self.is_x, 0)
 
         return self._piece, spot_choice
 
 
-def role_to_player(role: str, piece: str) -> Player:
+class AIMCTSPlayer(Player):
+    """
+    An 'AI' player that chooses its moves by Monte Carlo Tree Search (see `mcts`): it
+    plays out many random games from the current position, spends more of them on the
+    moves that have done well so far, and plays the move it tried most often.
+
+    Its strength depends on the number of playouts rather than on a search depth, so it
+    still plays sensibly on the 5x5 board, where Minimax only looks 3 moves ahead:
+
+    >>> game = GameState([['x', 'x', ''], ['o', 'o', ''], ['', '', '']])
+    >>> AIMCTSPlayer('x', playouts=500).return_move(game, 4)
+    ('x', 2)
+
+    Instance Attributes:
+        - playouts: if not `None`, the number of playouts of every move
+        - time_budget_ms: if not `None`, the search of every move stops once this many
+          milliseconds have passed, even if it has not made `playouts` playouts yet
+        - is_x: True if my piece is 'x', False if my piece is 'o'
+    """
+    playouts: Optional[int]
+    time_budget_ms: Optional[int]
+    is_x: bool
+
+    # Private Instance Attributes:
+    #   - _root: the search tree node of the position after my most recent move, whose
+    #     subtrees are searched again for my next move; `None` before my first move
+    #   - _root_bits: the bitboards of the position of `_root`
+    #   - _playouts: the number of playouts made for the most recent move
+    _root: Optional[mcts.MCTSNode]
+    _root_bits: Optional[tuple[int, int]]
+    _playouts: int
+
+    def __init__(
+            self,
+            piece: str,
+            playouts: Optional[int] = 2000,
+            time_budget_ms: Optional[int] = None
+    ) -> None:
+        """
+        initialize the player, whose searches stop after `playouts` playouts or
+        `time_budget_ms` milliseconds, whichever comes first; at least one of them must
+        be given
+        """
+        assert playouts is not None or time_budget_ms is not None
+        super().__init__(piece)
+        self.playouts = playouts
+        self.time_budget_ms = time_budget_ms
+        self.is_x = piece == 'x'
+        self._root = None
+        self._root_bits = None
+        self._playouts = 0
+
+    def return_move(self, game: GameState, prev_move: Optional[int]) -> tuple[str, int]:
+        """
+        return the game piece {'x', 'o'} and a move in the given game state by Monte Carlo
+        Tree Search
+
+        `prev_move` is the opponent player's most recent move, or `None` if no moves
+        have been made
+        """
+        search_game = game.to_bitboard()
+        root = self._find_root(search_game, prev_move)
+        board = mcts.PlayoutBoard(search_game)
+
+        deadline = None
+        if self.time_budget_ms is not None:
+            deadline = time.time() + self.time_budget_ms / 1000
+        self._playouts = 0
+        # the first playout always runs, so that there is a move to play
+        while self._playouts == 0 or (
+                (self.playouts is None or self._playouts < self.playouts)
+                and (deadline is None or time.time() < deadline)):
+            mcts.run_iteration(root, board)
+            self._playouts += 1
+
+        # keep the subtree of the chosen move for the next search
+        self._root = root.best_child()
+        x_bits, o_bits = search_game.get_bitboards()
+        bit = 1 << self._root.placement
+        self._root_bits = (x_bits | bit, o_bits) if self.is_x else (x_bits, o_bits | bit)
+        return self._piece, self._root.placement
+
+    def get_playouts(self) -> int:
+        """
+        return the number of playouts made for the most recent move
+        """
+        return self._playouts
+
+    def get_byte_footprint(self) -> int:
+        """
+        return an estimate of the memory in bytes held by the search tree kept between
+        moves
+        """
+        return self._root.get_byte_footprint() if self._root is not None else 0
+
+    def _find_root(
+            self,
+            game: bb.BitboardState,
+            prev_move: Optional[int]
+    ) -> mcts.MCTSNode:
+        """
+        return the search tree node of the given game state: the subtree of `prev_move`
+        under the node of my previous move if it was searched, or a new node otherwise
+        """
+        if self._root is not None and prev_move is not None:
+            x_bits, o_bits = self._root_bits
+            bit = 1 << prev_move
+            expected = (x_bits, o_bits | bit) if self.is_x else (x_bits | bit, o_bits)
+            if game.get_bitboards() == expected:
+                subtree = self._root.find_child(prev_move)
+                if subtree is not None:
+                    return subtree
+        return mcts.MCTSNode(prev_move, not self.is_x)
+
+
+def role_to_player(role: str, piece: str, time_budget_ms: Optional[int] = None) -> Player:
     """
     helper function to convert the string representation of a player's role and return a
     `Player` object accordingly; set the `Player` object's piece attribute as given
+
+    `time_budget_ms` bounds the search time of each move of a "hard" or "mcts" AI player;
+    see `AIMinimaxPlayer` and `AIMCTSPlayer`
     """
     if role == "ai_random":
         return AIRandomPlayer(piece)
+    elif role == "ai_mcts":
+        if time_budget_ms is not None:
+            return AIMCTSPlayer(piece, playouts=None, time_budget_ms=time_budget_ms)
+        return AIMCTSPlayer(piece)
+    elif role == "ai_hard":
+        # the perfect-play table covers the 3x3 board, and falls back to Minimax search
+        # that evaluates the unfinished positions at its depth limit on larger boards
+        return AIBookPlayer(piece, "hard", time_budget_ms=time_budget_ms, heuristic=True)
     elif role[:2] == "ai":
         return AIMinimaxPlayer(piece, role[-4:])  # role[-4:] is either "easy" or "hard"
     else:
@@ -447,23 +1346,28 @@ def init_game(
         p1_piece: str,
         start_first: str,
         p2_role: str,
-        p1_role: str = 'human'
+        p1_role: str = 'human',
+        win_len: Optional[int] = None,
+        time_budget_ms: Optional[int] = None
 ) -> tuple[GameState, Player, Player]:
     """
-    initialize a Tic Tac Toe game on a board of given side length `board_side`;
+    initialize a Tic Tac Toe game on a board of given side length `board_side`, where
+    `win_len` adjacent pieces win the game (a full line if not given), and "hard" and
+    "mcts" AI players search for at most `time_budget_ms` milliseconds per move (to a
+    fixed depth or number of playouts if not given);
     return the game object and the two player objects
     """
     assert start_first in {'p1', 'p2', 'nd'}
 
     # create a new game with the board's side lengtn given by `board_side`
-    game = GameState(empty_board(board_side))
+    game = GameState(empty_board(board_side), win_len=win_len)
 
     # set player 2's game piece
     p2_piece = piece_not(p1_piece)
 
     # initialize players' classes
-    player1 = role_to_player(p1_role, p1_piece)
-    player2 = role_to_player(p2_role, p2_piece)
+    player1 = role_to_player(p1_role, p1_piece, time_budget_ms)
+    player2 = role_to_player(p2_role, p2_piece, time_budget_ms)
 
     # determine which player starts first if left up to random
     start_first = random.choice(['p1', 'p2']) if start_first == 'nd' else start_first
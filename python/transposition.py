@@ -0,0 +1,156 @@
+"""
+A transposition table that caches the Minimax scores of game positions.
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+from type_hints import Optional, Union
+import sys
+
+
+# bound types of a stored score; with Alpha-Beta pruning a search that fails low only
+# proves an upper bound of the score, and one that fails high only a lower bound
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# XOR-ed into a position's hash when 'o' is the next to move, since the same board can
+# be reached with either player to move depending on who started the game
+O_TO_MOVE_KEY = 0x5bd1e995
+
+
+def position_key(hash_key: int, piece: str) -> int:
+    """
+    return the transposition table key of a board with the given Zobrist hash, when the
+    given piece is the next to move
+
+    >>> position_key(12345, 'x')
+    12345
+    >>> position_key(position_key(12345, 'o'), 'o')
+    12345
+    """
+    return hash_key ^ O_TO_MOVE_KEY if piece == 'o' else hash_key
+
+
+class TranspositionTable:
+    """
+    A size-capped store of search results for game positions, keyed by the positions'
+    hashes.
+
+    Every entry is a tuple of (score, depth, bound, best_move, x_bits, o_bits), where
+    `depth` is the remaining search depth the score was computed with, `bound` is one
+    of `EXACT`, `LOWER` or `UPPER`, and the bitboards of the position guard against two
+    positions sharing one slot.
+
+    The entries are kept in a list of `max_entries` slots, and a position is stored in
+    the slot `key % max_entries`, so storing and probing take the same time however full
+    the table is. A position that is already stored is only replaced by a result
+    searched at least as deep; any other position in its slot is replaced, since
+    positions from earlier turns of the game can no longer be reached, and the newest
+    one is the most likely to be probed again.
+
+    >>> table = TranspositionTable(max_entries=2)
+    >>> table.store(1, 4, 2, EXACT, 0, 1, 0)
+    >>> table.store(2, 0, 3, LOWER, 4, 2, 0)
+    >>> table.store(1, -4, 1, EXACT, 1, 1, 0)  # shallower, so it is not replaced
+    >>> table.probe(1, 1, 0)
+    (4, 2, 0, 0, 1, 0)
+    >>> table.probe(1, 1, 8) is None  # a different position in the same slot
+    True
+    >>> table.store(3, 1, 1, UPPER, 8, 4, 0)  # replaces position 1, in slot 1 too
+    >>> table.probe(1, 1, 0) is None, len(table)
+    (True, 2)
+
+    Instance Attributes:
+        - max_entries: the number of slots of the table, which is the maximum number of
+          positions it holds
+    """
+    max_entries: int
+
+    # Private Instance Attributes:
+    #   - _slots: the entry stored in each slot, or `None` if the slot is empty
+    #   - _num_entries: the number of slots that hold an entry
+    _slots: list[Optional[tuple]]
+    _num_entries: int
+
+    def __init__(self, max_entries: int = 50000) -> None:
+        assert max_entries > 0
+        self.max_entries = max_entries
+        self._slots = [None] * max_entries
+        self._num_entries = 0
+
+    def __len__(self) -> int:
+        return self._num_entries
+
+    def get_byte_footprint(self) -> int:
+        """
+        return an estimate of the memory in bytes held by the table, from the size of its
+        list of slots, and the size of an entry with its score and bitboards
+        """
+        bitboard = 1 << 60
+        entry_bytes = (sys.getsizeof((0.0, 0, 0, 0, bitboard, bitboard))
+                       + sys.getsizeof(0.0) + 2 * sys.getsizeof(bitboard))
+        return sys.getsizeof(self._slots) + self._num_entries * entry_bytes
+
+    def clear(self) -> None:
+        """
+        remove every stored position
+        """
+        self._slots = [None] * self.max_entries
+        self._num_entries = 0
+
+    def probe(self, key: int, x_bits: int, o_bits: int) -> Optional[tuple]:
+        """
+        return the stored entry of the position with the given key and bitboards, or
+        `None` if it is not stored
+        """
+        entry = self._slots[key % self.max_entries]
+        if entry is None or entry[4] != x_bits or entry[5] != o_bits:
+            return None
+        return entry
+
+    def store(
+            self,
+            key: int,
+            score: Union[float, int],
+            depth: int,
+            bound: int,
+            best_move: Optional[int],
+            x_bits: int,
+            o_bits: int
+    ) -> None:
+        """
+        store the search result of the position with the given key and bitboards
+        """
+        index = key % self.max_entries
+        old_entry = self._slots[index]
+        if old_entry is None:
+            self._num_entries += 1
+        elif old_entry[1] > depth and old_entry[4] == x_bits and old_entry[5] == o_bits:
+            return
+        self._slots[index] = (score, depth, bound, best_move, x_bits, o_bits)
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
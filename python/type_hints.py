@@ -0,0 +1,65 @@
+"""
+The `typing` constructs named in the annotations of the game's engine modules.
+
+Brython evaluates annotations when a function or a class is defined, even under
+`from __future__ import annotations`, so the names they use must exist at run time.
+Importing `typing` for them would make the browser download and run the `typing` module
+and the many standard library modules it imports, only to build objects that the engine
+never looks at. Type checkers see the real `typing` constructs; at run time, each name is
+a placeholder that can be subscripted like them:
+
+>>> Optional[int] is Optional
+True
+>>> Union[float, int] is Union
+True
+
+Annotations cannot name a class inside its own body, since the class does not exist yet
+when Brython evaluates them; the engine uses `Any` there instead.
+
+--------------------------------------------------------------------------------
+MIT License
+
+Copyright (c) 2021 Mu "Samm" Du
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# type checkers treat a name `TYPE_CHECKING` as true, whatever its value
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Optional, Union
+else:
+    class _Hint:
+        """
+        a placeholder for a `typing` construct in an annotation; subscripting it returns
+        the placeholder itself
+        """
+        def __getitem__(self, params: object) -> object:
+            return self
+
+    Any = _Hint()
+    Callable = _Hint()
+    Optional = _Hint()
+    Union = _Hint()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
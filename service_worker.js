@@ -1,20 +1,38 @@
-var PWA_CACHE = 'pwa_cache_01';
+// The cache name and `engine_urls` are written by `python/build_service_worker.py`: the
+// cache name holds a hash of the contents of every cached file, so that a new version
+// of any of them installs a fresh cache.
+var PWA_CACHE = 'pwa_cache_ad73277f428a2907';
+var engine_urls = [
+    '/bot-tac-toe/assets/brython/brython.js',
+    '/bot-tac-toe/assets/brython/brython_modules.js',
+    '/bot-tac-toe/assets/brython/brython_stdlib.js',
+    '/bot-tac-toe/python/ai_worker.py',
+    '/bot-tac-toe/python/bitboard.py',
+    '/bot-tac-toe/python/book_3x3.py',
+    '/bot-tac-toe/python/game_tree.py',
+    '/bot-tac-toe/python/interaction.py',
+    '/bot-tac-toe/python/mcts.py',
+    '/bot-tac-toe/python/move_order.py',
+    '/bot-tac-toe/python/opening_book.py',
+    '/bot-tac-toe/python/search_stats.py',
+    '/bot-tac-toe/python/symmetry.py',
+    '/bot-tac-toe/python/tictactoe.py',
+    '/bot-tac-toe/python/transposition.py',
+    '/bot-tac-toe/python/type_hints.py'
+];
 var urls_to_cache = [
     '/bot-tac-toe/',
     '/bot-tac-toe/manifest.webmanifest',
     '/bot-tac-toe/assets/minireset.min.css',
     '/bot-tac-toe/style.css',
-    '/bot-tac-toe/assets/brython/brython.js',
-    '/bot-tac-toe/assets/brython/brython_modules.js',
     '/bot-tac-toe/assets/fonts/HKGrotesk-Medium.woff2',
     '/bot-tac-toe/assets/fonts/TTTPiece.ttf?r8pxat',
     '/bot-tac-toe/assets/icons/icon_dropdown.svg',
     '/bot-tac-toe/assets/icons/favicon.svg',
     '/bot-tac-toe/assets/icons/favicon_180.png',
     '/bot-tac-toe/assets/icons/favicon_196.png',
-    '/bot-tac-toe/assets/icons/favicon_512.png',
-    '/bot-tac-toe/python/interaction.py'
-];
+    '/bot-tac-toe/assets/icons/favicon_512.png'
+].concat(engine_urls);
 
 self.addEventListener("install", function(event) {
     console.log("WORKER: install event in progress.");
@@ -24,6 +42,10 @@ self.addEventListener("install", function(event) {
             console.log('WORKER: opened cache.');
             return cache.addAll(urls_to_cache);
         })
+        .then(function() {
+            // A new cache name means new files; replace the old worker right away.
+            return self.skipWaiting();
+        })
     );
 });
 
@@ -36,6 +58,13 @@ self.addEventListener("activate", function(event) {
             if ("navigationPreload" in self.registration) {
                 await self.registration.navigationPreload.enable();
             }
+            // Delete the caches of the previous versions.
+            var names = await caches.keys();
+            await Promise.all(names.filter(function(name) {
+                return name.startsWith("pwa_cache_") && name !== PWA_CACHE;
+            }).map(function(name) {
+                return caches.delete(name);
+            }));
         })()
     );
     // Tell the active service worker to take control of the page immediately.
@@ -44,6 +73,12 @@ self.addEventListener("activate", function(event) {
 
 self.addEventListener("fetch", function(event) {
     console.log("WORKER: Fetching", event.request);
+    var url = new URL(event.request.url);
+    if (event.request.method === "GET" && url.origin === self.location.origin
+            && engine_urls.indexOf(url.pathname) !== -1) {
+        event.respondWith(stale_while_revalidate(event, url.pathname));
+        return;
+    }
     event.respondWith(
         caches.match(event.request)
         .then(function(response) {
@@ -55,3 +90,26 @@ self.addEventListener("fetch", function(event) {
         })
     );
 });
+
+// Answer a request for an engine file from the cache, and fetch the file again in the
+// background to update the cache for the next load. Brython adds a timestamp query to
+// the URLs of the modules and scripts it loads, so the file is looked up by its path.
+function stale_while_revalidate(event, path) {
+    var cache_opened = caches.open(PWA_CACHE);
+    var fetched = cache_opened.then(function(cache) {
+        return fetch(path, {cache: "no-cache"}).then(function(response) {
+            if (response.ok) {
+                cache.put(path, response.clone());
+            }
+            return response;
+        });
+    });
+    event.waitUntil(fetched.catch(function() {}));
+    return cache_opened
+        .then(function(cache) {
+            return cache.match(path);
+        })
+        .then(function(response) {
+            return response || fetched;
+        });
+}